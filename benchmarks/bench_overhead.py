@@ -0,0 +1,151 @@
+#
+# This file is part of TEN Framework, an open source project.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file for more information.
+#
+"""Per-frame Python overhead of the TenVad entry points.
+
+Inference costs two orders of magnitude more than the wrapper, so timing
+entry points one after another buries the overhead in noise. Instead the
+audio is cut into short blocks and every block is processed twice on the
+same handle: once by calling ten_vad_process directly with pre-bound integer
+arguments (the "native" floor any wrapper can reach) and once through the
+entry point under test. The overhead reported is the median of the paired
+per-block differences. The cost of a bare ctypes call (ten_vad_get_version)
+is reported separately, so the native row can be read as
+``ctypes call + inference``.
+
+Usage:
+    python benchmarks/bench_overhead.py [--frames N] [--block B] [--hop-size 256] [--wav FILE] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from ctypes import addressof
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from ten_vad import TenVad
+
+DEFAULT_WAV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../testset/testset-audio-01.wav")
+
+
+def load_audio(wav_path, num_samples):
+    """Return ``num_samples`` int16 samples, tiling the WAV file or falling back to noise."""
+    if wav_path and os.path.exists(wav_path):
+        import scipy.io.wavfile as Wavfile
+
+        _, data = Wavfile.read(wav_path)
+        data = np.asarray(data, dtype=np.int16)
+    else:
+        data = (np.random.default_rng(0).standard_normal(num_samples) * 3000).astype(np.int16)
+    return np.ascontiguousarray(np.resize(data, num_samples))
+
+
+def time_ctypes_call(vad, num_calls):
+    get_version = vad.vad_library.ten_vad_get_version
+    start = time.perf_counter_ns()
+    for _ in range(num_calls):
+        get_version()
+    return (time.perf_counter_ns() - start) / num_calls
+
+
+def time_native(vad, frames):
+    process = vad._process_raw
+    handler = vad.vad_handler
+    hop_size = vad.hop_size
+    prob_address = addressof(vad.out_probability)
+    flag_address = addressof(vad.out_flags)
+    base = frames.ctypes.data
+    stride = frames.strides[0]
+    start = time.perf_counter_ns()
+    for i in range(frames.shape[0]):
+        process(handler, base + i * stride, hop_size, prob_address, flag_address)
+    return time.perf_counter_ns() - start
+
+
+def time_process(vad, frames):
+    return _time_rows(vad.process, frames)
+
+
+def time_process_unchecked(vad, frames):
+    return _time_rows(vad.process_unchecked, frames)
+
+
+def time_process_array(vad, frames):
+    audio = frames.reshape(-1)
+    start = time.perf_counter_ns()
+    vad.process_array(audio)
+    return time.perf_counter_ns() - start
+
+
+def _time_rows(method, frames):
+    rows = list(frames)
+    start = time.perf_counter_ns()
+    for frame in rows:
+        method(frame)
+    return time.perf_counter_ns() - start
+
+
+ENTRY_POINTS = [
+    ("process", time_process),
+    ("process_unchecked", time_process_unchecked),
+    ("process_array", time_process_array),
+]
+
+
+def run(num_frames, hop_size, wav_path, block=50):
+    frames = load_audio(wav_path, num_frames * hop_size).reshape(num_frames, hop_size)
+    blocks = [frames[i:i + block] for i in range(0, num_frames - block + 1, block)]
+    vad = TenVad(hop_size)
+    native_ns, overhead_ns = [], {name: [] for name, _ in ENTRY_POINTS}
+    for frames_block in blocks:
+        for name, bench in ENTRY_POINTS:
+            native = time_native(vad, frames_block)
+            measured = bench(vad, frames_block)
+            native_ns.append(native / block)
+            overhead_ns[name].append((measured - native) / block)
+
+    native = float(np.median(native_ns))
+    results = {
+        "hop_size": hop_size,
+        "frames": len(blocks) * block,
+        "block": block,
+        "ctypes_call_ns": time_ctypes_call(vad, num_frames),
+        "native_ns_per_frame": native,
+        "entry_points": {},
+    }
+    for name, _ in ENTRY_POINTS:
+        overhead = float(np.median(overhead_ns[name]))
+        results["entry_points"][name] = {
+            "ns_per_frame": native + overhead,
+            "overhead_ns_per_frame": overhead,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-frame Python overhead of TenVad.")
+    parser.add_argument("--frames", type=int, default=5000, help="Number of frames of audio")
+    parser.add_argument("--block", type=int, default=50, help="Frames per paired native/wrapper measurement")
+    parser.add_argument("--hop-size", type=int, default=256, help="Frame size in samples")
+    parser.add_argument("--wav", default=DEFAULT_WAV, help="16 kHz int16 WAV used as input (noise if missing)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.frames, args.hop_size, args.wav, args.block)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"hop_size={results['hop_size']} frames={results['frames']} block={results['block']}")
+    print(f"{'bare ctypes call':<20}{results['ctypes_call_ns']:>12.0f} ns")
+    print(f"{'native':<20}{results['native_ns_per_frame']:>12.0f} ns/frame")
+    for name, row in results["entry_points"].items():
+        print(f"{name:<20}{row['ns_per_frame']:>12.0f} ns/frame  overhead {row['overhead_ns_per_frame']:>8.0f} ns/frame")
+
+
+if __name__ == "__main__":
+    main()
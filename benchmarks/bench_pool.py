@@ -0,0 +1,80 @@
+#
+# This file is part of TEN Framework, an open source project.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file for more information.
+#
+"""Scaling of TenVadPool over streams x worker threads.
+
+Every stream receives the same number of frames, submitted in chunks the way
+a live ingest path would deliver them. The table reports total frames per
+second and the speed-up over a single worker for the same stream count.
+
+Usage:
+    python benchmarks/bench_pool.py [--streams 1,8,64] [--threads 1,2,4,8] [--seconds 2] [--chunk 10] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from ten_vad import TenVadPool
+
+
+def parse_list(text):
+    return [int(value) for value in text.split(",") if value]
+
+
+def run_one(num_streams, num_threads, frames_per_stream, chunk_frames, hop_size):
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(frames_per_stream * hop_size) * 3000).astype(np.int16)
+    chunk = chunk_frames * hop_size
+    with TenVadPool(max_workers=num_threads, hop_size=hop_size) as pool:
+        for stream_id in range(num_streams):
+            pool.add_stream(stream_id)
+        start = time.perf_counter()
+        futures = [
+            pool.submit(stream_id, audio[offset:offset + chunk])
+            for offset in range(0, len(audio), chunk)
+            for stream_id in range(num_streams)
+        ]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    return num_streams * frames_per_stream / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure TenVadPool throughput for streams x threads.")
+    parser.add_argument("--streams", type=parse_list, default=[1, 8, 64], help="Comma separated stream counts")
+    parser.add_argument("--threads", type=parse_list, default=[1, 2, 4, 8], help="Comma separated worker counts")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Audio seconds per stream")
+    parser.add_argument("--chunk", type=int, default=10, help="Frames per submitted chunk")
+    parser.add_argument("--hop-size", type=int, default=256, help="Frame size in samples")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    frames_per_stream = max(1, int(args.seconds * 16000) // args.hop_size)
+    results = []
+    for num_streams in args.streams:
+        baseline = None
+        for num_threads in args.threads:
+            fps = run_one(num_streams, num_threads, frames_per_stream, args.chunk, args.hop_size)
+            baseline = baseline or fps
+            results.append({
+                "streams": num_streams,
+                "threads": num_threads,
+                "frames_per_second": fps,
+                "speedup": fps / baseline,
+            })
+            if not args.json:
+                print(f"streams={num_streams:<5} threads={num_threads:<3} {fps:>10.0f} frames/s  x{fps / baseline:.2f}")
+    if args.json:
+        print(json.dumps({"hop_size": args.hop_size, "frames_per_stream": frames_per_stream, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
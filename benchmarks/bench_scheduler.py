@@ -0,0 +1,126 @@
+#
+# This file is part of TEN Framework, an open source project.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file for more information.
+#
+"""Tail latency of live streams under overload: TenVadPool vs DeadlineScheduler.
+
+A feeder thread delivers ``--chunk`` frames of audio to every stream in
+real time. With more streams than the workers can keep up with, the pool
+runs everything and every stream falls further behind, while the scheduler
+keeps high-priority streams on the model and sheds the low-priority ones
+to the energy estimate. The table reports the frame latency (delivery
+time minus arrival time) per priority class.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--streams 200] [--high 0.25] [--seconds 3] [--chunk 2] [--threads N]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from ten_vad import DeadlineScheduler, TenVadPool
+
+
+def feed_loop(deliver, num_streams, seconds, chunk_frames, hop_size, audio):
+    """Call ``deliver(stream_id, samples, arrival)`` for every stream once per chunk period."""
+    period = chunk_frames * hop_size / 16000
+    chunk = chunk_frames * hop_size
+    start = time.monotonic()
+    for index in range(int(seconds / period)):
+        target = start + index * period
+        delay = target - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        samples = audio[(index * chunk) % (len(audio) - chunk):][:chunk]
+        for stream_id in range(num_streams):
+            deliver(stream_id, samples, target)
+
+
+def summarize(latencies):
+    if not latencies:
+        return "no frames"
+    values = np.array(latencies) * 1000
+    return f"p50 {np.percentile(values, 50):7.1f} ms  p99 {np.percentile(values, 99):7.1f} ms  max {values.max():7.1f} ms"
+
+
+def run_pool(args, audio, high):
+    latencies = {True: [], False: []}
+    lock = threading.Lock()
+    with TenVadPool(max_workers=args.threads) as pool:
+        futures = []
+
+        def deliver(stream_id, samples, arrival):
+            future = pool.submit(stream_id, samples)
+
+            def done(_, stream_id=stream_id, arrival=arrival):
+                with lock:
+                    latencies[stream_id in high].extend([time.monotonic() - arrival] * args.chunk)
+
+            future.add_done_callback(done)
+            futures.append(future)
+
+        feed_loop(deliver, args.streams, args.seconds, args.chunk, 256, audio)
+        for future in futures:
+            future.result()
+    return latencies, None
+
+
+def run_scheduler(args, audio, high):
+    latencies = {True: [], False: []}
+    arrivals = {stream_id: [] for stream_id in range(args.streams)}
+    with DeadlineScheduler(max_workers=args.threads, tick=0.016, latency=args.latency) as scheduler:
+        def on_result(result):
+            now = time.monotonic()
+            times = arrivals[result.stream_id]
+            latencies[result.stream_id in high].extend(
+                now - times[frame // args.chunk] for frame in range(result.start, result.end)
+            )
+
+        for stream_id in range(args.streams):
+            scheduler.add_stream(stream_id, priority=1 if stream_id in high else 0, callback=on_result)
+        scheduler.start()
+
+        def deliver(stream_id, samples, arrival):
+            arrivals[stream_id].append(arrival)
+            scheduler.feed(stream_id, samples, now=arrival)
+
+        feed_loop(deliver, args.streams, args.seconds, args.chunk, 256, audio)
+        while scheduler.queue_depth:
+            time.sleep(0.01)
+        scheduler.stop()
+        stats = scheduler.stats()
+    return latencies, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tail latency of TenVadPool and DeadlineScheduler under overload.")
+    parser.add_argument("--streams", type=int, default=200, help="Live streams")
+    parser.add_argument("--high", type=float, default=0.25, help="Share of high-priority streams")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Seconds of audio per stream")
+    parser.add_argument("--chunk", type=int, default=2, help="Frames per delivered chunk")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="Worker threads")
+    parser.add_argument("--latency", type=float, default=0.1, help="Scheduler latency budget in seconds")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(16000 * 10) * 3000).astype(np.int16)
+    high = set(range(int(args.streams * args.high)))
+    for name, run in (("pool", run_pool), ("scheduler", run_scheduler)):
+        latencies, stats = run(args, audio, high)
+        print(f"{name:<10} high: {summarize(latencies[True])}")
+        print(f"{'':<10} low:  {summarize(latencies[False])}")
+        if stats is not None:
+            print(
+                f"{'':<10} frames {stats['frames']}, estimated {stats['estimated_frames']}, "
+                f"deadline misses {stats['deadline_misses']}, tick overruns {stats['tick_overruns']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
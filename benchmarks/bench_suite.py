@@ -0,0 +1,271 @@
+#
+# This file is part of TEN Framework, an open source project.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file for more information.
+#
+"""Release qualification benchmarks over the bundled testset.
+
+Measures, for each hop size:
+
+* real-time factor (processing time / audio time) of the per-frame
+  ``process`` loop and of ``process_array`` over every testset WAV;
+* ns/frame split into native inference and Python overhead (see
+  bench_overhead.py for the paired measurement);
+* throughput of 1..N concurrent streams through ``TenVadPool``;
+
+and, once per run, the cost of creating/destroying, resetting and pooling a handle,
+the time to import the package in a fresh interpreter, and the peak RSS of
+the benchmark process.
+
+The measurements are repeated ``--repeat`` times and the best value of
+each metric is kept (the median for overhead metrics), which filters out
+most scheduling noise. Every metric
+is stored as ``{"value", "unit", "better"}`` under a flat key such as
+``hop_256.process_array.rtf``. ``--compare BASELINE`` reports each metric
+against a saved run and exits with status 1 when any of them got worse by
+more than ``--tolerance``. Overhead metrics carry a ``floor`` (the native
+time per frame): their change is taken relative to that floor, as a share
+of the frame cost, since the overhead itself is close to zero and noisy.
+
+Usage:
+    python benchmarks/bench_suite.py [--hop-sizes 160,256,512] [--streams 1,4,16] [--files N] [--output FILE]
+    python benchmarks/bench_suite.py --compare baseline.json [--tolerance 0.1] [--output FILE]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.abspath(os.path.join(BENCH_DIR, "../src"))
+sys.path.append(SRC_DIR)
+sys.path.insert(0, BENCH_DIR)
+from ten_vad import TenVad, TenVadHandlePool, __version__
+from ten_vad.io import WavReader
+
+import bench_overhead
+import bench_pool
+
+DEFAULT_TESTSET = os.path.abspath(os.path.join(BENCH_DIR, "../testset"))
+
+IMPORT_SNIPPET = (
+    "import sys, time; sys.path.append(sys.argv[1]); start = time.perf_counter(); "
+    "from ten_vad import TenVad; print(time.perf_counter() - start)"
+)
+
+
+def parse_list(text):
+    return [int(value) for value in text.split(",") if value]
+
+
+def metric(value, unit, better="lower", floor=None):
+    entry = {"value": float(value), "unit": unit, "better": better}
+    if floor is not None:
+        entry["floor"] = float(floor)
+    return entry
+
+
+def reduce_repetitions(repetitions):
+    """Keep the best value of each metric; overhead metrics (with a floor) keep the median."""
+    results = {}
+    for key in repetitions[0]:
+        entries = sorted((current[key] for current in repetitions), key=lambda entry: entry["value"])
+        if "floor" in entries[0]:
+            results[key] = entries[len(entries) // 2]
+        else:
+            results[key] = entries[0] if entries[0]["better"] == "lower" else entries[-1]
+    return results
+
+
+def load_testset(testset_dir, max_files=None):
+    """Return the samples of every 16 kHz mono int16 WAV in the testset."""
+    paths = sorted(glob.glob(os.path.join(testset_dir, "*.wav")))[:max_files]
+    audio = []
+    for path in paths:
+        with WavReader(path) as wav:
+            if wav.info.sample_rate == 16000 and wav.info.channels == 1 and wav.info.dtype == np.int16:
+                audio.append(np.array(wav.samples))
+    if not audio:
+        raise SystemExit(f"No 16 kHz mono int16 WAV files found in {testset_dir}")
+    return audio
+
+
+def time_files(vad, audio, per_frame):
+    """Seconds to run every file through one handle, resetting it between files."""
+    elapsed = 0.0
+    for samples in audio:
+        vad.reset()
+        if per_frame:
+            frames = list(samples[: len(samples) // vad.hop_size * vad.hop_size].reshape(-1, vad.hop_size))
+            start = time.perf_counter()
+            for frame in frames:
+                vad.process(frame)
+        else:
+            start = time.perf_counter()
+            vad.process_array(samples)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench_hop_size(results, hop_size, audio, streams, overhead_frames):
+    prefix = f"hop_{hop_size}"
+    seconds = sum(len(samples) for samples in audio) / 16000.0
+    num_frames = sum(len(samples) // hop_size for samples in audio)
+    vad = TenVad(hop_size)
+    for name, per_frame in (("process", True), ("process_array", False)):
+        elapsed = time_files(vad, audio, per_frame)
+        results[f"{prefix}.{name}.rtf"] = metric(elapsed / seconds, "x realtime")
+        results[f"{prefix}.{name}.ns_per_frame"] = metric(elapsed * 1e9 / num_frames, "ns")
+
+    overhead = bench_overhead.run(overhead_frames, hop_size, None)
+    native = overhead["native_ns_per_frame"]
+    results[f"{prefix}.native.ns_per_frame"] = metric(native, "ns")
+    for name, row in overhead["entry_points"].items():
+        results[f"{prefix}.{name}.overhead_ns_per_frame"] = metric(row["overhead_ns_per_frame"], "ns", floor=native)
+
+    frames_per_stream = max(1, int(2 * 16000) // hop_size)
+    for num_streams in streams:
+        workers = min(num_streams, os.cpu_count() or 1)
+        fps = bench_pool.run_one(num_streams, workers, frames_per_stream, 10, hop_size)
+        results[f"{prefix}.streams_{num_streams}.frames_per_second"] = metric(fps, "frames/s", "higher")
+
+
+def bench_handles(results, repeat=200):
+    TenVad()  # Load the library outside the measurement
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vad = TenVad()
+        del vad
+    results["handle.create_destroy_us"] = metric((time.perf_counter() - start) * 1e6 / repeat, "us")
+    vad = TenVad()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vad.reset()
+    results["handle.reset_us"] = metric((time.perf_counter() - start) * 1e6 / repeat, "us")
+    start = time.perf_counter()
+    for i in range(repeat):
+        vad.set_threshold(0.3 + 0.4 * (i & 1))
+    results["handle.set_threshold_us"] = metric((time.perf_counter() - start) * 1e6 / repeat, "us")
+    # Call setup cost with a warm pool; the reset happens in release
+    acquire = 0.0
+    with TenVadHandlePool(min_size=1) as pool:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            vad = pool.acquire()
+            acquire += time.perf_counter() - start
+            pool.release(vad)
+    results["handle.pool_acquire_us"] = metric(acquire * 1e6 / repeat, "us")
+
+
+def bench_import(results, repeat=5):
+    """Median time of ``from ten_vad import TenVad`` in a fresh interpreter."""
+    times = [
+        float(subprocess.run([sys.executable, "-c", IMPORT_SNIPPET, SRC_DIR], capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+    results["import.ms"] = metric(statistics.median(times) * 1000, "ms")
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run(hop_sizes, streams, testset_dir, max_files=None, overhead_frames=2000, repeat=3):
+    audio = load_testset(testset_dir, max_files)
+    repetitions = []
+    for _ in range(max(1, repeat)):
+        current = {}
+        bench_import(current)
+        bench_handles(current)
+        for hop_size in hop_sizes:
+            bench_hop_size(current, hop_size, audio, streams, overhead_frames)
+        repetitions.append(current)
+    results = reduce_repetitions(repetitions)
+    rss = peak_rss_mb()
+    if rss is not None:
+        results["process.peak_rss_mb"] = metric(rss, "MB")
+    return {
+        "meta": {
+            "wrapper_version": __version__,
+            "library_version": TenVad().get_version(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "testset_files": len(audio),
+            "testset_seconds": sum(len(samples) for samples in audio) / 16000.0,
+            "repeat": repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "metrics": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Return report rows and whether any metric regressed beyond ``tolerance``."""
+    rows = []
+    regressed = False
+    for key, entry in current["metrics"].items():
+        base = baseline.get("metrics", {}).get(key)
+        scale = max(abs(base["value"]), base.get("floor", 0.0)) if base is not None else 0.0
+        if not scale:
+            rows.append((key, None, entry["value"], None, "new"))
+            continue
+        change = (entry["value"] - base["value"]) / scale
+        worse = change > tolerance if entry["better"] == "lower" else change < -tolerance
+        regressed = regressed or worse
+        rows.append((key, base["value"], entry["value"], change, "REGRESSION" if worse else "ok"))
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the TEN VAD benchmark suite over the testset.")
+    parser.add_argument("--hop-sizes", type=parse_list, default=[160, 256, 512], help="Comma separated hop sizes")
+    parser.add_argument("--streams", type=parse_list, default=[1, 4, 16], help="Comma separated concurrent stream counts")
+    parser.add_argument("--testset", default=DEFAULT_TESTSET, help="Directory of 16 kHz mono WAV files")
+    parser.add_argument("--files", type=int, default=None, help="Use only the first N files")
+    parser.add_argument("--overhead-frames", type=int, default=2000, help="Frames for the overhead measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions; the best value of each metric is kept")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a saved JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown (default 0.10)")
+    args = parser.parse_args()
+
+    results = run(args.hop_sizes, args.streams, args.testset, args.files, args.overhead_frames, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif not args.compare:
+        for key, entry in results["metrics"].items():
+            print(f"{key:<48}{entry['value']:>14.4g} {entry['unit']}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressed = compare(results, baseline, args.tolerance)
+        for key, before, after, change, status in rows:
+            before_text = f"{before:>14.4g}" if before is not None else f"{'-':>14}"
+            change_text = f"{change:>+9.1%}" if change is not None else f"{'':>9}"
+            print(f"{key:<48}{before_text}{after:>14.4g}{change_text}  {status}")
+        if regressed:
+            print(f"Regressions beyond {args.tolerance:.0%} against {args.compare}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
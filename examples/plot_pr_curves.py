@@ -5,9 +5,7 @@
 #
 import os, glob, sys, torchaudio
 import numpy as np
-import scipy.io.wavfile as Wavfile
 import matplotlib.pyplot as plt
-from sklearn.metrics import confusion_matrix
 import git # For cloning the repository
 
 # Path for the silero-vad repository
@@ -48,47 +46,9 @@ from silero_vad.utils_vad import VADIterator, init_jit_model
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 from ten_vad import TenVad
-
-def convert_label_to_framewise(label_file, hop_size):
-    frame_duration = hop_size / 16000
-    with open(label_file, "r") as f:
-        lines = f.readlines()
-    content = lines[0].strip().split(",")[1:]
-    start = np.array(
-        content[::3], dtype=float
-    )  # Start point of each audio segment
-    end = np.array(
-        content[1:][::3], dtype=float
-    )  # End point of each audio segment
-    lab_manual = np.array(
-        content[2:][::3], dtype=int
-    )  # label, 0/1 stands for non-speech or speech, respectively
-    assert (
-        len(start) == len(end) 
-        and len(start) == len(lab_manual) 
-        and len(end) == len(lab_manual)
-    )
-    
-    num = np.array(
-        np.round(((end - start) / frame_duration)), dtype=np.int32
-    )  # get number of frames of each audio segment
-    label_framewise = np.array([])
-    for segment_idx in range(len(num)):
-        cur_lab = int(lab_manual[segment_idx])
-        num_segment = num[segment_idx]
-
-        if cur_lab == 1:
-            vad_result_this_segment = np.ones(num_segment)
-        elif cur_lab == 0:
-            vad_result_this_segment = np.zeros(num_segment)
-        label_framewise = np.append(label_framewise, vad_result_this_segment)
-    frame_num = min(
-        label_framewise.__len__(), int((end[-1] - start[0]) / frame_duration)
-    )
-    label_framewise = label_framewise[:frame_num]
-
-    return label_framewise
-
+from ten_vad.eval import concatenate_scores, threshold_sweep
+from ten_vad.io import WavReader
+from ten_vad.labels import LabelDataset
 
 def read_file(file_path):
     with open(file_path, "r") as f:
@@ -99,20 +59,6 @@ def read_file(file_path):
 
     return lines_arr
 
-def get_precision_recall(VAD_result, label, threshold):
-    vad_result_hard = np.where(VAD_result >= threshold, 1, 0)
-
-    # Compute confusion matrix
-    TN, FP, FN, TP = confusion_matrix(label, vad_result_hard).ravel()
-
-    # Compute precision, recall, false positive rate and false negative rate
-    precision = TP / (TP + FP) if (TP + FP) > 0 else 0
-    recall = TP / (TP + FN) if (TP + FN) > 0 else 0
-    FPR = FP / (FP + TN) if (FP + TN) > 0 else 0
-    FNR = FN / (TP + FN) if (TP + FN) > 0 else 0
-
-    return precision, recall, FPR, FNR
-
 def silero_vad_inference_single_file(wav_path):
     current_directory = os.path.dirname(os.path.abspath(__file__))
     model = init_jit_model(f'{current_directory}/silero-vad/src/silero_vad/data/silero_vad.jit')
@@ -133,13 +79,8 @@ def silero_vad_inference_single_file(wav_path):
     return speech_probs, window_size_samples
 
 def ten_vad_process_wav(ten_vad_instance, wav_path, hop_size=256):
-    _, data = Wavfile.read(wav_path)
-    num_frames = data.shape[0] // hop_size
-    voice_prob_arr = np.array([])
-    for i in range(num_frames):
-        input_data = data[i * hop_size: (i + 1) * hop_size]
-        voice_prob, _ = ten_vad_instance.process(input_data)
-        voice_prob_arr = np.append(voice_prob_arr, voice_prob)
+    with WavReader(wav_path) as wav:
+        voice_prob_arr, _ = ten_vad_instance.process_array(wav.samples, hop_size=hop_size)
 
     return voice_prob_arr
 
@@ -153,9 +94,11 @@ if __name__ == "__main__":
     # Initialization
     hop_size = 256
     threshold = 0.5
-    label_all, vad_result_ten_vad_all = np.array([]), np.array([])
-    label_hop_512_all, vad_result_silero_vad_all = np.array([]), np.array([])
+    labels, vad_results_ten_vad = [], []
+    labels_hop_512, vad_results_silero_vad = [], []
     wav_list = glob.glob(f"{test_dir}/*.wav")
+    # Segment lists are parsed once and rasterized for each hop size
+    label_dataset = LabelDataset.for_wavs(wav_list)
 
     # Create ONE TenVad instance before the loop
     print("Initializing TEN VAD...")
@@ -164,43 +107,31 @@ if __name__ == "__main__":
 
     # The WebRTC VAD is from the latest version of WebRTC and is not plotted here
     print("Start processing")
-    for wav_path in wav_list:
+    for wav_path, label_segments in zip(wav_list, label_dataset):
         # Running TEN VAD
         # Use the master instance. The threshold is constant for this script.
-        label_file = wav_path.replace(".wav", ".scv")
-        label = convert_label_to_framewise(
-            label_file, hop_size=hop_size
-        )  # Convert the VAD label to frame-wise one
+        label = label_segments.rasterize(hop_size)  # Convert the VAD label to frame-wise one
         vad_result_ten_vad = ten_vad_process_wav(
             ten_vad_master_instance, wav_path, hop_size=hop_size # Use the single instance
         )
-        frame_num = min(label.__len__(), vad_result_ten_vad.__len__())
-        vad_result_ten_vad_all = np.append(
-            vad_result_ten_vad_all, vad_result_ten_vad[1:frame_num]
-        )
-        label_all = np.append(label_all, label[:frame_num - 1])
-        # No del ten_vad_instance needed here anymore
+        labels.append(label)
+        vad_results_ten_vad.append(vad_result_ten_vad)
 
         # Running Silero VAD
-        label_hop_512 = convert_label_to_framewise(
-            label_file, hop_size=512
-        )  # Convert the VAD label to frame-wise one for Silero VAD
+        label_hop_512 = label_segments.rasterize(512)  # Frame-wise label for Silero VAD
         vad_result_silero_vad, _ = silero_vad_inference_single_file(wav_path)
-        frame_num_silero_vad = min(label_hop_512.__len__(), vad_result_silero_vad.__len__())
-        vad_result_silero_vad_all = np.append(vad_result_silero_vad_all, vad_result_silero_vad[:frame_num_silero_vad])
-        label_hop_512_all = np.append(label_hop_512_all, label_hop_512[:frame_num_silero_vad])
+        labels_hop_512.append(label_hop_512)
+        vad_results_silero_vad.append(vad_result_silero_vad)
 
-    # Compute Precision and Recall  
+    # Compute Precision and Recall for all thresholds in one pass.
+    # TEN VAD results lag the labels by one frame.
     threshold_arr = np.arange(0, 1.01, 0.01)
-    pr_data_arr = np.zeros((threshold_arr.__len__(), 3))
-    pr_data_silero_vad_arr = np.zeros((threshold_arr.__len__(), 3))
-
-    for ind, threshold in enumerate(threshold_arr):
-        precision, recall, FPR, FNR = get_precision_recall(vad_result_ten_vad_all, label_all, threshold)
-        pr_data_arr[ind] = precision, recall, threshold
-
-        precision_silero_vad, recall_silero_vad, FPR_silero_vad, FNR_silero_vad = get_precision_recall(vad_result_silero_vad_all, label_hop_512_all, threshold)
-        pr_data_silero_vad_arr[ind] = precision_silero_vad, recall_silero_vad, threshold
+    sweep = threshold_sweep(*concatenate_scores(vad_results_ten_vad, labels, delay=1), threshold_arr)
+    sweep_silero_vad = threshold_sweep(*concatenate_scores(vad_results_silero_vad, labels_hop_512), threshold_arr)
+    pr_data_arr = np.stack([sweep.precision, sweep.recall, threshold_arr], axis=1)
+    pr_data_silero_vad_arr = np.stack([sweep_silero_vad.precision, sweep_silero_vad.recall, threshold_arr], axis=1)
+    print(f"TEN VAD: AUC {sweep.auc():.4f}, best F1 {sweep.best_f1()}")
+    print(f"Silero VAD: AUC {sweep_silero_vad.auc():.4f}, best F1 {sweep_silero_vad.best_f1()}")
 
     # Plot PR Curve
     print("Plotting PR Curve")
@@ -4,9 +4,54 @@ Voice Activity Detection (VAD) package from the TEN Framework.
 This package provides Python bindings to the ten_vad C library.
 For the C interface, see the header file in include/ten_vad.h.
 """
+import importlib
 
-# Import the main class directly into the package namespace
-from .wrapper import TenVad
+# Public names and the submodules that define them. Submodules (and NumPy)
+# are imported on first access, so ``import ten_vad`` itself is almost free.
+_EXPORTS = {
+    "TenVad": "wrapper",
+    "LibraryCapabilities": "wrapper",
+    "get_library_capabilities": "wrapper",
+    "get_library_path": "wrapper",
+    "get_library_version": "wrapper",
+    "load_library": "wrapper",
+    "EnergyGate": "gate",
+    "TenVadPool": "pool",
+    "TenVadHandlePool": "pool",
+    "TenVadStream": "stream",
+    "VadService": "service",
+    "VadServiceClient": "service",
+    "VadServer": "server",
+    "MultiChannelVad": "multichannel",
+    "DeadlineScheduler": "scheduler",
+    "process_chunked": "parallel",
+    "ResultStore": "store",
+    "ResultWriter": "store",
+    "AudioFrontend": "frontend",
+    "StreamingResampler": "frontend",
+    "SpeechSegmenter": "segmenter",
+    "SpeechStart": "segmenter",
+    "SpeechEnd": "segmenter",
+    "segments_from_probabilities": "segmenter",
+    "SpeechTrimmer": "trim",
+    "OffsetMap": "trim",
+    "trim_wav": "trim",
+}
+
+__all__ = list(_EXPORTS)
 
 # Define package metadata
-__version__ = "1.0.1" 
\ No newline at end of file
+__version__ = "1.0.1"
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
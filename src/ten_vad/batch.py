@@ -0,0 +1,276 @@
+"""Parallel VAD over a corpus of WAV files.
+
+Files are fanned out over a process pool. Each worker loads the library and
+creates its ``TenVad`` handle once, from a picklable ``BatchConfig``, and
+resets the model state between files. Inputs are memory-mapped and
+processed block by block (see ``ten_vad.io``). Results are written as one ``.npz``
+file per input (``probabilities`` float32, ``flags`` uint8), or as a compact
+``.tvr`` result store with ``--format tvr`` (see ``ten_vad.store``), and every
+finished file is appended to ``manifest.jsonl`` in the output directory. On
+a rerun, files whose size, mtime, hop_size, threshold and library version
+match their manifest entry (and output format) are skipped.
+
+Usage:
+    python -m ten_vad.batch testset/ -o out/ --jobs 8
+    python -m ten_vad.batch --file-list files.txt -o out/ --format tvr
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .io import WavReader, process_wav
+from .store import write_results
+from .wrapper import TenVad, get_library_version
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+OUTPUT_SUFFIX = ".vad.npz"
+OUTPUT_SUFFIXES = {"npz": OUTPUT_SUFFIX, "tvr": ".vad.tvr"}
+
+
+class BatchConfig(NamedTuple):
+    """Picklable settings a worker needs to build its handle."""
+
+    hop_size: int = 256
+    threshold: float = 0.5
+    output_format: str = "npz"  # "npz" or "tvr"
+
+
+class BatchSummary(NamedTuple):
+    """Counts of a batch run; ``failed`` maps input paths to error messages."""
+
+    processed: int
+    skipped: int
+    failed: Dict[str, str]
+
+
+_worker_vad: Optional[TenVad] = None
+
+
+def _init_worker(config: BatchConfig) -> None:
+    """Process pool initializer: create the worker's handle once."""
+    global _worker_vad
+    _worker_vad = TenVad(config.hop_size, config.threshold)
+
+
+def process_file(path: str, output_path: str) -> Tuple[int, int]:
+    """Run the worker's handle over one file and write its results.
+
+    Args:
+        path (str): Input WAV file.
+        output_path (str): Destination ``.npz`` file, or ``.tvr`` for a result store.
+
+    Returns:
+        Tuple[int, int]: Number of frames and number of speech frames.
+    """
+    vad = _worker_vad
+    vad.reset()
+    with WavReader(path) as wav:
+        info = wav.info
+        if info.sample_rate != 16000 or info.channels != 1 or info.dtype != np.int16:
+            raise ValueError(f"[TEN VAD]: {path} must be 16 kHz mono 16-bit PCM")
+        probabilities, flags = process_wav(vad, wav)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    if output_path.endswith(".tvr"):
+        write_results(output_path, probabilities, flags, hop_size=vad.hop_size, threshold=vad.threshold)
+    else:
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, probabilities=probabilities, flags=flags)
+        os.replace(tmp_path, output_path)
+    return len(flags), int(np.count_nonzero(flags))
+
+
+def find_wav_files(inputs: Iterable[str], file_list: Optional[str] = None) -> List[str]:
+    """Expand directories (recursively) and list files into absolute WAV paths.
+
+    Args:
+        inputs (Iterable[str]): WAV files or directories.
+        file_list (str, optional): Text file with one path per line.
+
+    Returns:
+        List[str]: Sorted, de-duplicated absolute paths.
+    """
+    paths = list(inputs)
+    if file_list:
+        with open(file_list, "r") as f:
+            paths.extend(line.strip() for line in f if line.strip())
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.update(os.path.join(root, name) for name in names if name.lower().endswith(".wav"))
+        else:
+            found.add(path)
+    return sorted(os.path.abspath(path) for path in found)
+
+
+def load_manifest(output_dir: str) -> Dict[str, dict]:
+    """Load the manifest of an output directory; later records win."""
+    entries: Dict[str, dict] = {}
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return entries
+    with open(manifest_path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Tolerate a truncated last line from an interrupted run
+            entries[entry["path"]] = entry
+    return entries
+
+
+def _write_manifest(output_dir: str, entries: Iterable[dict]) -> None:
+    """Atomically rewrite the manifest with one record per file."""
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def _output_path(path: str, root: str, output_dir: str, output_format: str = "npz") -> str:
+    relative = os.path.relpath(path, root)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + OUTPUT_SUFFIXES[output_format])
+
+
+def _is_current(entry: Optional[dict], stat: os.stat_result, config: BatchConfig, library_version: str) -> bool:
+    return (
+        entry is not None
+        and entry["size"] == stat.st_size
+        and entry["mtime_ns"] == stat.st_mtime_ns
+        and entry["hop_size"] == config.hop_size
+        and entry["threshold"] == config.threshold
+        and entry["library_version"] == library_version
+        and entry.get("output_format", "npz") == config.output_format
+        and os.path.exists(entry["output"])
+    )
+
+
+def run_batch(
+    files: List[str],
+    output_dir: str,
+    config: BatchConfig = BatchConfig(),
+    jobs: Optional[int] = None,
+    force: bool = False,
+) -> BatchSummary:
+    """Process WAV files in parallel, skipping files the manifest marks as current.
+
+    Args:
+        files (List[str]): Absolute WAV paths, e.g. from ``find_wav_files``.
+        output_dir (str): Directory for per-file results and the manifest.
+        config (BatchConfig, optional): Handle settings for every worker.
+        jobs (int, optional): Worker processes. Defaults to the CPU count; 1 runs in-process.
+        force (bool, optional): Reprocess files even if they are current. Defaults to False.
+
+    Returns:
+        BatchSummary: Processed, skipped and failed files.
+    """
+    from . import __version__
+
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    library_version = get_library_version()
+    manifest = load_manifest(output_dir)
+    _write_manifest(output_dir, manifest.values())
+    root = os.path.commonpath([os.path.dirname(path) for path in files]) if files else output_dir
+
+    todo = []
+    skipped = 0
+    failed: Dict[str, str] = {}
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError as exc:
+            logger.error("[TEN VAD]: Failed to process %s: %s", path, exc)
+            failed[path] = str(exc)
+            continue
+        if not force and _is_current(manifest.get(path), stat, config, library_version):
+            skipped += 1
+        else:
+            todo.append((path, stat, _output_path(path, root, output_dir, config.output_format)))
+
+    processed = 0
+    with open(os.path.join(output_dir, MANIFEST_NAME), "a") as manifest_file:
+        def record(path, stat, output_path, frames, speech_frames):
+            entry = {
+                "path": path,
+                "output": output_path,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hop_size": config.hop_size,
+                "threshold": config.threshold,
+                "output_format": config.output_format,
+                "library_version": library_version,
+                "wrapper_version": __version__,
+                "frames": frames,
+                "speech_frames": speech_frames,
+                "processed_at": time.time(),
+            }
+            manifest_file.write(json.dumps(entry) + "\n")
+            manifest_file.flush()
+
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1:
+            _init_worker(config)
+            for path, stat, output_path in todo:
+                try:
+                    record(path, stat, output_path, *process_file(path, output_path))
+                    processed += 1
+                except Exception as exc:
+                    logger.error("[TEN VAD]: Failed to process %s: %s", path, exc)
+                    failed[path] = str(exc)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(config,)) as executor:
+                futures = {
+                    executor.submit(process_file, path, output_path): (path, stat, output_path)
+                    for path, stat, output_path in todo
+                }
+                for future in as_completed(futures):
+                    path, stat, output_path = futures[future]
+                    try:
+                        record(path, stat, output_path, *future.result())
+                        processed += 1
+                    except Exception as exc:
+                        logger.error("[TEN VAD]: Failed to process %s: %s", path, exc)
+                        failed[path] = str(exc)
+    return BatchSummary(processed, skipped, failed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ten_vad.batch", description="Run TEN VAD over a corpus of WAV files.")
+    parser.add_argument("inputs", nargs="*", help="WAV files or directories (searched recursively)")
+    parser.add_argument("--file-list", help="Text file with one WAV path per line")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for results and manifest.jsonl")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--hop-size", type=int, default=256, help="Frame size in samples (default: 256)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Speech threshold (default: 0.5)")
+    parser.add_argument(
+        "--format", choices=sorted(OUTPUT_SUFFIXES), default="npz", help="Result file format (default: npz)"
+    )
+    parser.add_argument("--force", action="store_true", help="Reprocess files that are already up to date")
+    args = parser.parse_args(argv)
+
+    files = find_wav_files(args.inputs, args.file_list)
+    if not files:
+        parser.error("no WAV files found")
+    start = time.perf_counter()
+    summary = run_batch(files, args.output_dir, BatchConfig(args.hop_size, args.threshold, args.format), args.jobs, args.force)
+    print(
+        f"[TEN VAD]: processed {summary.processed}, skipped {summary.skipped}, "
+        f"failed {len(summary.failed)} in {time.perf_counter() - start:.1f}s"
+    )
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
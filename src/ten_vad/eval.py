@@ -0,0 +1,171 @@
+"""Threshold sweeps over frame-level VAD scores.
+
+Scores of all files are gathered into one preallocated array with
+``concatenate_scores``. ``threshold_sweep`` then sorts the scores of speech
+and non-speech frames once and reads true and false positive counts for
+every threshold off the sorted arrays. A sweep costs O(n log n) in the
+number of frames, however many thresholds are evaluated. A frame counts as
+detected when ``score >= threshold``.
+
+Example:
+    scores, labels = concatenate_scores(per_file_probabilities, per_file_labels)
+    sweep = threshold_sweep(scores, labels, np.arange(0, 1.01, 0.01))
+    print(sweep.auc(), sweep.best_f1())
+"""
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class OperatingPoint(NamedTuple):
+    """Metrics of a single threshold."""
+
+    threshold: float
+    precision: float
+    recall: float
+    f1: float
+    fpr: float
+
+
+class ThresholdSweep(NamedTuple):
+    """Detection counts and rates per threshold, in increasing threshold order."""
+
+    thresholds: np.ndarray
+    tp: np.ndarray  # Speech frames with score >= threshold
+    fp: np.ndarray  # Non-speech frames with score >= threshold
+    positives: int  # Speech frames
+    negatives: int  # Non-speech frames
+
+    @property
+    def fn(self) -> np.ndarray:
+        return self.positives - self.tp
+
+    @property
+    def tn(self) -> np.ndarray:
+        return self.negatives - self.fp
+
+    @property
+    def precision(self) -> np.ndarray:
+        """TP / (TP + FP); 0 where nothing is detected."""
+        return _ratio(self.tp, self.tp + self.fp)
+
+    @property
+    def recall(self) -> np.ndarray:
+        """TP / (TP + FN), the true positive rate; 0 without speech frames."""
+        return _ratio(self.tp, np.full_like(self.tp, self.positives))
+
+    @property
+    def fpr(self) -> np.ndarray:
+        """FP / (FP + TN); 0 without non-speech frames."""
+        return _ratio(self.fp, np.full_like(self.fp, self.negatives))
+
+    @property
+    def fnr(self) -> np.ndarray:
+        """FN / (TP + FN); 0 without speech frames."""
+        return _ratio(self.fn, np.full_like(self.tp, self.positives))
+
+    @property
+    def f1(self) -> np.ndarray:
+        """2 TP / (2 TP + FP + FN); 0 where undefined."""
+        return _ratio(2 * self.tp, self.tp + self.fp + self.positives)
+
+    def auc(self) -> float:
+        """Area under the ROC curve (recall against FPR), by the trapezoidal rule.
+
+        The curve is closed with the (0, 0) and (1, 1) corners. For a sweep
+        over all distinct scores this is the exact AUC, with tied scores
+        counted as half.
+        """
+        fpr = np.concatenate(([1.0], self.fpr, [0.0]))
+        tpr = np.concatenate(([1.0], self.recall, [0.0]))
+        # Rates fall as the threshold rises: the curve runs from (1, 1) to (0, 0)
+        return float(np.sum((fpr[:-1] - fpr[1:]) * (tpr[:-1] + tpr[1:])) / 2.0)
+
+    def best_f1(self) -> OperatingPoint:
+        """Threshold with the highest F1 score (the lowest such threshold on ties)."""
+        return self.point(int(np.argmax(self.f1)))
+
+    def point(self, index: int) -> OperatingPoint:
+        """Metrics of the threshold at ``index``."""
+        tp, fp = int(self.tp[index]), int(self.fp[index])
+        return OperatingPoint(
+            threshold=float(self.thresholds[index]),
+            precision=tp / (tp + fp) if tp + fp else 0.0,
+            recall=tp / self.positives if self.positives else 0.0,
+            f1=2 * tp / (tp + fp + self.positives) if tp + fp + self.positives else 0.0,
+            fpr=fp / self.negatives if self.negatives else 0.0,
+        )
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def concatenate_scores(
+    probabilities: Sequence[np.ndarray], labels: Sequence[np.ndarray], delay: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Align per-file scores with frame labels and join them into two flat arrays.
+
+    Each pair is truncated to its shorter member. The output arrays are
+    allocated once at their final size.
+
+    Args:
+        probabilities (Sequence[np.ndarray]): Per-file frame scores.
+        labels (Sequence[np.ndarray]): Per-file frame labels, nonzero for speech.
+        delay (int, optional): Frames the scores lag the labels by; the first
+            ``delay`` scores of each file are dropped. Defaults to 0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: float32 scores and bool labels.
+
+    Raises:
+        ValueError: If the sequences differ in length or delay is negative.
+    """
+    if len(probabilities) != len(labels):
+        raise ValueError("[TEN VAD]: probabilities and labels must have the same number of files")
+    if delay < 0:
+        raise ValueError("[TEN VAD]: delay must not be negative")
+    lengths = [max(0, min(len(p) - delay, len(l))) for p, l in zip(probabilities, labels)]
+    total = sum(lengths)
+    scores = np.empty(total, dtype=np.float32)
+    truth = np.empty(total, dtype=bool)
+    start = 0
+    for p, l, n in zip(probabilities, labels, lengths):
+        scores[start:start + n] = p[delay:delay + n]
+        np.not_equal(l[:n], 0, out=truth[start:start + n])
+        start += n
+    return scores, truth
+
+
+def threshold_sweep(scores: np.ndarray, labels: np.ndarray, thresholds: Optional[np.ndarray] = None) -> ThresholdSweep:
+    """Count detections at every threshold in one sorted pass.
+
+    Args:
+        scores (np.ndarray): Frame scores, e.g. speech probabilities.
+        labels (np.ndarray): Frame labels of the same length, nonzero for speech.
+        thresholds (np.ndarray, optional): Thresholds to evaluate. Defaults to
+            every distinct score, which traces the exact PR and ROC curves.
+
+    Returns:
+        ThresholdSweep: Counts per threshold, thresholds in increasing order.
+
+    Raises:
+        ValueError: If scores and labels differ in length.
+    """
+    scores = np.asarray(scores).reshape(-1)
+    labels = np.asarray(labels).reshape(-1)
+    if len(scores) != len(labels):
+        raise ValueError("[TEN VAD]: scores and labels must have the same length")
+    speech = labels != 0
+    positive_scores = np.sort(scores[speech])
+    negative_scores = np.sort(scores[~speech])
+    if thresholds is None:
+        thresholds = np.unique(np.concatenate((positive_scores, negative_scores)))
+    else:
+        thresholds = np.sort(np.asarray(thresholds, dtype=np.float64).reshape(-1))
+    # Frames at or above a threshold are those from its left insertion point on
+    tp = len(positive_scores) - np.searchsorted(positive_scores, thresholds, side="left")
+    fp = len(negative_scores) - np.searchsorted(negative_scores, thresholds, side="left")
+    return ThresholdSweep(thresholds, tp.astype(np.int64), fp.astype(np.int64), len(positive_scores), len(negative_scores))
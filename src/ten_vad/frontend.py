@@ -0,0 +1,299 @@
+"""Input conversion in front of the VAD.
+
+The model consumes 16 kHz mono int16. ``AudioFrontend`` turns chunks of
+float32/float64 ([-1, 1]), int32, int16 or 8-bit unsigned PCM, mono or
+interleaved multi-channel, at any integer sample rate into that format:
+
+* channels are averaged and samples scaled with vectorized NumPy;
+* other sample rates go through ``StreamingResampler``, a polyphase FIR
+  resampler that carries its filter history from one chunk to the next, so
+  chunk boundaries leave no artifacts and the output of a stream is the
+  same however it is chunked.
+
+Work buffers are kept between calls and only grow when a larger chunk
+arrives. Arrays returned by ``process`` are views of these buffers and are
+only valid until the next call; copy them if they need to live longer.
+
+Example:
+    frontend = AudioFrontend(sample_rate=48000, channels=2)
+    stream = TenVadStream(hop_size=256)
+    for packet in webrtc_packets:  # float32, shape (n, 2)
+        results = stream.feed(frontend.process(packet))
+"""
+from math import gcd
+from typing import Optional
+
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16000
+
+# Up to this many filter phases, outputs are computed phase by phase from
+# strided window views instead of gathering every window into a work buffer.
+_MAX_STRIDED_PHASES = 8
+
+
+def _grow(buffer: Optional[np.ndarray], size: int, dtype) -> np.ndarray:
+    """Return a work buffer of at least ``size`` elements, reusing ``buffer`` when it is big enough."""
+    if buffer is None or len(buffer) < size:
+        return np.empty(max(size, 2 * len(buffer) if buffer is not None else size), dtype=dtype)
+    return buffer
+
+
+def _as_frames(audio: np.ndarray, channels: int) -> np.ndarray:
+    """Return audio as (num_samples, channels); flat input is taken as interleaved."""
+    audio = np.asarray(audio)
+    if audio.ndim == 1:
+        if channels == 1:
+            return audio.reshape(-1, 1)
+        if len(audio) % channels:
+            raise ValueError(f"[TEN VAD]: interleaved audio length must be a multiple of {channels}")
+        return audio.reshape(-1, channels)
+    if audio.ndim != 2 or audio.shape[1] != channels:
+        raise ValueError(f"[TEN VAD]: audio shape should be (n,) or (n, {channels})")
+    return audio
+
+
+def _scale(dtype: np.dtype) -> float:
+    """Factor that maps a sample type onto the int16 range."""
+    if dtype.kind == "f":
+        return 32768.0
+    if dtype == np.int32:
+        return 1.0 / 65536.0
+    if dtype == np.int16:
+        return 1.0
+    if dtype == np.uint8:
+        return 256.0
+    raise TypeError(f"[TEN VAD]: unsupported audio data type {dtype}")
+
+
+def to_float_mono(audio: np.ndarray, channels: int = 1, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Downmix and scale audio to float32 samples in int16 units.
+
+    Args:
+        audio (np.ndarray): Samples of shape (n,) or (n, channels); flat multi-channel input is interleaved.
+        channels (int, optional): Number of channels. Defaults to 1.
+        out (np.ndarray, optional): float32 buffer of at least n elements to write into.
+
+    Returns:
+        np.ndarray: float32 mono samples, scaled so that full scale is 32768.
+
+    Raises:
+        TypeError: If the sample type is not supported.
+        ValueError: If the shape does not match ``channels``.
+    """
+    frames = _as_frames(audio, channels)
+    scale = _scale(frames.dtype)
+    num_samples = frames.shape[0]
+    out = np.empty(num_samples, dtype=np.float32) if out is None else out[:num_samples]
+    if channels == 1:
+        np.multiply(frames[:, 0], scale, out=out, casting="unsafe")
+    else:
+        np.sum(frames, axis=1, dtype=np.float32, out=out)
+        out *= scale / channels
+    if frames.dtype == np.uint8:
+        out -= 32768.0
+    return out
+
+
+def to_int16(audio: np.ndarray, channels: int = 1, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Downmix and convert audio to int16 without resampling.
+
+    Mono int16 input is returned as is; mono int32 is shifted exactly.
+
+    Args:
+        audio (np.ndarray): Samples of shape (n,) or (n, channels); flat multi-channel input is interleaved.
+        channels (int, optional): Number of channels. Defaults to 1.
+        out (np.ndarray, optional): int16 buffer of at least n elements to write into.
+
+    Returns:
+        np.ndarray: int16 mono samples.
+
+    Raises:
+        TypeError: If the sample type is not supported.
+        ValueError: If the shape does not match ``channels``.
+    """
+    frames = _as_frames(audio, channels)
+    if channels == 1 and frames.dtype == np.int16:
+        return frames[:, 0]
+    if channels == 1 and frames.dtype == np.int32:
+        num_samples = frames.shape[0]
+        out = np.empty(num_samples, dtype=np.int16) if out is None else out[:num_samples]
+        np.right_shift(frames[:, 0], 16, out=out, casting="unsafe")
+        return out
+    return _float_to_int16(to_float_mono(frames, channels), out)
+
+
+def _float_to_int16(samples: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Round and saturate float samples in int16 units to int16; ``samples`` is clipped in place."""
+    num_samples = len(samples)
+    out = np.empty(num_samples, dtype=np.int16) if out is None else out[:num_samples]
+    np.clip(samples, -32768.0, 32767.0, out=samples)
+    np.rint(samples, out=samples)
+    out[...] = samples
+    return out
+
+
+def _kaiser_sinc(up: int, down: int, zero_crossings: int, rolloff: float, beta: float) -> np.ndarray:
+    """Low-pass prototype at the upsampled rate, cut off below the lower Nyquist rate."""
+    factor = max(up, down)
+    length = 2 * zero_crossings * factor + 1
+    cutoff = rolloff * 0.5 / factor  # cycles per upsampled sample
+    t = np.arange(length) - (length - 1) / 2.0
+    return (2 * cutoff * up) * np.sinc(2 * cutoff * t) * np.kaiser(length, beta)
+
+
+class StreamingResampler:
+    """Rational polyphase resampler that keeps its state across chunks.
+
+    The ratio ``out_rate / in_rate`` is reduced to ``up / down``; each output
+    sample is the dot product of one of ``up`` filter phases with the last
+    ``taps`` input samples. The filter history is carried over between
+    chunks, so resampling a signal chunk by chunk gives exactly the same
+    output as resampling it in one piece. The output lags the input by about
+    ``zero_crossings`` input samples.
+
+    Args:
+        in_rate (int): Input sample rate.
+        out_rate (int, optional): Output sample rate. Defaults to 16000.
+        zero_crossings (int, optional): Filter half-length in zero crossings. Defaults to 16.
+        rolloff (float, optional): Cutoff as a fraction of the lower Nyquist rate. Defaults to 0.9.
+        beta (float, optional): Kaiser window parameter. Defaults to 8.0.
+
+    Raises:
+        ValueError: If a sample rate is not positive.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int = TARGET_SAMPLE_RATE, zero_crossings: int = 16, rolloff: float = 0.9, beta: float = 8.0):
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("[TEN VAD]: sample rates must be positive")
+        divisor = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // divisor
+        self.down = in_rate // divisor
+        prototype = _kaiser_sinc(self.up, self.down, zero_crossings, rolloff, beta)
+        self.taps = -(-len(prototype) // self.up)
+        padded = np.zeros(self.taps * self.up, dtype=np.float64)
+        padded[: len(prototype)] = prototype
+        # phases[p, i] weights input sample (base - taps + 1 + i) for outputs of phase p
+        self._phases = padded.reshape(self.taps, self.up).T[:, ::-1].astype(np.float32)
+        # Work buffers, grown on demand and reused across chunks
+        self._buffer: Optional[np.ndarray] = None
+        self._windows: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+        self._output: Optional[np.ndarray] = None
+        self._positions: Optional[np.ndarray] = None
+        self._phase_index: Optional[np.ndarray] = None
+        self._ramp: Optional[np.ndarray] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the filter history."""
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        # Upsampled-rate position of the next output, relative to the start of the history
+        self._next = (self.taps - 1) * self.up
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample the next chunk of a mono signal.
+
+        Args:
+            samples (np.ndarray): float32 mono samples.
+
+        Returns:
+            np.ndarray: float32 output samples (a view valid until the next call).
+        """
+        taps, up, down = self.taps, self.up, self.down
+        history = taps - 1
+        length = history + len(samples)
+        self._buffer = buffer = _grow(self._buffer, length, np.float32)
+        buffer[:history] = self._history
+        buffer[history:length] = samples
+
+        last = length * up - 1  # Last upsampled position backed by input
+        num_out = max(0, (last - self._next) // down + 1)
+        if self._ramp is None or len(self._ramp) < num_out:
+            self._ramp = np.arange(max(num_out, 2 * len(self._ramp) if self._ramp is not None else num_out), dtype=np.int64) * down
+        self._positions = _grow(self._positions, num_out, np.int64)
+        self._phase_index = _grow(self._phase_index, num_out, np.int64)
+        positions = self._positions[:num_out]
+        phases = self._phase_index[:num_out]
+        np.add(self._ramp[:num_out], self._next, out=positions)
+        np.remainder(positions, up, out=phases)
+        positions //= up
+        positions -= history  # First input sample of each output's window
+
+        windows = np.lib.stride_tricks.sliding_window_view(buffer[:length], taps)
+        self._output = _grow(self._output, num_out, np.float32)
+        output = self._output[:num_out]
+        if up <= _MAX_STRIDED_PHASES:
+            # Outputs k, k + up, k + 2 * up, ... share a phase and their windows
+            # start ``down`` samples apart, so each group is one strided matmul.
+            for first in range(min(up, num_out)):
+                count = (num_out - first + up - 1) // up
+                start = positions[first]
+                np.matmul(windows[start:start + (count - 1) * down + 1:down], self._phases[phases[first]], out=output[first::up])
+        else:
+            self._windows = _grow(self._windows, num_out * taps, np.float32)
+            self._weights = _grow(self._weights, num_out * taps, np.float32)
+            work = self._windows[: num_out * taps].reshape(num_out, taps)
+            weights = self._weights[: num_out * taps].reshape(num_out, taps)
+            np.take(windows, positions, axis=0, out=work)
+            np.take(self._phases, phases, axis=0, out=weights)
+            work *= weights
+            np.sum(work, axis=1, out=output)
+
+        self._next += num_out * down - len(samples) * up
+        self._history[:] = buffer[length - history:length]
+        return output
+
+
+class AudioFrontend:
+    """Convert arbitrary input chunks to the 16 kHz mono int16 the model expects.
+
+    Args:
+        sample_rate (int, optional): Input sample rate. Defaults to 16000.
+        channels (int, optional): Input channels; flat chunks are taken as interleaved. Defaults to 1.
+        **resampler_options: Passed to ``StreamingResampler``.
+
+    Raises:
+        ValueError: If sample_rate or channels is not positive.
+    """
+
+    def __init__(self, sample_rate: int = TARGET_SAMPLE_RATE, channels: int = 1, **resampler_options):
+        if channels <= 0:
+            raise ValueError("[TEN VAD]: channels must be positive")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.resampler = (
+            StreamingResampler(sample_rate, TARGET_SAMPLE_RATE, **resampler_options) if sample_rate != TARGET_SAMPLE_RATE else None
+        )
+        self._float: Optional[np.ndarray] = None
+        self._int16: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        """Clear the resampler history for a new stream."""
+        if self.resampler is not None:
+            self.resampler.reset()
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Convert one chunk.
+
+        Args:
+            chunk (np.ndarray): Samples of shape (n,) or (n, channels).
+
+        Returns:
+            np.ndarray: 16 kHz mono int16 samples (may be a view of the input or
+            of an internal buffer, valid until the next call).
+
+        Raises:
+            TypeError: If the sample type is not supported.
+            ValueError: If the shape does not match ``channels``.
+        """
+        num_samples = len(chunk) if np.ndim(chunk) != 1 else len(chunk) // self.channels
+        if self.resampler is None:
+            self._int16 = _grow(self._int16, num_samples, np.int16)
+            return to_int16(chunk, self.channels, out=self._int16)
+        self._float = _grow(self._float, num_samples, np.float32)
+        resampled = self.resampler.process(to_float_mono(chunk, self.channels, out=self._float))
+        self._int16 = _grow(self._int16, len(resampled), np.int16)
+        return _float_to_int16(resampled, out=self._int16)
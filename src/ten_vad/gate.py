@@ -0,0 +1,139 @@
+"""Energy pre-gate that skips inference on silent frames.
+
+Digital silence and low comfort noise do not need the model: an
+``EnergyGate`` measures the RMS and peak level of every frame with a few
+vectorized NumPy operations, and frames below both floors are reported as
+non-speech (probability 0, flag 0) without calling ``ten_vad_process``.
+
+Two counts keep the recurrent model state sound around gated stretches:
+
+* ``hold``: quiet frames right after louder audio still go through the
+  model, so its output decays as it would without the gate; gating starts
+  with the quiet frame after them.
+* ``warmup``: before the first frame that passes after a gated stretch,
+  the last ``warmup`` gated frames are fed to the model (outputs
+  discarded), so its state has caught up with the silence when the gate
+  reopens.
+
+Attach a gate with ``TenVad.set_energy_gate``; it then applies to
+``process``, ``process_unchecked``, ``process_array`` and every API built
+on them (streams, pools, ``process_wav``).
+
+Example:
+    vad = TenVad(256)
+    gate = vad.set_energy_gate(EnergyGate(floor_dbfs=-60.0))
+    probabilities, flags = vad.process_array(audio)
+    print(gate.gated_frames / gate.frames)
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+FULL_SCALE = 32768.0  # int16 full scale, 0 dBFS
+
+
+class EnergyGate:
+    """Decide per frame whether the model needs to run.
+
+    Args:
+        floor_dbfs (float, optional): RMS level in dBFS below which a frame
+            may be gated. Defaults to -60.
+        peak_dbfs (float, optional): Peak level in dBFS below which a frame
+            may be gated. Defaults to ``floor_dbfs + 12``.
+        hold (int, optional): Quiet frames still processed after louder
+            audio. Defaults to 8.
+        warmup (int, optional): Gated frames fed to the model before it
+            resumes. Defaults to 8.
+
+    Raises:
+        ValueError: If hold or warmup is negative.
+    """
+
+    def __init__(self, floor_dbfs: float = -60.0, peak_dbfs: Optional[float] = None, hold: int = 8, warmup: int = 8):
+        if hold < 0 or warmup < 0:
+            raise ValueError("[TEN VAD]: hold and warmup must not be negative")
+        self.floor_dbfs = floor_dbfs
+        self.peak_dbfs = floor_dbfs + 12.0 if peak_dbfs is None else peak_dbfs
+        self.hold = hold
+        self.warmup = warmup
+        # Compare mean squares and peaks in int16 units to skip the sqrt and log
+        self._mean_square_floor = (FULL_SCALE * 10.0 ** (floor_dbfs / 20.0)) ** 2
+        self._peak_floor = FULL_SCALE * 10.0 ** (self.peak_dbfs / 20.0)
+        self.frames = 0  # Frames seen
+        self.gated_frames = 0  # Frames answered without the model
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the audio seen so far; counters are kept."""
+        self._quiet_run = 0  # Consecutive quiet frames at the end of the last call
+        self._tail: Optional[np.ndarray] = None  # Last ``warmup`` frames of the last call
+
+    def levels(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """RMS and peak level of each frame in dBFS.
+
+        Args:
+            frames (np.ndarray): int16 array of shape (num_frames, hop_size).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float64 RMS and peak levels; -inf for digital silence.
+        """
+        mean_square, peak = self._measure(frames)
+        with np.errstate(divide="ignore"):
+            return 10.0 * np.log10(mean_square / FULL_SCALE ** 2), 20.0 * np.log10(peak / FULL_SCALE)
+
+    def plan(self, frames: np.ndarray) -> List[Tuple[int, int, Optional[np.ndarray]]]:
+        """Split a block into the runs of frames the model must process.
+
+        Frames outside the returned runs are gated. Updates the gate state
+        and counters, so every frame must be planned exactly once, in order.
+
+        Args:
+            frames (np.ndarray): int16 array of shape (num_frames, hop_size).
+
+        Returns:
+            List[Tuple[int, int, Optional[np.ndarray]]]: ``(start, end, warmup_frames)``
+            per run; ``warmup_frames`` are to be fed before frame ``start``.
+        """
+        num_frames = frames.shape[0]
+        mean_square, peak = self._measure(frames)
+        quiet = (mean_square < self._mean_square_floor) & (peak < self._peak_floor)
+        # Length of the quiet run ending at each frame, continuing the previous block
+        index = np.arange(num_frames)
+        last_loud = np.maximum.accumulate(np.where(quiet, -1, index))
+        quiet_run = np.where(last_loud < 0, index + 1 + self._quiet_run, index - last_loud)
+        gated = quiet & (quiet_run > self.hold)
+
+        runs = []
+        # Pad with gated frames on both sides so every run has a start and an end edge
+        edges = np.diff(np.concatenate(([True], gated, [True])).astype(np.int8))
+        starts = np.flatnonzero(edges == -1)
+        ends = np.flatnonzero(edges == 1)
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            gated_before = (quiet_run[start - 1] if start else self._quiet_run) - self.hold
+            warmup = self._warmup_frames(frames, start, min(self.warmup, gated_before)) if gated_before > 0 else None
+            runs.append((start, end, warmup))
+
+        if num_frames:
+            self._quiet_run = int(quiet_run[-1])
+            if self.warmup:
+                tail = frames[-self.warmup:]
+                if len(tail) < self.warmup and self._tail is not None:
+                    tail = np.concatenate((self._tail, tail))[-self.warmup:]
+                self._tail = np.array(tail)
+        self.frames += num_frames
+        self.gated_frames += int(np.count_nonzero(gated))
+        return runs
+
+    def _warmup_frames(self, frames: np.ndarray, start: int, count: int) -> np.ndarray:
+        """The ``count`` frames before ``start``, reaching into the previous block if needed."""
+        if count <= start:
+            return frames[start - count:start]
+        previous = self._tail[max(len(self._tail) - (count - start), 0):] if self._tail is not None else frames[:0]
+        return np.concatenate((previous, frames[:start]))
+
+    def _measure(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        samples = frames.astype(np.float32)
+        mean_square = np.einsum("ij,ij->i", samples, samples) / frames.shape[1]
+        # max(|x|) without overflowing on -32768
+        peak = np.maximum(samples.max(axis=1), -samples.min(axis=1))
+        return mean_square, peak
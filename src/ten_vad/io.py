@@ -0,0 +1,233 @@
+"""Memory-mapped WAV input.
+
+``WavReader`` parses RIFF/RF64 headers itself and maps the file read-only,
+so sample arrays are zero-copy views of the page cache rather than copies
+in process memory. ``iter_frames`` walks a mono 16-bit file in blocks of
+frames and tells the kernel it may drop the pages of blocks already
+processed, which keeps resident memory flat for files larger than RAM.
+
+Example:
+    with WavReader("call.wav") as wav:
+        probabilities, flags = process_wav(TenVad(256), wav)
+"""
+import mmap
+import struct
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> sample dtype
+_DTYPES = {
+    (WAVE_FORMAT_PCM, 8): np.dtype(np.uint8),
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): np.dtype("<f8"),
+}
+
+
+class WavInfo(NamedTuple):
+    """Format and location of the sample data of a WAV file."""
+
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    format_tag: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def dtype(self) -> np.dtype:
+        return _DTYPES[(self.format_tag, self.bits_per_sample)]
+
+    @property
+    def num_frames(self) -> int:
+        """Samples per channel."""
+        return self.data_size // (self.channels * self.bits_per_sample // 8)
+
+    @property
+    def duration(self) -> float:
+        return self.num_frames / self.sample_rate
+
+
+def read_wav_info(f: BinaryIO, file_size: Optional[int] = None) -> WavInfo:
+    """Parse the header of a RIFF or RF64 WAV file.
+
+    Args:
+        f (BinaryIO): File object positioned at the start of the file.
+        file_size (int, optional): Size of the file, used to clamp the data
+            size of files whose header was never finalized.
+
+    Returns:
+        WavInfo: Format and data chunk location.
+
+    Raises:
+        ValueError: If the file is not a WAV file or its sample format is unsupported.
+    """
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] not in (b"RIFF", b"RF64") or riff[8:12] != b"WAVE":
+        raise ValueError("[TEN VAD]: not a RIFF/WAVE file")
+    ds64_data_size = None
+    fmt = None
+    offset = 12
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise ValueError("[TEN VAD]: WAV file has no data chunk")
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        offset += 8
+        if chunk_id == b"data":
+            if chunk_size == 0xFFFFFFFF and ds64_data_size is not None:
+                chunk_size = ds64_data_size
+            if file_size is not None and (chunk_size == 0 or offset + chunk_size > file_size):
+                chunk_size = file_size - offset  # Unfinished or truncated recording
+            break
+        body = f.read(chunk_size)
+        if chunk_id == b"fmt ":
+            fmt = body
+        elif chunk_id == b"ds64":
+            ds64_data_size = struct.unpack("<Q", body[8:16])[0]
+        chunk_size += chunk_size & 1  # Chunks are word aligned
+        offset += chunk_size
+        f.seek(offset)
+    if fmt is None or len(fmt) < 16:
+        raise ValueError("[TEN VAD]: WAV file has no fmt chunk")
+    format_tag, channels, sample_rate, _, _, bits_per_sample = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]  # First field of the sub-format GUID
+    if (format_tag, bits_per_sample) not in _DTYPES:
+        raise ValueError(f"[TEN VAD]: unsupported WAV sample format (tag {format_tag}, {bits_per_sample} bits)")
+    if channels == 0:
+        raise ValueError("[TEN VAD]: WAV file has no channels")
+    return WavInfo(sample_rate, channels, bits_per_sample, format_tag, offset, chunk_size)
+
+
+class WavReader:
+    """Read-only memory map of the samples of a WAV file.
+
+    Args:
+        path (str): Path of the WAV file.
+
+    Raises:
+        ValueError: If the file is not a supported WAV file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._file.seek(0, 2)
+            file_size = self._file.tell()
+            self._file.seek(0)
+            self.info = read_wav_info(self._file, file_size)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if file_size else None
+        except BaseException:
+            self._file.close()
+            raise
+        info = self.info
+        count = info.num_frames * info.channels
+        if count:
+            self._samples = np.frombuffer(self._mmap, dtype=info.dtype, count=count, offset=info.data_offset)
+        else:
+            self._samples = np.zeros(0, dtype=info.dtype)
+        if info.channels > 1:
+            self._samples = self._samples.reshape(-1, info.channels)
+
+    def __enter__(self) -> "WavReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.info.num_frames
+
+    @property
+    def samples(self) -> np.ndarray:
+        """All samples as a zero-copy view: shape (n,) for mono, (n, channels) otherwise."""
+        return self._samples
+
+    def frames(self, hop_size: int) -> np.ndarray:
+        """Zero-copy (num_frames, hop_size) view of a mono 16-bit file.
+
+        Trailing samples that do not fill a frame are left out.
+
+        Raises:
+            ValueError: If the file is not mono 16-bit PCM.
+        """
+        samples = self._mono_int16()
+        num_frames = len(samples) // hop_size
+        return samples[: num_frames * hop_size].reshape(num_frames, hop_size)
+
+    def iter_frames(self, hop_size: int, block_frames: int = 4096) -> Iterator[np.ndarray]:
+        """Yield consecutive zero-copy blocks of up to ``block_frames`` frames.
+
+        Pages of a block are released once the next block is requested, so
+        the caller must not keep blocks around after moving on.
+
+        Args:
+            hop_size (int): Samples per frame.
+            block_frames (int, optional): Frames per block. Defaults to 4096.
+
+        Yields:
+            np.ndarray: int16 views of shape (n, hop_size).
+
+        Raises:
+            ValueError: If the file is not mono 16-bit PCM.
+        """
+        frames = self.frames(hop_size)
+        for start in range(0, len(frames), block_frames):
+            block = frames[start:start + block_frames]
+            yield block
+            self._release(block)
+
+    def close(self) -> None:
+        """Close the file. The mapping itself stays valid while views of it exist."""
+        self._samples = np.zeros(0, dtype=self.info.dtype)
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Views handed out earlier keep the mapping alive until collected
+        self._file.close()
+
+    def _mono_int16(self) -> np.ndarray:
+        if self.info.channels != 1 or self.info.dtype != np.int16:
+            raise ValueError("[TEN VAD]: frames require a mono 16-bit PCM file")
+        return self._samples
+
+    def _release(self, block: np.ndarray) -> None:
+        """Let the kernel drop the (clean, file-backed) pages under a processed block."""
+        if self._mmap is None or not hasattr(self._mmap, "madvise") or not block.size:
+            return
+        start = block.ctypes.data - self._samples.ctypes.data + self.info.data_offset
+        end = start + block.nbytes
+        start -= start % mmap.PAGESIZE
+        end -= end % mmap.PAGESIZE
+        if end > start:
+            self._mmap.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def process_wav(vad, wav: WavReader, block_frames: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """Run a handle over a mono 16-bit WAV file block by block.
+
+    Args:
+        vad (TenVad): Handle to run; its hop_size sets the frame size.
+        wav (WavReader): Open file.
+        block_frames (int, optional): Frames mapped in at a time. Defaults to 4096.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: float32 probabilities and uint8 flags, one per frame.
+    """
+    num_frames = len(wav) // vad.hop_size
+    probabilities = np.empty(num_frames, dtype=np.float32)
+    flags = np.empty(num_frames, dtype=np.int32)
+    done = 0
+    for block in wav.iter_frames(vad.hop_size, block_frames):
+        vad._process_frames(block, probabilities[done:done + len(block)], flags[done:done + len(block)])
+        done += len(block)
+    return probabilities, flags.astype(np.uint8)
@@ -0,0 +1,132 @@
+"""Frame labels from ``.scv`` segment lists.
+
+An ``.scv`` file holds one line: the recording name followed by
+``start,end,label`` triples in seconds, with label 1 for speech and 0 for
+non-speech. ``read_scv`` parses a file into ``LabelSegments``, three small
+arrays that describe the file at any frame rate, and caches the result
+until the file changes. ``LabelSegments.rasterize`` turns them into
+per-frame labels for a hop size with a single ``np.repeat``.
+
+Example:
+    dataset = LabelDataset.for_wavs(glob.glob("testset/*.wav"))
+    for path, labels in dataset.iter_frames(hop_size=256):
+        ...
+"""
+import functools
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+
+class LabelSegments(NamedTuple):
+    """Labelled segments of one recording."""
+
+    starts: np.ndarray  # float64 segment starts in seconds
+    ends: np.ndarray  # float64 segment ends in seconds
+    labels: np.ndarray  # int8 labels, 1 for speech and 0 for non-speech
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the first segment start to the last segment end."""
+        return float(self.ends[-1] - self.starts[0]) if len(self.starts) else 0.0
+
+    def rasterize(self, hop_size: int, sample_rate: int = 16000) -> np.ndarray:
+        """Expand the segments to one label per frame.
+
+        Each segment covers ``round(duration / frame_duration)`` frames, and
+        the result is cut to the whole frames of the labelled span.
+        Segments with labels other than 0 and 1 are left out.
+
+        Args:
+            hop_size (int): Samples per frame.
+            sample_rate (int, optional): Sample rate of the audio. Defaults to 16000.
+
+        Returns:
+            np.ndarray: uint8 frame labels.
+        """
+        frame_duration = hop_size / sample_rate
+        counts = np.round((self.ends - self.starts) / frame_duration).astype(np.int64)
+        known = (self.labels == 0) | (self.labels == 1)
+        frames = np.repeat(self.labels[known].astype(np.uint8), np.maximum(counts[known], 0))
+        return frames[: int(self.duration / frame_duration)]
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_scv(path: str, mtime_ns: int, size: int) -> LabelSegments:
+    """Parse a file; the modification time and size only key the cache."""
+    with open(path, "r") as f:
+        fields = f.readline().strip().split(",")[1:]
+    if len(fields) % 3:
+        raise ValueError(f"[TEN VAD]: {path} does not hold start,end,label triples")
+    values = np.array(fields, dtype=np.float64).reshape(-1, 3)
+    segments = LabelSegments(
+        np.ascontiguousarray(values[:, 0]), np.ascontiguousarray(values[:, 1]), values[:, 2].astype(np.int8)
+    )
+    for array in segments:
+        array.flags.writeable = False  # Cached and shared between callers
+    return segments
+
+
+def read_scv(path: str) -> LabelSegments:
+    """Read the segments of an ``.scv`` file.
+
+    Results are cached and reused until the file's size or modification
+    time changes. The returned arrays are read-only.
+
+    Args:
+        path (str): Path of the ``.scv`` file.
+
+    Returns:
+        LabelSegments: Segments of the recording.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is malformed.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _parse_scv(path, stat.st_mtime_ns, stat.st_size)
+
+
+class LabelDataset:
+    """Labels of a collection of recordings, parsed on first access.
+
+    Args:
+        paths (Iterable[str]): Paths of ``.scv`` files.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths: List[str] = list(paths)
+
+    @classmethod
+    def for_wavs(cls, wav_paths: Iterable[str]) -> "LabelDataset":
+        """Dataset of the ``.scv`` files stored next to WAV files under the same name."""
+        return cls(os.path.splitext(path)[0] + ".scv" for path in wav_paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, index: int) -> LabelSegments:
+        return read_scv(self.paths[index])
+
+    def __iter__(self) -> Iterator[LabelSegments]:
+        for path in self.paths:
+            yield read_scv(path)
+
+    def iter_frames(self, hop_size: int, sample_rate: int = 16000) -> Iterator[Tuple[str, np.ndarray]]:
+        """Yield ``(path, frame_labels)`` for each file, parsing files as they are reached.
+
+        Args:
+            hop_size (int): Samples per frame.
+            sample_rate (int, optional): Sample rate of the audio. Defaults to 16000.
+
+        Yields:
+            Tuple[str, np.ndarray]: Path and uint8 frame labels of each file.
+        """
+        for path in self.paths:
+            yield path, read_scv(path).rasterize(hop_size, sample_rate)
+
+    def frames(self, hop_size: int, sample_rate: int = 16000) -> List[np.ndarray]:
+        """Frame labels of every file, in order."""
+        return [labels for _, labels in self.iter_frames(hop_size, sample_rate)]
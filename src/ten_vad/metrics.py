@@ -0,0 +1,304 @@
+"""Runtime metrics of TenVad handles.
+
+Metrics are off by default. Enable them per handle with
+``TenVad(..., metrics=True)`` or ``vad.enable_metrics()``, or for every
+new handle with ``enable_by_default()`` or ``TEN_VAD_METRICS=1`` in the
+environment. A handle without metrics keeps its plain native calls; the
+process paths only test one attribute.
+
+Each instrumented handle counts:
+
+* calls, frames and speech frames, and frames skipped by the energy gate;
+* native errors by ``ten_vad_error_t`` code;
+* time spent in ``ten_vad_process`` and the wrapper overhead around it
+  (time in the process entry points minus native time);
+* per-frame native latency in a fixed-bucket histogram, from which
+  p50/p99/p999 are interpolated.
+
+``TenVad.stats()`` reports one handle. ``stats()`` here adds up every
+handle created in the process, including handles that have since been
+collected, and ``render_prometheus()`` formats the same totals in the
+Prometheus text exposition format.
+
+Example:
+    vad = TenVad(256, metrics=True)
+    vad.process_array(audio)
+    print(vad.stats()["latency"]["p99"])
+"""
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ten_vad_error_t codes from include/ten_vad_enhanced.h
+ERROR_NAMES = {
+    -1: "invalid_param",
+    -2: "out_of_memory",
+    -3: "invalid_state",
+    -4: "process_failed",
+}
+
+# Upper bucket bounds in ns: four buckets per octave from 1 us to about 8 s
+BUCKET_BOUNDS_NS = [int(1000 * 2 ** (i / 4)) for i in range(93)]
+
+QUANTILES = (("p50", 0.5), ("p99", 0.99), ("p999", 0.999))
+
+_default_enabled = os.environ.get("TEN_VAD_METRICS", "") not in ("", "0")
+
+
+def enable_by_default(enabled: bool = True) -> None:
+    """Turn metrics on (or off) for handles created from now on."""
+    global _default_enabled
+    _default_enabled = enabled
+
+
+def enabled_by_default() -> bool:
+    return _default_enabled
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in nanoseconds."""
+
+    __slots__ = ("counts", "total_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_NS) + 1)  # The last bucket has no upper bound
+        self.total_ns = 0
+
+    def record(self, duration_ns: int, count: int = 1) -> None:
+        """Add ``count`` observations of the same duration."""
+        self.counts[bisect_left(BUCKET_BOUNDS_NS, duration_ns)] += count
+        self.total_ns += duration_ns * count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts[:] = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total_ns += other.total_ns
+
+    def clear(self) -> None:
+        self.counts[:] = [0] * len(self.counts)
+        self.total_ns = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile in seconds by interpolating inside its bucket; None when empty."""
+        total = self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = BUCKET_BOUNDS_NS[index - 1] if index else 0
+                upper = BUCKET_BOUNDS_NS[index] if index < len(BUCKET_BOUNDS_NS) else lower
+                return (lower + (upper - lower) * (rank - seen) / count) / 1e9
+            seen += count
+        return BUCKET_BOUNDS_NS[-1] / 1e9
+
+
+class VadMetrics:
+    """Counters of one handle."""
+
+    def __init__(self):
+        self.errors: Dict[int, int] = {}
+        self.latency = LatencyHistogram()
+        self.clear()
+
+    def clear(self) -> None:
+        """Zero the counters in place; wrappers from ``time_native`` keep working."""
+        self.calls = 0
+        self.frames = 0
+        self.speech_frames = 0
+        self.gated_frames = 0  # Frames answered by the energy gate without inference
+        self.total_ns = 0  # Time inside the process entry points
+        self.native_ns = 0  # Time inside ten_vad_process
+        self.errors.clear()
+        self.latency.clear()
+
+    def record(self, duration_ns: int, frames: int, speech_frames: int, gated_frames: int = 0) -> None:
+        """Account one successful entry point call."""
+        self.calls += 1
+        self.frames += frames
+        self.speech_frames += speech_frames
+        self.gated_frames += gated_frames
+        self.total_ns += duration_ns
+
+    def time_native(self, function: Callable[..., int]) -> Callable[..., int]:
+        """Wrap a ctypes ``ten_vad_process`` so each call is timed and its error code counted."""
+        latency = self.latency
+        errors = self.errors
+
+        def timed(*args) -> int:
+            start = perf_counter_ns()
+            result = function(*args)
+            elapsed = perf_counter_ns() - start
+            self.native_ns += elapsed
+            latency.record(elapsed)
+            if result != 0:
+                errors[result] = errors.get(result, 0) + 1
+            return result
+
+        return timed
+
+    def merge(self, other: "VadMetrics") -> None:
+        self.calls += other.calls
+        self.frames += other.frames
+        self.speech_frames += other.speech_frames
+        self.gated_frames += other.gated_frames
+        self.total_ns += other.total_ns
+        self.native_ns += other.native_ns
+        for code, count in list(other.errors.items()):
+            self.errors[code] = self.errors.get(code, 0) + count
+        self.latency.merge(other.latency)
+
+    def snapshot(self) -> dict:
+        """Counters as plain values; times in seconds."""
+        return {
+            "calls": self.calls,
+            "frames": self.frames,
+            "speech_frames": self.speech_frames,
+            "gated_frames": self.gated_frames,
+            "errors": {ERROR_NAMES.get(code, str(code)): count for code, count in self.errors.items()},
+            "native_seconds": self.native_ns / 1e9,
+            "wrapper_overhead_seconds": max(self.total_ns - self.native_ns, 0) / 1e9,
+            "latency": {name: self.latency.quantile(q) for name, q in QUANTILES},
+        }
+
+
+class _Registry:
+    """All metrics objects of the process; those of collected handles are folded into one total."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._live: List[VadMetrics] = []
+        self._retired = VadMetrics()
+        self._finalizers: Dict[int, weakref.finalize] = {}
+
+    def register(self, owner: object) -> VadMetrics:
+        metrics = VadMetrics()
+        finalizer = weakref.finalize(owner, self._retire, metrics)
+        with self._lock:
+            self._live.append(metrics)
+            self._finalizers[id(metrics)] = finalizer
+        return metrics
+
+    def retire(self, metrics: VadMetrics) -> None:
+        with self._lock:
+            finalizer = self._finalizers.get(id(metrics))
+        if finalizer is not None:
+            finalizer()  # Runs _retire at most once and detaches it from the owner
+
+    def _retire(self, metrics: VadMetrics) -> None:
+        with self._lock:
+            del self._finalizers[id(metrics)]
+            self._live.remove(metrics)
+            self._retired.merge(metrics)
+
+    def total(self) -> Tuple[VadMetrics, int]:
+        """Sum of all metrics and the number of live instrumented handles."""
+        total = VadMetrics()
+        with self._lock:
+            total.merge(self._retired)
+            for metrics in self._live:
+                total.merge(metrics)
+            return total, len(self._live)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._retired.clear()
+            for metrics in self._live:
+                metrics.clear()
+
+
+_registry = _Registry()
+
+
+def register(owner: object) -> VadMetrics:
+    """Create the metrics of a handle; they stay in the totals after it is collected."""
+    return _registry.register(owner)
+
+
+def retire(metrics: VadMetrics) -> None:
+    """Fold the metrics of a handle into the totals now, as if it had been collected."""
+    _registry.retire(metrics)
+
+
+def stats() -> dict:
+    """Totals over every instrumented handle of the process.
+
+    Returns:
+        dict: The fields of ``TenVad.stats()`` plus ``instances``, the
+        number of live instrumented handles.
+    """
+    total, instances = _registry.total()
+    snapshot = total.snapshot()
+    snapshot["instances"] = instances
+    return snapshot
+
+
+def reset() -> None:
+    """Zero all counters, e.g. at the start of a measurement window."""
+    _registry.clear()
+
+
+def render_prometheus(prefix: str = "ten_vad") -> str:
+    """Render the process totals in the Prometheus text exposition format.
+
+    Args:
+        prefix (str, optional): Metric name prefix. Defaults to "ten_vad".
+
+    Returns:
+        str: Exposition text, ending with a newline.
+    """
+    total, instances = _registry.total()
+    lines = []
+
+    def add(name: str, kind: str, help_text: str, samples: List[str]) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.extend(samples)
+
+    add("instances", "gauge", "Live handles with metrics enabled.", [f"{prefix}_instances {instances}"])
+    add("calls_total", "counter", "Process entry point calls.", [f"{prefix}_calls_total {total.calls}"])
+    add("frames_total", "counter", "Frames processed.", [f"{prefix}_frames_total {total.frames}"])
+    add("speech_frames_total", "counter", "Frames flagged as speech.", [f"{prefix}_speech_frames_total {total.speech_frames}"])
+    add("gated_frames_total", "counter", "Frames skipped by the energy gate.", [f"{prefix}_gated_frames_total {total.gated_frames}"])
+    add(
+        "errors_total",
+        "counter",
+        "Native process errors by ten_vad_error_t code.",
+        [
+            f'{prefix}_errors_total{{code="{code}",name="{ERROR_NAMES.get(code, "unknown")}"}} {count}'
+            for code, count in sorted(total.errors.items())
+        ],
+    )
+    add("native_seconds_total", "counter", "Time spent in ten_vad_process.", [f"{prefix}_native_seconds_total {total.native_ns / 1e9:.9f}"])
+    add(
+        "wrapper_overhead_seconds_total",
+        "counter",
+        "Time spent in the Python wrapper around ten_vad_process.",
+        [f"{prefix}_wrapper_overhead_seconds_total {max(total.total_ns - total.native_ns, 0) / 1e9:.9f}"],
+    )
+    buckets = []
+    cumulative = 0
+    for bound, count in zip(BUCKET_BOUNDS_NS, total.latency.counts):
+        cumulative += count
+        buckets.append(f'{prefix}_frame_latency_seconds_bucket{{le="{bound / 1e9:.9g}"}} {cumulative}')
+    buckets.append(f'{prefix}_frame_latency_seconds_bucket{{le="+Inf"}} {total.latency.count}')
+    buckets.append(f"{prefix}_frame_latency_seconds_sum {total.latency.total_ns / 1e9:.9f}")
+    buckets.append(f"{prefix}_frame_latency_seconds_count {total.latency.count}")
+    add("frame_latency_seconds", "histogram", "Native latency per frame.", buckets)
+    add(
+        "frame_latency_quantile_seconds",
+        "gauge",
+        "Native latency per frame at p50/p99/p999, interpolated from the histogram.",
+        [
+            f'{prefix}_frame_latency_quantile_seconds{{quantile="{q}"}} {total.latency.quantile(q) or 0.0:.9f}'
+            for _, q in QUANTILES
+        ],
+    )
+    return "\n".join(lines) + "\n"
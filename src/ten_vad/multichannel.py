@@ -0,0 +1,253 @@
+"""VAD over interleaved multi-channel audio, e.g. two-party call recordings.
+
+``MultiChannelVad`` runs one ``TenVad`` handle per channel over buffers of
+shape ``(samples, channels)``, such as ``WavReader(path).samples`` of a
+stereo file, and keeps conversation statistics up to date as it goes:
+
+* speech frames per channel, silence (no channel active) and overlap (two
+  or more channels active);
+* talk-overs: a channel starting to speak while another one is speaking;
+* crosstalk: a channel flagged as speech in a frame where another active
+  channel is at least ``crosstalk_db`` louder, which usually means the
+  louder talker leaking into its microphone rather than real overlap.
+
+The library needs contiguous frames, so each block is split into one
+contiguous array per channel (a single strided copy per channel) and the
+results are written straight into strided views of one record array.
+Channels can run in parallel; the library call releases the GIL.
+
+Example:
+    with WavReader("call.wav") as wav, MultiChannelVad(wav.info.channels) as vad:
+        probabilities, flags = vad.process_array(wav.samples)
+        print(vad.stats.overlap_seconds, vad.stats.talk_overs)
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .wrapper import TenVad
+
+
+def multichannel_result_dtype(channels: int) -> np.dtype:
+    """Record type of ``MultiChannelVad.feed``: frame offset, then per-channel probability and flag."""
+    return np.dtype([("offset", np.int64), ("probability", np.float32, (channels,)), ("flag", np.int32, (channels,))])
+
+
+class ConversationStats(NamedTuple):
+    """Frame counts over everything processed since the last reset."""
+
+    hop_size: int
+    sample_rate: int
+    frames: int
+    speech_frames: np.ndarray  # Per channel
+    silence_frames: int  # No channel active
+    overlap_frames: int  # Two or more channels active
+    crosstalk_frames: np.ndarray  # Per channel: active while another active channel is crosstalk_db louder
+    talk_overs: np.ndarray  # Per channel: speech onsets while another channel was speaking
+
+    def _seconds(self, frames):
+        return frames * self.hop_size / self.sample_rate
+
+    @property
+    def speech_seconds(self) -> np.ndarray:
+        return self._seconds(self.speech_frames)
+
+    @property
+    def overlap_seconds(self) -> float:
+        return self._seconds(self.overlap_frames)
+
+    @property
+    def overlap_ratio(self) -> float:
+        """Share of the frames with any speech in which two or more channels speak."""
+        active = self.frames - self.silence_frames
+        return self.overlap_frames / active if active else 0.0
+
+
+class MultiChannelVad:
+    """Per-channel VAD and conversation statistics for interleaved audio.
+
+    Args:
+        channels (int): Number of channels.
+        hop_size (int, optional): Frame size in samples per channel. Defaults to 256.
+        threshold (float, optional): Speech threshold of every channel. Defaults to 0.5.
+        parallel (bool, optional): Process channels on a thread pool. Defaults to
+            True when there are several channels and CPUs.
+        crosstalk_db (float, optional): Level difference that marks the quieter of
+            two active channels as crosstalk. Defaults to 15.
+        sample_rate (int, optional): Sample rate, for durations. Defaults to 16000.
+
+    Raises:
+        ValueError: If channels is not positive.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        hop_size: int = 256,
+        threshold: float = 0.5,
+        parallel: Optional[bool] = None,
+        crosstalk_db: float = 15.0,
+        sample_rate: int = 16000,
+    ):
+        if channels <= 0:
+            raise ValueError("[TEN VAD]: channels must be positive")
+        self.channels = channels
+        self.hop_size = hop_size
+        self.crosstalk_db = crosstalk_db
+        self.sample_rate = sample_rate
+        self.vads: List[TenVad] = [TenVad(hop_size, threshold) for _ in range(channels)]
+        self.result_dtype = multichannel_result_dtype(channels)
+        if parallel is None:
+            parallel = channels > 1 and (os.cpu_count() or 1) > 1
+        self._executor = ThreadPoolExecutor(max_workers=channels, thread_name_prefix="ten_vad_channel") if parallel else None
+        self._carry = np.zeros((hop_size, channels), dtype=np.int16)
+        self.reset(reset_model=False)
+
+    def __enter__(self) -> "MultiChannelVad":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def reset(self, reset_model: bool = True) -> None:
+        """Drop buffered samples and statistics and restart offsets at zero.
+
+        Args:
+            reset_model (bool, optional): Also reset the model state of every handle. Defaults to True.
+        """
+        self._carry_len = 0
+        self._position = 0
+        self._last_flags = np.zeros(self.channels, dtype=bool)
+        self._frames = 0
+        self._speech = np.zeros(self.channels, dtype=np.int64)
+        self._silence = 0
+        self._overlap = 0
+        self._crosstalk = np.zeros(self.channels, dtype=np.int64)
+        self._talk_overs = np.zeros(self.channels, dtype=np.int64)
+        if reset_model:
+            for vad in self.vads:
+                vad.reset()
+
+    @property
+    def stats(self) -> ConversationStats:
+        """Statistics of everything processed since the last reset."""
+        return ConversationStats(
+            self.hop_size,
+            self.sample_rate,
+            self._frames,
+            self._speech.copy(),
+            self._silence,
+            self._overlap,
+            self._crosstalk.copy(),
+            self._talk_overs.copy(),
+        )
+
+    def feed(self, audio: np.ndarray) -> np.ndarray:
+        """Process a chunk of interleaved samples of any length.
+
+        Args:
+            audio (np.ndarray): int16 array of shape (samples, channels), or a
+                1-D interleaved array whose length is a multiple of channels.
+
+        Returns:
+            np.ndarray: Record array (see ``multichannel_result_dtype``), one entry
+            per frame completed by the chunk.
+
+        Raises:
+            TypeError: If audio is not an int16 NumPy array.
+            ValueError: If the shape does not match the channel count.
+            RuntimeError: If VAD processing fails.
+        """
+        audio = self._as_interleaved(audio)
+        hop_size = self.hop_size
+        if self._carry_len:
+            audio = np.concatenate((self._carry[: self._carry_len], audio))
+        num_frames = len(audio) // hop_size
+        results = np.empty(num_frames, dtype=self.result_dtype)
+        frame_start = self._position - self._carry_len
+        self._position += len(audio) - self._carry_len
+        remainder = len(audio) - num_frames * hop_size
+        self._carry[:remainder] = audio[num_frames * hop_size:]
+        self._carry_len = remainder
+        if not num_frames:
+            return results
+
+        block = audio[: num_frames * hop_size]
+        results["offset"] = np.arange(frame_start, frame_start + num_frames * hop_size, hop_size)
+        probabilities = results["probability"]
+        flags = results["flag"]
+        jobs = [(channel, block, probabilities, flags) for channel in range(self.channels)]
+        if self._executor is not None:
+            for _ in self._executor.map(lambda job: self._process_channel(*job), jobs):
+                pass
+        else:
+            for job in jobs:
+                self._process_channel(*job)
+        self._update_stats(block.reshape(num_frames, hop_size, self.channels), flags != 0)
+        return results
+
+    def process_array(self, audio: np.ndarray, block_frames: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+        """Process a whole recording from a fresh state.
+
+        Args:
+            audio (np.ndarray): int16 array of shape (samples, channels).
+            block_frames (int, optional): Frames split per step, bounding the
+                per-channel copies. Defaults to 4096.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float32 probabilities and uint8 flags of
+            shape (frames, channels). Trailing samples that do not fill a frame are ignored.
+        """
+        audio = self._as_interleaved(audio)
+        self.reset()
+        step = block_frames * self.hop_size
+        blocks = [self.feed(audio[start:start + step]) for start in range(0, len(audio), step)]
+        results = np.concatenate(blocks) if blocks else np.empty(0, dtype=self.result_dtype)
+        self._carry_len = 0
+        return results["probability"], results["flag"].astype(np.uint8)
+
+    def close(self) -> None:
+        """Stop the worker threads and destroy the handles."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for vad in self.vads:
+            vad.close()
+
+    def _process_channel(self, channel: int, block: np.ndarray, probabilities: np.ndarray, flags: np.ndarray) -> None:
+        vad = self.vads[channel]
+        frames = np.ascontiguousarray(block[:, channel]).reshape(-1, self.hop_size)
+        vad._process_frames(frames, probabilities[:, channel], flags[:, channel])
+
+    def _update_stats(self, frames: np.ndarray, active: np.ndarray) -> None:
+        """Fold a block into the statistics; frames is (num_frames, hop_size, channels)."""
+        count = active.sum(axis=1)
+        self._frames += len(active)
+        self._speech += active.sum(axis=0)
+        self._silence += int(np.count_nonzero(count == 0))
+        overlap = count >= 2
+        self._overlap += int(np.count_nonzero(overlap))
+
+        previous = np.vstack((self._last_flags, active[:-1]))
+        others_before = (previous.sum(axis=1, keepdims=True) - previous) > 0
+        self._talk_overs += (active & ~previous & others_before).sum(axis=0)
+        self._last_flags = active[-1].copy()
+
+        if np.any(overlap):
+            both = frames[overlap].astype(np.float32)
+            level = 10.0 * np.log10(np.einsum("nhc,nhc->nc", both, both) / self.hop_size + 1e-10)
+            level = np.where(active[overlap], level, -np.inf)
+            self._crosstalk += (active[overlap] & (level.max(axis=1, keepdims=True) - level >= self.crosstalk_db)).sum(axis=0)
+
+    def _as_interleaved(self, audio: np.ndarray) -> np.ndarray:
+        if not isinstance(audio, np.ndarray):
+            raise TypeError("[TEN VAD]: audio must be a NumPy array")
+        if audio.dtype != np.int16:
+            raise TypeError("[TEN VAD]: audio data type must be int16")
+        if audio.ndim == 1 and audio.size % self.channels == 0:
+            audio = audio.reshape(-1, self.channels)
+        if audio.ndim != 2 or audio.shape[1] != self.channels:
+            raise ValueError(f"[TEN VAD]: audio must have shape (samples, {self.channels})")
+        return audio
@@ -0,0 +1,256 @@
+"""Chunk-parallel VAD over one long recording.
+
+One handle processes frames strictly in order, so a single long file uses
+a single core. ``process_chunked`` splits the frames into ``chunks``
+consecutive ranges and runs each on its own handle on a thread pool (the
+library call releases the GIL). The model is recurrent, so a handle
+starting in the middle of the audio does not have the state the
+sequential run would have there: each chunk is primed with the
+``warmup_frames`` frames before it, whose outputs are discarded, and the
+chunk results are written straight into one output array.
+
+The first chunk matches the sequential run exactly. The others do not:
+the model keeps slowly decaying state, so two handles fed the same audio
+from different starting points can differ by tenths in probability
+hundreds of frames later. Longer warm-ups make such frames rarer, and
+accuracy against reference labels stays level with the sequential run.
+``compare_with_sequential`` measures the difference for one recording, and
+running this module over a directory prints it for every WAV file in it,
+with the F1 score of each setting when ``.scv`` labels sit next to the
+files.
+
+Usage:
+    python -m ten_vad.parallel testset/ --chunks 4 --warmup 0,32,64,128
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .pool import TenVadHandlePool
+from .wrapper import TenVad
+
+DEFAULT_WARMUP_FRAMES = 64  # About 1 s at hop_size 256
+
+
+class ChunkDeviation(NamedTuple):
+    """Difference between chunk-parallel and sequential results of one recording."""
+
+    frames: int
+    chunks: int
+    warmup_frames: int
+    max_deviation: float  # Largest absolute probability difference
+    mean_deviation: float
+    flag_mismatches: int  # Frames whose flag differs
+
+
+def chunk_bounds(num_frames: int, chunks: int, warmup_frames: int) -> List[Tuple[int, int, int]]:
+    """Frame ranges of the chunks.
+
+    Args:
+        num_frames (int): Frames in the recording.
+        chunks (int): Requested number of chunks.
+        warmup_frames (int): Warm-up frames per chunk.
+
+    Returns:
+        List[Tuple[int, int, int]]: ``(warmup_start, start, end)`` per chunk; frames
+        ``[warmup_start, start)`` only prime the handle. Chunks are never shorter
+        than their warm-up, so fewer than ``chunks`` ranges may be returned.
+    """
+    chunks = max(1, min(chunks, num_frames // max(warmup_frames, 1)))
+    edges = np.linspace(0, num_frames, chunks + 1).astype(np.int64).tolist()
+    return [(max(start - warmup_frames, 0), start, end) for start, end in zip(edges[:-1], edges[1:])]
+
+
+def process_chunked(
+    audio: np.ndarray,
+    chunks: Optional[int] = None,
+    warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    hop_size: int = 256,
+    threshold: float = 0.5,
+    handle_pool: Optional[TenVadHandlePool] = None,
+    max_workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Process a whole recording in parallel chunks.
+
+    Args:
+        audio (np.ndarray): 1-D int16 audio of arbitrary length.
+        chunks (int, optional): Number of chunks. Defaults to the CPU count.
+        warmup_frames (int, optional): Frames before each chunk fed to its handle
+            first, outputs discarded. Defaults to 64.
+        hop_size (int, optional): Frame size in samples. Defaults to 256.
+        threshold (float, optional): Speech threshold. Defaults to 0.5.
+        handle_pool (TenVadHandlePool, optional): Take the handles from this pool
+            instead of creating them.
+        max_workers (int, optional): Threads. Defaults to the number of chunks.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: float32 probabilities and uint8 flags, one per
+        frame, as ``TenVad.process_array`` returns them. Trailing samples that do not
+        fill a frame are ignored.
+
+    Raises:
+        TypeError: If audio is not an int16 NumPy array.
+        ValueError: If audio is not one-dimensional or warmup_frames is negative.
+        RuntimeError: If VAD processing fails.
+    """
+    if warmup_frames < 0:
+        raise ValueError("[TEN VAD]: warmup_frames must not be negative")
+    samples = TenVad._as_samples(audio)
+    num_frames = len(samples) // hop_size
+    frames = samples[: num_frames * hop_size].reshape(num_frames, hop_size)
+    probabilities = np.empty(num_frames, dtype=np.float32)
+    flags = np.empty(num_frames, dtype=np.int32)
+    bounds = chunk_bounds(num_frames, chunks or os.cpu_count() or 1, warmup_frames)
+
+    def run(bound: Tuple[int, int, int]) -> None:
+        warmup_start, start, end = bound
+        if handle_pool is not None:
+            with handle_pool.handle(hop_size, threshold) as vad:
+                _run_chunk(vad, frames, warmup_start, start, end, probabilities, flags)
+        else:
+            with TenVad(hop_size, threshold) as vad:
+                _run_chunk(vad, frames, warmup_start, start, end, probabilities, flags)
+
+    if num_frames:
+        if len(bounds) == 1:
+            run(bounds[0])
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers or len(bounds), thread_name_prefix="ten_vad_chunk") as executor:
+                for _ in executor.map(run, bounds):
+                    pass
+    return probabilities, flags.astype(np.uint8)
+
+
+def _run_chunk(
+    vad: TenVad, frames: np.ndarray, warmup_start: int, start: int, end: int, probabilities: np.ndarray, flags: np.ndarray
+) -> None:
+    if start > warmup_start:
+        count = start - warmup_start
+        vad._process_frames(frames[warmup_start:start], np.empty(count, dtype=np.float32), np.empty(count, dtype=np.int32))
+    vad._process_frames(frames[start:end], probabilities[start:end], flags[start:end])
+
+
+def compare_with_sequential(
+    audio: np.ndarray,
+    chunks: int,
+    warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    hop_size: int = 256,
+    threshold: float = 0.5,
+    sequential: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> ChunkDeviation:
+    """Measure how far chunk-parallel results are from a single sequential pass.
+
+    Args:
+        audio (np.ndarray): 1-D int16 audio.
+        chunks (int): Number of chunks.
+        warmup_frames (int, optional): Warm-up frames per chunk. Defaults to 64.
+        hop_size (int, optional): Frame size in samples. Defaults to 256.
+        threshold (float, optional): Speech threshold. Defaults to 0.5.
+        sequential (Tuple[np.ndarray, np.ndarray], optional): Sequential results,
+            if already computed.
+
+    Returns:
+        ChunkDeviation: Probability and flag differences.
+    """
+    if sequential is None:
+        with TenVad(hop_size, threshold) as vad:
+            sequential = vad.process_array(audio)
+    probabilities, flags = process_chunked(audio, chunks, warmup_frames, hop_size, threshold)
+    return _deviation(probabilities, flags, sequential, chunks, warmup_frames)
+
+
+def _deviation(
+    probabilities: np.ndarray, flags: np.ndarray, sequential: Tuple[np.ndarray, np.ndarray], chunks: int, warmup_frames: int
+) -> ChunkDeviation:
+    deviation = np.abs(probabilities - sequential[0])
+    return ChunkDeviation(
+        len(flags),
+        len(chunk_bounds(len(flags), chunks, warmup_frames)),
+        warmup_frames,
+        float(deviation.max(initial=0.0)),
+        float(deviation.mean()) if len(deviation) else 0.0,
+        int(np.count_nonzero(flags != sequential[1])),
+    )
+
+
+def _fit(labels: np.ndarray, num_frames: int) -> np.ndarray:
+    fitted = np.zeros(num_frames, dtype=np.uint8)
+    fitted[: min(len(labels), num_frames)] = labels[:num_frames]
+    return fitted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .batch import find_wav_files
+    from .eval import concatenate_scores, threshold_sweep
+    from .io import WavReader
+    from .labels import read_scv
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ten_vad.parallel", description="Compare chunk-parallel VAD results with a sequential pass."
+    )
+    parser.add_argument("inputs", nargs="+", help="WAV files or directories (searched recursively)")
+    parser.add_argument("--chunks", type=int, default=4, help="Chunks per recording (default: 4)")
+    parser.add_argument("--warmup", default="0,16,32,64,128", help="Comma-separated warm-up frame counts")
+    parser.add_argument("--concat", action="store_true", help="Join all files into one long recording")
+    parser.add_argument("--hop-size", type=int, default=256, help="Frame size in samples (default: 256)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Speech threshold (default: 0.5)")
+    args = parser.parse_args(argv)
+
+    warmups = [int(value) for value in args.warmup.split(",")]
+    files = find_wav_files(args.inputs)
+    if not files:
+        parser.error("no WAV files found")
+    recordings = []
+    for path in files:
+        with WavReader(path) as wav:
+            audio = np.array(wav.samples[: len(wav) // args.hop_size * args.hop_size])
+        scv_path = os.path.splitext(path)[0] + ".scv"
+        labels = read_scv(scv_path).rasterize(args.hop_size) if os.path.exists(scv_path) else None
+        recordings.append((os.path.basename(path), audio, labels))
+    if args.concat:
+        labelled = all(labels is not None for _, _, labels in recordings)
+        recordings = [(
+            f"{len(recordings)} files joined",
+            np.concatenate([audio for _, audio, _ in recordings]),
+            # Cut or zero-pad each file's labels to its frame count so they stay aligned
+            np.concatenate([_fit(labels, len(audio) // args.hop_size) for _, audio, labels in recordings]) if labelled else None,
+        )]
+
+    # Probabilities per recording of the sequential run (key None) and of each warm-up
+    scores: dict = {key: [] for key in [None] + warmups}
+    truth = []
+    print(f"{'recording':<32} {'warmup':>6} {'chunks':>6} {'max dev':>9} {'mean dev':>9} {'flags':>6}")
+    for name, audio, labels in recordings:
+        with TenVad(args.hop_size, args.threshold) as vad:
+            sequential = vad.process_array(audio)
+        scores[None].append(sequential[0])
+        truth.append(labels)
+        for warmup in warmups:
+            probabilities, flags = process_chunked(audio, args.chunks, warmup, args.hop_size, args.threshold)
+            scores[warmup].append(probabilities)
+            report = _deviation(probabilities, flags, sequential, args.chunks, warmup)
+            print(
+                f"{name:<32} {warmup:>6} {report.chunks:>6} {report.max_deviation:>9.6f} "
+                f"{report.mean_deviation:>9.6f} {report.flag_mismatches:>6}"
+            )
+
+    labelled = [i for i, labels in enumerate(truth) if labels is not None]
+    for key, per_recording in scores.items():
+        parts = []
+        if key is not None:
+            deviation = max(float(np.abs(p - q).max(initial=0.0)) for p, q in zip(per_recording, scores[None]))
+            parts.append(f"max deviation {deviation:.6f}")
+        if labelled:
+            frame_scores, frame_labels = concatenate_scores([per_recording[i] for i in labelled], [truth[i] for i in labelled])
+            point = threshold_sweep(frame_scores, frame_labels, np.array([args.threshold])).point(0)
+            parts.append(f"F1 {point.f1:.4f} at threshold {args.threshold}")
+        print(f"[TEN VAD]: {'sequential' if key is None else f'warmup {key}'}: {', '.join(parts) or 'no labels'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,527 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Deque, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .wrapper import TenVad
+
+logger = logging.getLogger(__name__)
+
+
+class _Stream:
+    """Per-stream state: the native handle and the queue of pending buffers."""
+
+    __slots__ = ("vad", "pending", "scheduled", "removed", "lock")
+
+    def __init__(self, vad: TenVad):
+        self.vad = vad
+        self.pending: Deque[Tuple[np.ndarray, Optional[Tuple[np.ndarray, np.ndarray]], Future]] = deque()
+        self.scheduled = False
+        self.removed = False  # The handle is closed once the pending buffers are done
+        self.lock = threading.Lock()
+
+    def retire(self) -> None:
+        """Mark the stream removed and close its handle now if no worker holds it."""
+        with self.lock:
+            self.removed = True
+            idle = not self.scheduled
+        if idle:
+            self.vad.close()
+
+
+class TenVadPool:
+    """Process many independent audio streams on a shared thread pool.
+
+    Every stream owns its own ``TenVad`` handle, because the model keeps
+    recurrent state per handle. Buffers submitted for one stream are processed
+    strictly in submission order, while different streams run concurrently on
+    up to ``max_workers`` threads. The library call releases the GIL, so the
+    pool scales across cores; all shared state is guarded by explicit locks, so
+    it is also safe on free-threaded CPython builds.
+
+    Args:
+        max_workers (int, optional): Number of worker threads. Defaults to the CPU count.
+        hop_size (int, optional): Default frame size for new streams. Defaults to 256.
+        threshold (float, optional): Default speech threshold for new streams. Defaults to 0.5.
+        max_batch (int, optional): Buffers a worker processes for one stream before
+            yielding to other streams. Defaults to 8.
+
+    Raises:
+        ValueError: If max_workers or max_batch is not positive.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, hop_size: int = 256, threshold: float = 0.5, max_batch: int = 8):
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers <= 0:
+            raise ValueError("[TEN VAD]: max_workers must be positive")
+        if max_batch <= 0:
+            raise ValueError("[TEN VAD]: max_batch must be positive")
+        self.max_workers = max_workers
+        self.hop_size = hop_size
+        self.threshold = threshold
+        self.max_batch = max_batch
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ten_vad")
+        self._closed = False
+
+    def __enter__(self) -> "TenVadPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def __contains__(self, stream_id: Hashable) -> bool:
+        return stream_id in self._streams
+
+    def add_stream(self, stream_id: Hashable, hop_size: Optional[int] = None, threshold: Optional[float] = None) -> TenVad:
+        """Create the handle for a stream.
+
+        Args:
+            stream_id (Hashable): Key identifying the stream.
+            hop_size (int, optional): Frame size. Defaults to the pool hop_size.
+            threshold (float, optional): Speech threshold. Defaults to the pool threshold.
+
+        Returns:
+            TenVad: The handle owned by the stream.
+
+        Raises:
+            KeyError: If the stream already exists.
+            RuntimeError: If the pool is closed.
+        """
+        vad = TenVad(
+            self.hop_size if hop_size is None else hop_size,
+            self.threshold if threshold is None else threshold,
+        )
+        with self._lock:
+            if not self._closed and stream_id not in self._streams:
+                self._streams[stream_id] = _Stream(vad)
+                return vad
+        vad.close()
+        self._check_open()
+        raise KeyError(f"[TEN VAD]: stream {stream_id!r} already exists")
+
+    def remove_stream(self, stream_id: Hashable) -> None:
+        """Forget a stream and close its handle once its pending buffers are processed.
+
+        Args:
+            stream_id (Hashable): Key identifying the stream.
+
+        Raises:
+            KeyError: If the stream does not exist.
+        """
+        with self._lock:
+            stream = self._streams.pop(stream_id)
+        stream.retire()
+
+    def submit(
+        self, stream_id: Hashable, audio: np.ndarray, out: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> "Future[Tuple[np.ndarray, np.ndarray]]":
+        """Queue an int16 buffer of one or more frames for a stream.
+
+        Streams are created on first use with the pool defaults.
+
+        Args:
+            stream_id (Hashable): Key identifying the stream.
+            audio (np.ndarray): 1-D int16 audio; see ``TenVad.process_array``.
+            out (Tuple[np.ndarray, np.ndarray], optional): float32 probability and
+                int32 flag arrays, one entry per frame, that receive the results
+                in place instead of newly allocated arrays.
+
+        Returns:
+            Future: Resolves to the ``(probabilities, flags)`` arrays of the buffer
+            (``out`` when given; flags are uint8 otherwise).
+
+        Raises:
+            RuntimeError: If the pool is closed or the stream is being removed.
+        """
+        self._check_open()
+        stream = self._streams.get(stream_id)
+        if stream is None:
+            with self._lock:
+                self._check_open()
+                stream = self._streams.get(stream_id)
+                if stream is None:
+                    stream = self._streams[stream_id] = _Stream(TenVad(self.hop_size, self.threshold))
+        future: Future = Future()
+        with stream.lock:
+            if stream.removed:
+                raise RuntimeError(f"[TEN VAD]: stream {stream_id!r} was removed")
+            stream.pending.append((audio, out, future))
+            if stream.scheduled:
+                return future
+            stream.scheduled = True
+        try:
+            self._executor.submit(self._drain, stream)
+        except RuntimeError:
+            # close() shut the executor down after the checks above: fail what was queued
+            with stream.lock:
+                pending, stream.pending = list(stream.pending), deque()
+                stream.scheduled = False
+                removed = stream.removed
+            for _, _, queued in pending:
+                if queued.set_running_or_notify_cancel():
+                    queued.set_exception(RuntimeError("[TEN VAD]: pool is closed"))
+            if removed:
+                stream.vad.close()
+            raise RuntimeError("[TEN VAD]: pool is closed") from None
+        return future
+
+    def process(self, buffers: Mapping[Hashable, np.ndarray]) -> Dict[Hashable, Tuple[np.ndarray, np.ndarray]]:
+        """Process one buffer for each of several streams in parallel and wait.
+
+        Args:
+            buffers (Mapping[Hashable, np.ndarray]): int16 audio keyed by stream id.
+
+        Returns:
+            Dict[Hashable, Tuple[np.ndarray, np.ndarray]]: ``(probabilities, flags)`` per stream.
+        """
+        futures = {stream_id: self.submit(stream_id, audio) for stream_id, audio in buffers.items()}
+        return {stream_id: future.result() for stream_id, future in futures.items()}
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting work, shut the worker threads down and close every stream handle.
+
+        Queued buffers are still processed; each handle is closed once its
+        stream has no more work.
+
+        Args:
+            wait (bool, optional): Block until queued work has finished. Defaults to True.
+        """
+        with self._lock:
+            self._closed = True
+            streams = list(self._streams.values())
+            self._streams.clear()
+        # Idle handles are closed now, the others once their queued buffers are done
+        for stream in streams:
+            stream.retire()
+        self._executor.shutdown(wait=wait)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("[TEN VAD]: pool is closed")
+
+    def _drain(self, stream: _Stream, budget: Optional[int] = None) -> None:
+        """Process up to ``budget`` pending buffers of a stream, then yield the worker.
+
+        A negative budget drains the stream completely.
+        """
+        if budget is None:
+            budget = self.max_batch
+        while True:
+            with stream.lock:
+                if not stream.pending:
+                    stream.scheduled = False
+                    removed = stream.removed
+                elif budget == 0:
+                    break
+                else:
+                    audio, out, future = stream.pending.popleft()
+                    removed = None
+            if removed is not None:
+                if removed:
+                    stream.vad.close()
+                return
+            budget -= 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = stream.vad.process_array(audio) if out is None else _process_into(stream.vad, audio, out)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+        try:
+            self._executor.submit(self._drain, stream)
+        except RuntimeError:
+            # The executor is shutting down: finish this stream's backlog here.
+            self._drain(stream, budget=-1)
+
+
+def _process_into(vad: TenVad, audio: np.ndarray, out: Tuple[np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Process a buffer into caller-provided result arrays."""
+    frames = vad._frame_view(audio)
+    probabilities, flags = out
+    if probabilities.dtype != np.float32 or flags.dtype != np.int32:
+        raise TypeError("[TEN VAD]: out must hold a float32 and an int32 array")
+    if min(len(probabilities), len(flags)) < len(frames):
+        raise ValueError(f"[TEN VAD]: out arrays must hold at least {len(frames)} frames")
+    if len(frames):
+        vad._process_frames(frames, probabilities, flags)
+    return out
+
+
+_HandleKey = Tuple[int, float]
+
+
+class TenVadHandlePool:
+    """Keep warm ``TenVad`` handles for many short sessions.
+
+    Creating a handle loads nothing after the first time, but still costs a
+    native allocation and model setup. The pool keeps released handles per
+    ``(hop_size, threshold)`` and hands them out again, so a session only
+    pays for a reset. Handles are reset, get their pool threshold and
+    metrics setting back and lose their callback and energy gate when
+    released.
+
+    Idle handles beyond ``min_size`` per key are destroyed once they have
+    been idle for ``idle_timeout`` seconds; eviction runs on every acquire
+    and release, or explicitly with ``evict_idle``. At most ``max_size``
+    handles of one key exist at a time, idle or in use; further acquires
+    wait for a release.
+
+    Example:
+        pool = TenVadHandlePool(min_size=8)
+        with pool.handle() as vad:
+            probabilities, flags = vad.process_array(call_audio)
+
+    Args:
+        min_size (int, optional): Handles of the default key created up front
+            and never evicted. Defaults to 0.
+        max_size (int, optional): Handles per key, idle or in use. Defaults to 64.
+        idle_timeout (float, optional): Seconds before an idle handle beyond
+            ``min_size`` is destroyed. Defaults to 60.
+        hop_size (int, optional): Default frame size. Defaults to 256.
+        threshold (float, optional): Default speech threshold. Defaults to 0.5.
+
+    Raises:
+        ValueError: If the sizes or idle_timeout are invalid.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 0,
+        max_size: int = 64,
+        idle_timeout: float = 60.0,
+        hop_size: int = 256,
+        threshold: float = 0.5,
+    ):
+        if min_size < 0 or max_size <= 0 or min_size > max_size:
+            raise ValueError("[TEN VAD]: pool sizes must satisfy 0 <= min_size <= max_size and max_size > 0")
+        if idle_timeout < 0:
+            raise ValueError("[TEN VAD]: idle_timeout must not be negative")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.hop_size = hop_size
+        self.threshold = threshold
+        self.created = 0  # Handles created by the pool
+        self.reused = 0  # Acquires served by an idle handle
+        # Idle handles per key with the time they were released, oldest first
+        self._idle: Dict[_HandleKey, Deque[Tuple[float, TenVad]]] = {}
+        self._sizes: Dict[_HandleKey, int] = {}  # Handles per key, idle or in use
+        self._in_use: Dict[int, _HandleKey] = {}
+        self._metered: "weakref.WeakSet[TenVad]" = weakref.WeakSet()  # Handles created with metrics enabled
+        self._condition = threading.Condition()
+        self._closed = False
+        self.warm(min_size)
+
+    def __enter__(self) -> "TenVadHandlePool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of idle handles."""
+        with self._condition:
+            return sum(len(idle) for idle in self._idle.values())
+
+    @property
+    def in_use(self) -> int:
+        """Number of handles currently acquired."""
+        return len(self._in_use)
+
+    def warm(self, count: int, hop_size: Optional[int] = None, threshold: Optional[float] = None) -> None:
+        """Create idle handles of a key until it holds at least ``count`` handles.
+
+        Args:
+            count (int): Handles the key should hold, capped at max_size.
+            hop_size (int, optional): Frame size. Defaults to the pool hop_size.
+            threshold (float, optional): Speech threshold. Defaults to the pool threshold.
+
+        Raises:
+            RuntimeError: If the pool is closed.
+        """
+        key = self._key(hop_size, threshold)
+        while True:
+            with self._condition:
+                self._check_open()
+                if self._sizes.get(key, 0) >= min(count, self.max_size):
+                    return
+                self._sizes[key] = self._sizes.get(key, 0) + 1
+            vad = self._create(key)
+            with self._condition:
+                self._idle.setdefault(key, deque()).append((time.monotonic(), vad))
+                self._condition.notify()
+
+    def acquire(self, hop_size: Optional[int] = None, threshold: Optional[float] = None, timeout: Optional[float] = None) -> TenVad:
+        """Take a handle, reusing an idle one when there is one.
+
+        Args:
+            hop_size (int, optional): Frame size. Defaults to the pool hop_size.
+            threshold (float, optional): Speech threshold. Defaults to the pool threshold.
+            timeout (float, optional): Seconds to wait while the key is at
+                max_size. Defaults to waiting indefinitely.
+
+        Returns:
+            TenVad: A handle with fresh model state; give it back with ``release``.
+
+        Raises:
+            TimeoutError: If no handle became available within timeout.
+            RuntimeError: If the pool is closed or handle creation fails.
+        """
+        key = self._key(hop_size, threshold)
+        with self._condition:
+            stale = self._collect_idle()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                self._check_open()
+                idle = self._idle.get(key)
+                if idle:
+                    # Most recently released first: its memory is most likely still cached
+                    _, vad = idle.pop()
+                    self._in_use[id(vad)] = key
+                    self.reused += 1
+                    break
+                if self._sizes.get(key, 0) < self.max_size:
+                    self._sizes[key] = self._sizes.get(key, 0) + 1
+                    vad = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"[TEN VAD]: no handle for hop_size={key[0]}, threshold={key[1]} within {timeout} s")
+                self._condition.wait(remaining)
+        _close_all(stale)
+        if vad is None:
+            vad = self._create(key)
+            with self._condition:
+                self._in_use[id(vad)] = key
+        return vad
+
+    def release(self, vad: TenVad) -> None:
+        """Reset a handle and return it to the pool.
+
+        A handle that fails to reset or was closed by its user is destroyed
+        instead of being kept.
+
+        Args:
+            vad (TenVad): A handle obtained from ``acquire``.
+
+        Raises:
+            ValueError: If the handle is not in use from this pool.
+        """
+        with self._condition:
+            key = self._in_use.pop(id(vad), None)
+            if key is None:
+                raise ValueError("[TEN VAD]: handle does not belong to this pool or was already released")
+        vad.callback = None
+        try:
+            if vad.closed:
+                raise RuntimeError("[TEN VAD]: handle was closed")
+            if vad.threshold != key[1]:
+                vad.set_threshold(key[1])
+            vad.set_energy_gate(None)
+            vad.enable_metrics(vad in self._metered)
+            vad.reset()
+        except Exception:
+            logger.warning("[TEN VAD]: Dropping a handle that could not be reset", exc_info=True)
+            _close_all([vad])
+            vad = None
+        with self._condition:
+            stale = self._collect_idle()
+            if vad is None or self._closed:
+                self._sizes[key] -= 1
+                stale.append(vad)
+            else:
+                self._idle.setdefault(key, deque()).append((time.monotonic(), vad))
+            self._condition.notify()
+        _close_all(stale)
+
+    @contextmanager
+    def handle(self, hop_size: Optional[int] = None, threshold: Optional[float] = None, timeout: Optional[float] = None) -> Iterator[TenVad]:
+        """Acquire a handle for the duration of a ``with`` block; see ``acquire``."""
+        vad = self.acquire(hop_size, threshold, timeout)
+        try:
+            yield vad
+        finally:
+            self.release(vad)
+
+    def evict_idle(self) -> int:
+        """Destroy handles idle for longer than idle_timeout, keeping min_size per key.
+
+        Returns:
+            int: Number of handles destroyed.
+        """
+        with self._condition:
+            stale = self._collect_idle()
+        _close_all(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """Destroy the idle handles; handles in use are destroyed when released."""
+        with self._condition:
+            self._closed = True
+            stale = [vad for idle in self._idle.values() for _, vad in idle]
+            for key, idle in self._idle.items():
+                self._sizes[key] -= len(idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        _close_all(stale)
+
+    def _key(self, hop_size: Optional[int], threshold: Optional[float]) -> _HandleKey:
+        return (
+            self.hop_size if hop_size is None else hop_size,
+            float(self.threshold if threshold is None else threshold),
+        )
+
+    def _create(self, key: _HandleKey) -> TenVad:
+        """Create a handle whose slot in ``_sizes`` has already been reserved."""
+        try:
+            vad = TenVad(*key)
+        except BaseException:
+            with self._condition:
+                self._sizes[key] -= 1
+                self._condition.notify()
+            raise
+        self.created += 1
+        if vad.stats() is not None:
+            self._metered.add(vad)
+        return vad
+
+    def _collect_idle(self) -> List[TenVad]:
+        """Remove expired idle handles; call with the lock held and destroy them after."""
+        deadline = time.monotonic() - self.idle_timeout
+        default_key = self._key(None, None)
+        stale = []
+        for key, idle in self._idle.items():
+            keep = self.min_size if key == default_key else 0
+            while idle and idle[0][0] <= deadline and self._sizes[key] > keep:
+                stale.append(idle.popleft()[1])
+                self._sizes[key] -= 1
+        return stale
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("[TEN VAD]: pool is closed")
+
+
+def _close_all(handles: List[Optional[TenVad]]) -> None:
+    for vad in handles:
+        if vad is None:
+            continue
+        try:
+            vad.close()
+        except RuntimeError:
+            logger.warning("[TEN VAD]: Failed to destroy a pooled handle", exc_info=True)
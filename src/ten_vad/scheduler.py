@@ -0,0 +1,557 @@
+"""Deadline-aware frame scheduling with load shedding for many streams.
+
+``TenVadPool`` runs every submitted buffer, so on an overloaded host all
+streams fall behind together and latency grows without bound. A
+``DeadlineScheduler`` works in ticks instead. Audio fed to a stream is cut
+into frames, and every frame gets a deadline: its arrival time plus the
+stream's latency budget. Each tick the scheduler
+
+1. coalesces backlogs: the oldest frames of a sheddable stream beyond
+   ``max_backlog`` are answered with an energy estimate;
+2. orders the pending frames by deadline, those of streams that are never
+   shed first and higher priorities first on equal deadlines, and takes as
+   many as the workers can run in one tick (from a running estimate of
+   the time per frame);
+3. answers the frames of sheddable streams that were left out and would
+   miss their deadline by the end of the next tick with the energy
+   estimate;
+4. runs the selected frames, one batch per stream, on the worker threads,
+   and delivers all results in frame order.
+
+Streams with a priority above ``shed_priority`` are never shed; under
+overload their frames run late and count as deadline misses. Shed frames
+are never seen by the model, so a shed stream resumes with the state it
+had before them, as with the energy gate. The energy estimate maps the
+RMS level of a frame linearly from ``estimate_floor_dbfs`` (probability 0)
+to ``estimate_speech_dbfs`` (probability 1).
+
+``stats()`` and ``render_prometheus()`` report queue depth, frames run and
+shed, deadline misses, tick overruns and the frame latency distribution
+(delivery time minus arrival time).
+
+Example:
+    with DeadlineScheduler(tick=0.016) as scheduler:
+        scheduler.add_stream("agent", priority=1, callback=on_result)
+        scheduler.add_stream("monitor", priority=0, callback=on_result)
+        scheduler.start()
+        scheduler.feed("agent", chunk)
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Hashable, List, NamedTuple, Optional
+
+import numpy as np
+
+from .gate import EnergyGate
+from .metrics import QUANTILES, LatencyHistogram
+from .wrapper import TenVad
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledResult(NamedTuple):
+    """Results of consecutive frames of one stream."""
+
+    stream_id: Hashable
+    start: int  # Index of the first frame in the stream
+    probabilities: np.ndarray  # float32
+    flags: np.ndarray  # uint8
+    estimated: bool  # Energy estimate instead of the model
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.flags)
+
+
+class _Block:
+    """Frames of one ``feed`` call that are still pending; they share a deadline."""
+
+    __slots__ = ("frames", "start", "arrival", "deadline")
+
+    def __init__(self, frames: np.ndarray, start: int, arrival: float, deadline: float):
+        self.frames = frames
+        self.start = start
+        self.arrival = arrival
+        self.deadline = deadline
+
+    def split(self, count: int) -> "_Block":
+        """Remove and return the first ``count`` frames."""
+        head = _Block(self.frames[:count], self.start, self.arrival, self.deadline)
+        self.frames = self.frames[count:]
+        self.start += count
+        return head
+
+
+class _ScheduledStream:
+    """Per-stream state: handle, partial frame, pending blocks and counters."""
+
+    def __init__(self, vad: TenVad, priority: int, latency: float, callback: Optional[Callable[[ScheduledResult], None]]):
+        self.vad = vad
+        self.priority = priority
+        self.latency = latency
+        self.callback = callback
+        self.carry = np.zeros(vad.hop_size, dtype=np.int16)
+        self.carry_len = 0
+        self.next_frame = 0  # Index of the next frame cut from fed audio
+        self.pending: Deque[_Block] = deque()
+        self.queued = 0  # Frames in pending
+        self.frames = 0  # Frames run through the model
+        self.estimated_frames = 0  # Frames answered by the energy estimate
+        self.deadline_misses = 0  # Frames delivered after their deadline
+        self.errors = 0  # Batches whose processing failed
+
+
+class _Plan:
+    """Frames of one stream taken in a tick: shed backlog, frames to run, shed overdue frames."""
+
+    __slots__ = ("stream", "coalesced", "run", "overdue")
+
+    def __init__(self, stream: _ScheduledStream):
+        self.stream = stream
+        self.coalesced: List[_Block] = []
+        self.run: List[_Block] = []
+        self.overdue: List[_Block] = []
+
+
+class DeadlineScheduler:
+    """Run frames of many streams in deadline order, shedding load under overload.
+
+    Args:
+        max_workers (int, optional): Worker threads. Defaults to the CPU count.
+        tick (float, optional): Seconds between ticks of ``start``. Defaults to 0.016.
+        latency (float, optional): Default latency budget of a stream in seconds. Defaults to 0.1.
+        hop_size (int, optional): Default frame size. Defaults to 256.
+        threshold (float, optional): Default speech threshold. Defaults to 0.5.
+        shed_priority (int, optional): Streams with this priority or lower may be
+            shed. Defaults to 0.
+        max_backlog (int, optional): Pending frames a sheddable stream keeps; older
+            ones are answered by the estimate. Defaults to 64.
+        frame_cost (float, optional): Seconds of worker time per frame. Defaults to
+            None, measured as the scheduler runs.
+        estimate_floor_dbfs (float, optional): RMS level estimated as probability 0. Defaults to -60.
+        estimate_speech_dbfs (float, optional): RMS level estimated as probability 1. Defaults to -30.
+
+    Raises:
+        ValueError: If a size, time or level range is invalid.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        tick: float = 0.016,
+        latency: float = 0.1,
+        hop_size: int = 256,
+        threshold: float = 0.5,
+        shed_priority: int = 0,
+        max_backlog: int = 64,
+        frame_cost: Optional[float] = None,
+        estimate_floor_dbfs: float = -60.0,
+        estimate_speech_dbfs: float = -30.0,
+    ):
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers <= 0 or max_backlog < 0:
+            raise ValueError("[TEN VAD]: max_workers must be positive and max_backlog must not be negative")
+        if tick <= 0 or latency < 0 or (frame_cost is not None and frame_cost <= 0):
+            raise ValueError("[TEN VAD]: tick and frame_cost must be positive and latency must not be negative")
+        if estimate_speech_dbfs <= estimate_floor_dbfs:
+            raise ValueError("[TEN VAD]: estimate_speech_dbfs must be above estimate_floor_dbfs")
+        self.max_workers = max_workers
+        self.tick = tick
+        self.latency = latency
+        self.hop_size = hop_size
+        self.threshold = threshold
+        self.shed_priority = shed_priority
+        self.max_backlog = max_backlog
+        self.estimate_floor_dbfs = estimate_floor_dbfs
+        self.estimate_speech_dbfs = estimate_speech_dbfs
+        self._fixed_cost = frame_cost is not None
+        self._frame_cost = frame_cost  # Worker seconds per frame; None until the first measurement
+        self._levels = EnergyGate()  # Only used to measure frame levels
+        self._streams: Dict[Hashable, _ScheduledStream] = {}
+        self._lock = threading.Lock()  # Guards streams and their pending frames
+        self._tick_lock = threading.RLock()  # One tick at a time; callbacks may remove streams
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ten_vad_scheduler")
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._closed = False
+        self.ticks = 0
+        self.tick_overruns = 0  # Ticks of ``start`` that began late because the previous one ran long
+        self.latency_histogram = LatencyHistogram()
+
+    def __enter__(self) -> "DeadlineScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def __contains__(self, stream_id: Hashable) -> bool:
+        return stream_id in self._streams
+
+    @property
+    def queue_depth(self) -> int:
+        """Frames waiting in all streams."""
+        with self._lock:
+            return sum(stream.queued for stream in self._streams.values())
+
+    @property
+    def frame_cost(self) -> Optional[float]:
+        """Worker seconds per frame used to size each tick."""
+        return self._frame_cost
+
+    def add_stream(
+        self,
+        stream_id: Hashable,
+        priority: int = 0,
+        latency: Optional[float] = None,
+        hop_size: Optional[int] = None,
+        threshold: Optional[float] = None,
+        callback: Optional[Callable[[ScheduledResult], None]] = None,
+    ) -> TenVad:
+        """Create a stream and its handle.
+
+        Args:
+            stream_id (Hashable): Key identifying the stream.
+            priority (int, optional): Streams above the scheduler's shed_priority run
+                first and are never shed; higher runs first on equal deadlines. Defaults to 0.
+            latency (float, optional): Latency budget in seconds. Defaults to the scheduler latency.
+            hop_size (int, optional): Frame size. Defaults to the scheduler hop_size.
+            threshold (float, optional): Speech threshold. Defaults to the scheduler threshold.
+            callback (Callable[[ScheduledResult], None], optional): Receives the stream's
+                results on the ticking thread. Without one, ``run_tick`` returns them.
+
+        Returns:
+            TenVad: The handle owned by the stream.
+
+        Raises:
+            KeyError: If the stream already exists.
+            RuntimeError: If the scheduler is closed.
+        """
+        vad = TenVad(self.hop_size if hop_size is None else hop_size, self.threshold if threshold is None else threshold)
+        stream = _ScheduledStream(vad, priority, self.latency if latency is None else latency, callback)
+        with self._lock:
+            if not self._closed and stream_id not in self._streams:
+                self._streams[stream_id] = stream
+                return vad
+        vad.close()
+        self._check_open()
+        raise KeyError(f"[TEN VAD]: stream {stream_id!r} already exists")
+
+    def remove_stream(self, stream_id: Hashable) -> None:
+        """Drop a stream, its pending frames and its handle.
+
+        Raises:
+            KeyError: If the stream does not exist.
+        """
+        with self._lock:
+            stream = self._streams.pop(stream_id)
+        with self._tick_lock:
+            stream.vad.close()
+
+    def feed(self, stream_id: Hashable, audio: np.ndarray, now: Optional[float] = None) -> int:
+        """Queue int16 audio of any length for a stream.
+
+        Args:
+            stream_id (Hashable): Key identifying the stream.
+            audio (np.ndarray): 1-D int16 samples.
+            now (float, optional): Arrival time on the ``time.monotonic`` clock. Defaults to now.
+
+        Returns:
+            int: Frames queued by this call.
+
+        Raises:
+            KeyError: If the stream does not exist.
+            TypeError: If audio is not an int16 NumPy array.
+            ValueError: If audio is not one-dimensional.
+        """
+        samples = TenVad._as_samples(audio)
+        arrival = time.monotonic() if now is None else now
+        with self._lock:
+            self._check_open()
+            stream = self._streams[stream_id]
+            hop_size = stream.vad.hop_size
+            if stream.carry_len:
+                samples = np.concatenate((stream.carry[: stream.carry_len], samples))
+            num_frames = len(samples) // hop_size
+            remainder = len(samples) - num_frames * hop_size
+            if num_frames:
+                # Copy, so callers may reuse their buffer
+                frames = samples[: num_frames * hop_size].reshape(num_frames, hop_size).copy()
+                stream.pending.append(_Block(frames, stream.next_frame, arrival, arrival + stream.latency))
+                stream.next_frame += num_frames
+                stream.queued += num_frames
+            stream.carry[:remainder] = samples[num_frames * hop_size:]
+            stream.carry_len = remainder
+            return num_frames
+
+    def run_tick(self, now: Optional[float] = None) -> List[ScheduledResult]:
+        """Schedule and run one tick.
+
+        Args:
+            now (float, optional): Tick time on the ``time.monotonic`` clock. Defaults to now.
+
+        A stream whose batch fails has the frames of that batch answered by the
+        energy estimate; the failure is logged and counted in ``stats()``, and
+        every other stream is delivered as usual.
+
+        Returns:
+            List[ScheduledResult]: Results of streams without a callback, in frame order per stream.
+        """
+        with self._tick_lock:
+            now = time.monotonic() if now is None else now
+            plans = self._plan(now)
+            started = time.monotonic()
+            futures = {
+                stream_id: self._executor.submit(self._run_blocks, plan.stream, plan.run)
+                for stream_id, plan in plans.items()
+                if plan.run
+            }
+            results = {}
+            for stream_id, plan in plans.items():
+                ordered = [self._estimate(plan.stream, block) for block in plan.coalesced]
+                if stream_id in futures:
+                    try:
+                        ordered.append(futures[stream_id].result())
+                    except Exception:
+                        logger.exception("[TEN VAD]: Processing of stream %r failed, frames estimated", stream_id)
+                        plan.stream.errors += 1
+                        ordered.extend(self._estimate(plan.stream, block) for block in plan.run)
+                ordered.extend(self._estimate(plan.stream, block) for block in plan.overdue)
+                results[stream_id] = ordered
+            done = time.monotonic()
+            frames_run = sum(sum(len(block.frames) for block in plan.run) for plan in plans.values())
+            if frames_run and not self._fixed_cost:
+                cost = (done - started) * min(len(futures), self.max_workers) / frames_run
+                self._frame_cost = cost if self._frame_cost is None else 0.8 * self._frame_cost + 0.2 * cost
+            self.ticks += 1
+            # Ticks driven with an explicit clock deliver at that clock's time
+            return self._deliver(plans, results, now + done - started)
+
+    def start(self) -> None:
+        """Run ticks every ``tick`` seconds on a background thread.
+
+        Raises:
+            RuntimeError: If the scheduler is closed or already running.
+        """
+        self._check_open()
+        if self._thread is not None:
+            raise RuntimeError("[TEN VAD]: scheduler is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="ten_vad_scheduler_tick", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background ticks; pending frames stay queued."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop ticking, shut the workers down and destroy every handle."""
+        self.stop()
+        with self._lock:
+            self._closed = True
+            streams = list(self._streams.values())
+            self._streams.clear()
+        self._executor.shutdown(wait=True)
+        for stream in streams:
+            stream.vad.close()
+
+    def stats(self) -> dict:
+        """Counters as plain values; times in seconds."""
+        with self._lock:
+            streams = {
+                stream_id: {
+                    "priority": stream.priority,
+                    "queue_depth": stream.queued,
+                    "frames": stream.frames,
+                    "estimated_frames": stream.estimated_frames,
+                    "deadline_misses": stream.deadline_misses,
+                    "errors": stream.errors,
+                }
+                for stream_id, stream in self._streams.items()
+            }
+        return {
+            "ticks": self.ticks,
+            "tick_overruns": self.tick_overruns,
+            "queue_depth": sum(stream["queue_depth"] for stream in streams.values()),
+            "frames": sum(stream["frames"] for stream in streams.values()),
+            "estimated_frames": sum(stream["estimated_frames"] for stream in streams.values()),
+            "deadline_misses": sum(stream["deadline_misses"] for stream in streams.values()),
+            "errors": sum(stream["errors"] for stream in streams.values()),
+            "frame_cost_seconds": self._frame_cost,
+            "latency": {name: self.latency_histogram.quantile(q) for name, q in QUANTILES},
+            "streams": streams,
+        }
+
+    def render_prometheus(self, prefix: str = "ten_vad_scheduler") -> str:
+        """Render ``stats()`` in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to "ten_vad_scheduler".
+
+        Returns:
+            str: Exposition text, ending with a newline.
+        """
+        stats = self.stats()
+        lines = []
+
+        def add(name: str, kind: str, help_text: str, key: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for stream_id, stream in stats["streams"].items():
+                lines.append(f'{prefix}_{name}{{stream="{stream_id}",priority="{stream["priority"]}"}} {stream[key]}')
+
+        add("queue_depth", "gauge", "Frames waiting to be scheduled.", "queue_depth")
+        add("frames_total", "counter", "Frames run through the model.", "frames")
+        add("estimated_frames_total", "counter", "Frames shed to the energy estimate.", "estimated_frames")
+        add("deadline_misses_total", "counter", "Frames delivered after their deadline.", "deadline_misses")
+        add("errors_total", "counter", "Batches whose processing failed.", "errors")
+        lines.append(f"# HELP {prefix}_ticks_total Scheduler ticks.")
+        lines.append(f"# TYPE {prefix}_ticks_total counter")
+        lines.append(f"{prefix}_ticks_total {stats['ticks']}")
+        lines.append(f"# HELP {prefix}_tick_overruns_total Ticks that started late.")
+        lines.append(f"# TYPE {prefix}_tick_overruns_total counter")
+        lines.append(f"{prefix}_tick_overruns_total {stats['tick_overruns']}")
+        lines.append(f"# HELP {prefix}_frame_latency_quantile_seconds Frame arrival to delivery at p50/p99/p999.")
+        lines.append(f"# TYPE {prefix}_frame_latency_quantile_seconds gauge")
+        lines.extend(
+            f'{prefix}_frame_latency_quantile_seconds{{quantile="{q}"}} {self.latency_histogram.quantile(q) or 0.0:.9f}'
+            for _, q in QUANTILES
+        )
+        return "\n".join(lines) + "\n"
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("[TEN VAD]: scheduler is closed")
+
+    def _capacity(self) -> Optional[int]:
+        """Frames the workers can run in one tick; None before the first measurement."""
+        if self._frame_cost is None:
+            return None
+        return max(1, int(self.tick * self.max_workers / self._frame_cost))
+
+    def _plan(self, now: float) -> Dict[Hashable, _Plan]:
+        """Take the frames to run and the frames to shed off the pending queues."""
+        plans: Dict[Hashable, _Plan] = {}
+
+        def plan_of(stream_id: Hashable) -> _Plan:
+            if stream_id not in plans:
+                plans[stream_id] = _Plan(self._streams[stream_id])
+            return plans[stream_id]
+
+        with self._lock:
+            # 1. Coalesce the backlog of sheddable streams
+            for stream_id, stream in self._streams.items():
+                excess = stream.queued - self.max_backlog
+                if stream.priority <= self.shed_priority and excess > 0:
+                    plan_of(stream_id).coalesced = self._take(stream, excess)
+
+            # 2. Earliest deadline first within the tick's capacity, streams that are never
+            # shed before the others, higher priority first on equal deadlines. Deadlines
+            # grow along each stream, so every stream gets a prefix of its queue.
+            candidates = sorted(
+                (stream.priority <= self.shed_priority, block.deadline, -stream.priority, order, index, len(block.frames), stream_id)
+                for order, (stream_id, stream) in enumerate(self._streams.items())
+                for index, block in enumerate(stream.pending)
+            )
+            remaining = self._capacity()
+            selected: Dict[Hashable, int] = {}
+            for *_, count, stream_id in candidates:
+                if remaining is not None:
+                    if remaining <= 0:
+                        break
+                    count = min(count, remaining)
+                    remaining -= count
+                selected[stream_id] = selected.get(stream_id, 0) + count
+            for stream_id, count in selected.items():
+                plan_of(stream_id).run = self._take(self._streams[stream_id], count)
+
+            # 3. Shed what would miss its deadline anyway: frames left out now are
+            # delivered at the end of the next tick at the earliest
+            horizon = now + 2 * self.tick
+            for stream_id, stream in self._streams.items():
+                if stream.priority > self.shed_priority:
+                    continue
+                overdue = 0
+                for block in stream.pending:
+                    if block.deadline > horizon:
+                        break
+                    overdue += len(block.frames)
+                if overdue:
+                    plan_of(stream_id).overdue = self._take(stream, overdue)
+        return plans
+
+    @staticmethod
+    def _take(stream: _ScheduledStream, count: int) -> List[_Block]:
+        """Pop the oldest ``count`` pending frames of a stream."""
+        taken = []
+        while count > 0:
+            block = stream.pending[0]
+            if len(block.frames) <= count:
+                taken.append(stream.pending.popleft())
+            else:
+                taken.append(block.split(count))
+            count -= len(taken[-1].frames)
+            stream.queued -= len(taken[-1].frames)
+        return taken
+
+    @staticmethod
+    def _run_blocks(stream: _ScheduledStream, blocks: List[_Block]) -> ScheduledResult:
+        frames = blocks[0].frames if len(blocks) == 1 else np.concatenate([block.frames for block in blocks])
+        probabilities = np.empty(len(frames), dtype=np.float32)
+        flags = np.empty(len(frames), dtype=np.int32)
+        stream.vad._process_frames(frames, probabilities, flags)
+        return ScheduledResult(None, blocks[0].start, probabilities, flags.astype(np.uint8), False)
+
+    def _estimate(self, stream: _ScheduledStream, block: _Block) -> ScheduledResult:
+        """Answer shed frames from their RMS level."""
+        rms_dbfs, _ = self._levels.levels(block.frames)
+        probabilities = np.clip(
+            (rms_dbfs - self.estimate_floor_dbfs) / (self.estimate_speech_dbfs - self.estimate_floor_dbfs), 0.0, 1.0
+        ).astype(np.float32)
+        flags = (probabilities > stream.vad.threshold).astype(np.uint8)
+        return ScheduledResult(None, block.start, probabilities, flags, True)
+
+    def _deliver(self, plans: Dict[Hashable, _Plan], results: Dict[Hashable, List[ScheduledResult]], delivered: float) -> List[ScheduledResult]:
+        """Update counters and hand each stream's results out in frame order."""
+        returned = []
+        for stream_id, plan in plans.items():
+            stream = plan.stream
+            for block in plan.coalesced + plan.run + plan.overdue:
+                count = len(block.frames)
+                self.latency_histogram.record(int(max(delivered - block.arrival, 0.0) * 1e9), count)
+                if delivered > block.deadline:
+                    stream.deadline_misses += count
+            for result in results[stream_id]:
+                result = result._replace(stream_id=stream_id)
+                if result.estimated:
+                    stream.estimated_frames += len(result.flags)
+                else:
+                    stream.frames += len(result.flags)
+                if stream.callback is not None:
+                    stream.callback(result)
+                else:
+                    returned.append(result)
+        return returned
+
+    def _loop(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop.wait(max(next_tick - time.monotonic(), 0.0)):
+            try:
+                self.run_tick()
+            except Exception:
+                logger.exception("[TEN VAD]: Scheduler tick failed")
+            next_tick += self.tick
+            current = time.monotonic()
+            if next_tick < current:
+                self.tick_overruns += 1
+                next_tick = current
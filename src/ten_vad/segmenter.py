@@ -0,0 +1,296 @@
+"""Speech segmentation on top of per-frame VAD probabilities.
+
+Both the incremental ``SpeechSegmenter`` and the offline
+``segments_from_probabilities`` apply the same rules, in frames:
+
+1. Hysteresis: a frame turns voiced once its probability reaches
+   ``onset_threshold`` and stays voiced until it drops below
+   ``offset_threshold``.
+2. Voiced runs separated by fewer than ``hangover + min_silence`` unvoiced
+   frames are merged into one segment.
+3. Segments spanning fewer than ``min_speech`` frames are dropped.
+4. A segment covers ``[first_voiced * hop - pre_pad, (last_voiced + 1 + hangover) * hop + post_pad)``
+   in samples, clipped to the start of the audio and to the end of the
+   previous segment. Only a segment still open when the input ends is
+   clipped to the end of the audio.
+
+Durations are given in milliseconds and converted to frames (hangover,
+min_speech, min_silence) or samples (padding) using ``sample_rate``.
+"""
+from typing import Callable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+
+class SpeechStart(NamedTuple):
+    """Speech begins at ``sample`` (inclusive)."""
+
+    sample: int
+    sample_rate: int = 16000
+
+    @property
+    def seconds(self) -> float:
+        return self.sample / self.sample_rate
+
+
+class SpeechEnd(NamedTuple):
+    """Speech ends at ``sample`` (exclusive)."""
+
+    sample: int
+    sample_rate: int = 16000
+
+    @property
+    def seconds(self) -> float:
+        return self.sample / self.sample_rate
+
+
+SpeechEvent = Union[SpeechStart, SpeechEnd]
+
+
+def _hysteresis(probabilities: np.ndarray, onset: float, offset: float, initial: bool) -> np.ndarray:
+    """Vectorized two-threshold decision: frames between the thresholds keep the previous state."""
+    decisive = np.where(probabilities >= onset, 1, np.where(probabilities < offset, 0, -1)).astype(np.int8)
+    index = np.where(decisive >= 0, np.arange(len(decisive)), -1)
+    np.maximum.accumulate(index, out=index)
+    return np.where(index >= 0, decisive[index], int(initial)).astype(bool)
+
+
+class _Params:
+    """Durations converted to frames and samples, shared by both segmenters."""
+
+    def __init__(self, hop_size, sample_rate, onset_threshold, offset_threshold, min_speech_ms, min_silence_ms, hangover_ms, pre_pad_ms, post_pad_ms):
+        if offset_threshold is None:
+            offset_threshold = max(onset_threshold - 0.15, 0.0)
+        if not 0 <= offset_threshold <= onset_threshold <= 1:
+            raise ValueError("[TEN VAD]: thresholds must satisfy 0 <= offset_threshold <= onset_threshold <= 1")
+        if hop_size <= 0 or sample_rate <= 0:
+            raise ValueError("[TEN VAD]: hop_size and sample_rate must be positive")
+        if min(min_speech_ms, min_silence_ms, hangover_ms, pre_pad_ms, post_pad_ms) < 0:
+            raise ValueError("[TEN VAD]: durations must not be negative")
+        frame_ms = 1000.0 * hop_size / sample_rate
+        self.hop_size = hop_size
+        self.sample_rate = sample_rate
+        self.onset = onset_threshold
+        self.offset = offset_threshold
+        self.min_speech = int(round(min_speech_ms / frame_ms))
+        self.hangover = int(round(hangover_ms / frame_ms))
+        self.gap = self.hangover + int(round(min_silence_ms / frame_ms))
+        self.pre_pad = int(round(pre_pad_ms * sample_rate / 1000.0))
+        self.post_pad = int(round(post_pad_ms * sample_rate / 1000.0))
+
+    def end_sample(self, last_voiced_end: int) -> int:
+        return (last_voiced_end + self.hangover) * self.hop_size + self.post_pad
+
+
+class SpeechSegmenter:
+    """Turn a stream of per-frame probabilities into speech start/end events.
+
+    Feed the probabilities of each processed chunk (for example
+    ``TenVadStream.feed(chunk)["probability"]``) to ``push`` and call
+    ``flush`` when the stream ends. Only ``SpeechStart`` and ``SpeechEnd``
+    events are produced, with sample-accurate timestamps; a start is
+    reported once the segment has lasted ``min_speech_ms``, and an end once
+    ``hangover_ms + min_silence_ms`` of silence have followed it. The
+    segmentation rules are described in the module docstring.
+
+    Args:
+        hop_size (int, optional): Samples per frame. Defaults to 256.
+        onset_threshold (float, optional): Probability that starts speech. Defaults to 0.5.
+        offset_threshold (float, optional): Probability below which speech stops.
+            Defaults to ``onset_threshold - 0.15``.
+        min_speech_ms (float, optional): Shortest segment reported. Defaults to 100.
+        min_silence_ms (float, optional): Shortest gap that splits segments, after hangover. Defaults to 100.
+        hangover_ms (float, optional): Speech held after the last voiced frame. Defaults to 64.
+        pre_pad_ms (float, optional): Padding before each segment. Defaults to 0.
+        post_pad_ms (float, optional): Padding after each segment. Defaults to 0.
+        sample_rate (int, optional): Sample rate of the audio. Defaults to 16000.
+        on_event (Callable[[SpeechEvent], None], optional): Called for every event as it is produced.
+
+    Raises:
+        ValueError: If thresholds or durations are invalid.
+    """
+
+    def __init__(
+        self,
+        hop_size: int = 256,
+        onset_threshold: float = 0.5,
+        offset_threshold: Optional[float] = None,
+        min_speech_ms: float = 100.0,
+        min_silence_ms: float = 100.0,
+        hangover_ms: float = 64.0,
+        pre_pad_ms: float = 0.0,
+        post_pad_ms: float = 0.0,
+        sample_rate: int = 16000,
+        on_event: Optional[Callable[[SpeechEvent], None]] = None,
+    ):
+        self._params = _Params(
+            hop_size, sample_rate, onset_threshold, offset_threshold, min_speech_ms, min_silence_ms, hangover_ms, pre_pad_ms, post_pad_ms
+        )
+        self.on_event = on_event
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all state; the next frame is frame 0."""
+        self._frames = 0  # Frames seen so far
+        self._voiced = False  # Hysteresis state of the last frame
+        self._segment_start: Optional[int] = None  # First voiced frame of the open segment
+        self._last_voiced_end = 0  # One past the last voiced frame of the open segment
+        self._confirmed = False  # SpeechStart emitted for the open segment
+        self._last_end_sample = 0
+
+    @property
+    def in_speech(self) -> bool:
+        """True between a SpeechStart and its SpeechEnd."""
+        return self._confirmed
+
+    @property
+    def earliest_start(self) -> int:
+        """Lowest sample a segment whose SpeechStart is still to come can start at.
+
+        That is the first voiced frame of an open segment not confirmed yet,
+        or else the next frame, less ``pre_pad`` and no earlier than the end
+        of the previous segment.
+        """
+        params = self._params
+        frame = self._segment_start if self._segment_start is not None and not self._confirmed else self._frames
+        return max(frame * params.hop_size - params.pre_pad, self._last_end_sample)
+
+    @property
+    def earliest_end(self) -> Optional[int]:
+        """Lowest sample the segment in speech can end at, or None outside speech."""
+        if not self._confirmed:
+            return None
+        params = self._params
+        return min(params.end_sample(self._last_voiced_end), self._frames * params.hop_size)
+
+    def push(self, probabilities: np.ndarray) -> List[SpeechEvent]:
+        """Consume the probabilities of consecutive frames.
+
+        Args:
+            probabilities (np.ndarray): Speech probabilities, one per frame.
+
+        Returns:
+            List[SpeechEvent]: Events completed by these frames, in order.
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float32).reshape(-1)
+        events: List[SpeechEvent] = []
+        num_frames = len(probabilities)
+        if num_frames == 0:
+            return events
+        params = self._params
+        voiced = _hysteresis(probabilities, params.onset, params.offset, self._voiced)
+        edges = np.diff(np.concatenate(([self._voiced], voiced, [False])).astype(np.int8))
+        base = self._frames
+        run_starts = np.flatnonzero(edges == 1) + base
+        run_ends = np.flatnonzero(edges == -1) + base
+        if self._voiced:
+            # The first run continues the open run of the previous push
+            self._last_voiced_end = int(run_ends[0])
+            self._confirm(events)
+            run_ends = run_ends[1:]
+        for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+            if self._segment_start is not None and start - self._last_voiced_end >= params.gap:
+                self._close(events, clip=False)
+            if self._segment_start is None:
+                self._segment_start = start
+            self._last_voiced_end = end
+            self._confirm(events)
+        self._frames = base + num_frames
+        self._voiced = bool(voiced[-1])
+        if not self._voiced and self._segment_start is not None and self._frames - self._last_voiced_end >= params.gap:
+            self._close(events, clip=False)
+        return events
+
+    def flush(self) -> List[SpeechEvent]:
+        """End the stream, closing an open segment at the end of the audio.
+
+        Returns:
+            List[SpeechEvent]: A final SpeechEnd if speech was in progress.
+        """
+        events: List[SpeechEvent] = []
+        if self._segment_start is not None:
+            self._close(events, clip=True)
+        self._voiced = False
+        return events
+
+    def _confirm(self, events: List[SpeechEvent]) -> None:
+        params = self._params
+        if not self._confirmed and self._last_voiced_end - self._segment_start >= params.min_speech:
+            self._confirmed = True
+            sample = max(self._segment_start * params.hop_size - params.pre_pad, self._last_end_sample)
+            self._emit(events, SpeechStart(sample, params.sample_rate))
+
+    def _close(self, events: List[SpeechEvent], clip: bool) -> None:
+        params = self._params
+        if self._confirmed:
+            sample = params.end_sample(self._last_voiced_end)
+            if clip:
+                sample = min(sample, self._frames * params.hop_size)
+            self._last_end_sample = sample
+            self._emit(events, SpeechEnd(sample, params.sample_rate))
+        self._segment_start = None
+        self._confirmed = False
+
+    def _emit(self, events: List[SpeechEvent], event: SpeechEvent) -> None:
+        events.append(event)
+        if self.on_event is not None:
+            self.on_event(event)
+
+
+def segments_from_probabilities(
+    probabilities: np.ndarray,
+    hop_size: int = 256,
+    onset_threshold: float = 0.5,
+    offset_threshold: Optional[float] = None,
+    min_speech_ms: float = 100.0,
+    min_silence_ms: float = 100.0,
+    hangover_ms: float = 64.0,
+    pre_pad_ms: float = 0.0,
+    post_pad_ms: float = 0.0,
+    sample_rate: int = 16000,
+) -> np.ndarray:
+    """Segment a whole probability array in one vectorized pass.
+
+    Produces the same segments as feeding ``probabilities`` to a
+    ``SpeechSegmenter`` with the same arguments and flushing it.
+
+    Args:
+        probabilities (np.ndarray): Speech probabilities, one per frame.
+        See ``SpeechSegmenter`` for the remaining arguments.
+
+    Returns:
+        np.ndarray: int64 array of shape (num_segments, 2) with ``[start, end)`` in samples.
+
+    Raises:
+        ValueError: If thresholds or durations are invalid.
+    """
+    params = _Params(
+        hop_size, sample_rate, onset_threshold, offset_threshold, min_speech_ms, min_silence_ms, hangover_ms, pre_pad_ms, post_pad_ms
+    )
+    probabilities = np.asarray(probabilities, dtype=np.float32).reshape(-1)
+    num_frames = len(probabilities)
+    voiced = _hysteresis(probabilities, params.onset, params.offset, False)
+    edges = np.diff(np.concatenate(([False], voiced, [False])).astype(np.int8))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    if len(run_starts) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    split = run_starts[1:] - run_ends[:-1] >= params.gap
+    starts = run_starts[np.concatenate(([True], split))]
+    ends = run_ends[np.concatenate((split, [True]))]
+    keep = ends - starts >= params.min_speech
+    # Whether the last segment was still open at the end of the input
+    trailing = num_frames - ends[-1]
+    last_open = keep[-1] and not (trailing > 0 and trailing >= params.gap)
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    segments = np.empty((len(starts), 2), dtype=np.int64)
+    segments[:, 1] = params.end_sample(ends.astype(np.int64))
+    if last_open:
+        segments[-1, 1] = min(segments[-1, 1], num_frames * hop_size)
+    segments[:, 0] = np.maximum(starts.astype(np.int64) * hop_size - params.pre_pad, 0)
+    segments[1:, 0] = np.maximum(segments[1:, 0], segments[:-1, 1])
+    return segments
@@ -0,0 +1,385 @@
+"""Streaming VAD server on asyncio streams.
+
+Clients connect over TCP or a Unix domain socket and exchange framed
+binary messages. Every message is a 5 byte header, ``<BI`` (message type,
+payload length in bytes), followed by the payload. All values are
+little-endian.
+
+Client to server:
+
+* ``CONFIG`` (0x01), ``<IfB``: hop size (at most ``MAX_HOP_SIZE``), threshold
+  and a bit set of outputs (``OUTPUT_RESULTS``, ``OUTPUT_EVENTS``).
+  Optional; only valid before the first ``AUDIO``. Defaults to the
+  server's hop size and threshold and ``OUTPUT_RESULTS``.
+* ``AUDIO`` (0x02): 16 kHz mono int16 PCM of any whole number of samples.
+  Frames are cut across message boundaries.
+* ``RESET`` (0x03): reset the model and restart frame numbering.
+* ``END`` (0x04): end the stream; the server flushes open segments,
+  answers with ``ENDED`` and closes the connection.
+
+Server to client:
+
+* ``RESULTS`` (0x82), ``<QI`` first frame index and frame count, then the
+  float32 probabilities, then one uint8 flag per frame.
+* ``EVENT`` (0x83), ``<BQ``: 1 for speech start or 0 for speech end, and
+  the sample position (see ``SpeechSegmenter``).
+* ``ENDED`` (0x84), empty: the stream has ended.
+* ``ERROR`` (0xFF): UTF-8 message; the server closes the connection.
+
+Each connection keeps one ``TenVad`` handle, taken from a
+``TenVadHandlePool``, with a ``TenVadStream`` and, when events are
+requested, a ``SpeechSegmenter``. Inference runs on a bounded thread pool.
+Flow control: a connection stops reading once ``queue_size`` messages
+are waiting for compute, so TCP backpressure slows clients that outpace
+the workers, and results are not produced faster than the client reads
+them. Connections beyond ``max_connections`` receive ``ERROR`` and are
+closed.
+
+Usage:
+    python -m ten_vad.server [--host 127.0.0.1] [--port 8765] [--unix PATH] [--workers N]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .pool import TenVadHandlePool
+from .segmenter import SpeechSegmenter, SpeechStart
+from .stream import TenVadStream
+
+logger = logging.getLogger(__name__)
+
+CONFIG = 0x01
+AUDIO = 0x02
+RESET = 0x03
+END = 0x04
+RESULTS = 0x82
+EVENT = 0x83
+ENDED = 0x84
+ERROR = 0xFF
+
+OUTPUT_RESULTS = 1
+OUTPUT_EVENTS = 2
+
+HEADER = struct.Struct("<BI")
+CONFIG_PAYLOAD = struct.Struct("<IfB")
+RESULTS_HEADER = struct.Struct("<QI")
+EVENT_PAYLOAD = struct.Struct("<BQ")
+
+DEFAULT_MAX_MESSAGE = 1 << 20  # Largest accepted payload in bytes
+MAX_HOP_SIZE = 1024  # Largest frame a client may configure; the model is tuned for 160 and 256
+
+
+def encode_message(kind: int, payload: bytes = b"") -> bytes:
+    """Frame a payload for the wire."""
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader, max_size: int = DEFAULT_MAX_MESSAGE) -> Optional[Tuple[int, bytes]]:
+    """Read one framed message.
+
+    Args:
+        reader (asyncio.StreamReader): Stream to read from.
+        max_size (int, optional): Largest accepted payload. Defaults to 1 MiB.
+
+    Returns:
+        Optional[Tuple[int, bytes]]: Message type and payload, or None at a clean end of stream.
+
+    Raises:
+        ValueError: If the payload is larger than max_size.
+        asyncio.IncompleteReadError: If the stream ends inside a message.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial:
+            return None
+        raise
+    kind, size = HEADER.unpack(header)
+    if size > max_size:
+        raise ValueError(f"[TEN VAD]: message of {size} bytes exceeds the limit of {max_size}")
+    return kind, await reader.readexactly(size)
+
+
+def decode_results(payload: bytes) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Split a ``RESULTS`` payload into first frame index, float32 probabilities and uint8 flags."""
+    first_frame, count = RESULTS_HEADER.unpack_from(payload)
+    offset = RESULTS_HEADER.size
+    probabilities = np.frombuffer(payload, dtype="<f4", count=count, offset=offset)
+    flags = np.frombuffer(payload, dtype=np.uint8, count=count, offset=offset + 4 * count)
+    return first_frame, probabilities, flags
+
+
+class _Connection:
+    """Per-connection VAD state; ``feed`` runs on a worker thread."""
+
+    def __init__(self, hop_size: int, threshold: float):
+        self.hop_size = hop_size
+        self.threshold = threshold
+        self.outputs = OUTPUT_RESULTS
+        self.stream: Optional[TenVadStream] = None
+        self.segmenter: Optional[SpeechSegmenter] = None
+
+    def configure(self, payload: bytes) -> None:
+        if self.stream is not None:
+            raise ValueError("[TEN VAD]: CONFIG must precede the first AUDIO message")
+        if len(payload) != CONFIG_PAYLOAD.size:
+            raise ValueError(f"[TEN VAD]: CONFIG payload must be {CONFIG_PAYLOAD.size} bytes")
+        hop_size, threshold, outputs = CONFIG_PAYLOAD.unpack(payload)
+        if not 0 < hop_size <= MAX_HOP_SIZE:
+            raise ValueError(f"[TEN VAD]: hop_size must be between 1 and {MAX_HOP_SIZE}")
+        if not 0 <= threshold <= 1:
+            raise ValueError("[TEN VAD]: threshold must be between 0 and 1")
+        self.hop_size, self.threshold, self.outputs = hop_size, float(np.float32(threshold)), outputs
+
+    def start(self, handles: TenVadHandlePool) -> None:
+        self.stream = TenVadStream(handles.acquire(self.hop_size, self.threshold, timeout=0))
+        if self.outputs & OUTPUT_EVENTS:
+            self.segmenter = SpeechSegmenter(self.hop_size, onset_threshold=self.threshold)
+
+    def feed(self, payload: bytes) -> bytes:
+        """Process a chunk of PCM and return the encoded replies."""
+        if len(payload) % 2:
+            raise ValueError("[TEN VAD]: AUDIO payload must hold whole 16-bit samples")
+        results = self.stream.feed(payload)
+        replies: List[bytes] = []
+        if len(results):
+            if self.outputs & OUTPUT_RESULTS:
+                replies.append(
+                    encode_message(
+                        RESULTS,
+                        RESULTS_HEADER.pack(int(results["offset"][0]) // self.hop_size, len(results))
+                        + results["probability"].astype("<f4").tobytes()
+                        + results["flag"].astype(np.uint8).tobytes(),
+                    )
+                )
+            if self.segmenter is not None:
+                replies.extend(_encode_events(self.segmenter.push(results["probability"])))
+        return b"".join(replies)
+
+    def reset(self) -> None:
+        if self.stream is not None:
+            self.stream.reset()
+        if self.segmenter is not None:
+            self.segmenter.reset()
+
+    def end(self) -> bytes:
+        events = self.segmenter.flush() if self.segmenter is not None else []
+        return b"".join(_encode_events(events)) + encode_message(ENDED)
+
+    def release(self, handles: TenVadHandlePool) -> None:
+        if self.stream is not None:
+            handles.release(self.stream.vad)
+            self.stream = None
+
+
+def _encode_events(events) -> List[bytes]:
+    return [encode_message(EVENT, EVENT_PAYLOAD.pack(isinstance(event, SpeechStart), event.sample)) for event in events]
+
+
+class VadServer:
+    """Serve streaming VAD to many connections from one process.
+
+    Args:
+        host (str, optional): TCP host to bind. Defaults to "127.0.0.1".
+        port (int, optional): TCP port; 0 picks a free one. Defaults to 8765.
+        unix_path (str, optional): Listen on this Unix socket instead of TCP.
+        max_connections (int, optional): Concurrent connections. Defaults to 256.
+        max_workers (int, optional): Inference threads. Defaults to the CPU count.
+        queue_size (int, optional): Messages buffered per connection before
+            reading pauses. Defaults to 4.
+        max_message (int, optional): Largest accepted payload in bytes. Defaults to 1 MiB.
+        hop_size (int, optional): Default frame size. Defaults to 256.
+        threshold (float, optional): Default speech threshold. Defaults to 0.5.
+
+    Example:
+        server = VadServer(port=0)
+        await server.start()
+        host, port = server.address
+        ...
+        await server.close()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        unix_path: Optional[str] = None,
+        max_connections: int = 256,
+        max_workers: Optional[int] = None,
+        queue_size: int = 4,
+        max_message: int = DEFAULT_MAX_MESSAGE,
+        hop_size: int = 256,
+        threshold: float = 0.5,
+    ):
+        if max_connections <= 0 or queue_size <= 0:
+            raise ValueError("[TEN VAD]: max_connections and queue_size must be positive")
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.max_connections = max_connections
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_message = max_message
+        self.hop_size = hop_size
+        self.threshold = threshold
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._handles: Optional[TenVadHandlePool] = None
+        self._tasks = set()
+
+    @property
+    def address(self):
+        """Bound address: ``(host, port)`` for TCP or the socket path."""
+        return self._server.sockets[0].getsockname()
+
+    async def start(self) -> None:
+        """Load the library and start listening."""
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ten_vad_server")
+        # One handle per connection at most, so acquire never waits
+        self._handles = TenVadHandlePool(max_size=self.max_connections, hop_size=self.hop_size, threshold=self.threshold)
+        if self.unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path=self.unix_path)
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening, drop every connection and free the handles."""
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+        self._handles.close()
+        self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if self.connections >= self.max_connections:
+            writer.write(encode_message(ERROR, b"server busy"))
+            await _close_writer(writer)
+            return
+        self.connections += 1
+        self._tasks.add(task)
+        connection = _Connection(self.hop_size, self.threshold)
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        reading = asyncio.ensure_future(self._read(reader, queue))
+        working = asyncio.ensure_future(self._work(connection, queue, writer))
+        try:
+            await asyncio.wait((reading, working), return_when=asyncio.FIRST_EXCEPTION)
+            if reading.done() and not reading.cancelled():
+                exc = reading.exception()
+                if isinstance(exc, ValueError):
+                    writer.write(encode_message(ERROR, str(exc).encode()))
+        except asyncio.CancelledError:
+            pass  # Server shutdown
+        finally:
+            for part in (reading, working):
+                part.cancel()
+            await asyncio.gather(reading, working, return_exceptions=True)
+            await asyncio.get_running_loop().run_in_executor(self._executor, connection.release, self._handles)
+            await _close_writer(writer)
+            self.connections -= 1
+            self._tasks.discard(task)
+
+    async def _read(self, reader: asyncio.StreamReader, queue: asyncio.Queue) -> None:
+        """Queue messages until the end of the stream or an END message."""
+        while True:
+            try:
+                message = await read_message(reader, self.max_message)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                message = None
+            # Waits while the worker is behind: the socket is not read and TCP pushes back
+            await queue.put(message)
+            if message is None or message[0] == END:
+                return
+
+    async def _work(self, connection: _Connection, queue: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+            kind, payload = message
+            try:
+                if kind == CONFIG:
+                    connection.configure(payload)
+                    continue
+                if kind == AUDIO:
+                    if connection.stream is None:
+                        await loop.run_in_executor(self._executor, connection.start, self._handles)
+                    reply = await loop.run_in_executor(self._executor, connection.feed, payload)
+                elif kind == RESET:
+                    await loop.run_in_executor(self._executor, connection.reset)
+                    continue
+                elif kind == END:
+                    writer.write(connection.end())
+                    await writer.drain()
+                    return
+                else:
+                    raise ValueError(f"[TEN VAD]: unknown message type {kind:#x}")
+            except (ValueError, TypeError, RuntimeError, TimeoutError) as exc:
+                writer.write(encode_message(ERROR, str(exc).encode()))
+                await writer.drain()
+                raise
+            if reply:
+                writer.write(reply)
+                # Waits while the client is not reading its results
+                await writer.drain()
+
+
+async def _close_writer(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (ConnectionError, OSError):
+        pass
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ten_vad.server", description="Run the streaming TEN VAD server.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default 8765)")
+    parser.add_argument("--unix", default=None, help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="Inference threads (default: CPU count)")
+    parser.add_argument("--max-connections", type=int, default=256, help="Concurrent connections")
+    parser.add_argument("--queue-size", type=int, default=4, help="Messages buffered per connection")
+    parser.add_argument("--hop-size", type=int, default=256, help="Default hop size")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Default threshold")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    server = VadServer(
+        args.host, args.port, args.unix, args.max_connections, args.workers, args.queue_size,
+        hop_size=args.hop_size, threshold=args.threshold,
+    )
+
+    async def run() -> None:
+        await server.start()
+        logger.info("[TEN VAD]: Serving on %s", server.address)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,591 @@
+"""Local VAD service for co-located processes.
+
+One daemon process owns the library and a ``TenVadPool``; client processes
+attach over a Unix domain socket. Audio and results never pass through the
+socket: each client session gets a POSIX shared-memory segment that holds
+an input ring of audio frames and output rings of probabilities and flags,
+and the socket only carries small control messages.
+
+Control protocol: newline-delimited JSON objects, one request and one reply
+at a time per connection. Every reply has ``"ok"``; failed requests carry
+``"error"`` instead of the fields below.
+
+* ``{"op": "open", "hop_size": 256, "threshold": 0.5, "capacity": 1024}``
+  (``hop_size`` at most ``MAX_HOP_SIZE``, ``capacity`` at most the
+  service's ``max_capacity``) starts the session of the connection and
+  replies with the segment ``"name"`` and its ``"layout"`` (byte offsets,
+  see ``RingLayout.describe``).
+* ``{"op": "process"}`` processes every frame published by the client and
+  replies with ``"done"``, the new count of processed frames.
+* ``{"op": "reset"}`` resets the model state; frame counters continue.
+* ``{"op": "close"}`` ends the session and removes its segment.
+
+Segment layout, all little-endian: a 64 byte header (``HEADER_DTYPE``),
+then ``capacity`` frames of ``hop_size`` int16 samples, then ``capacity``
+float32 probabilities, then ``capacity`` int32 flags, each ring starting
+on a 64 byte boundary. Frame ``n`` lives in slot ``n % capacity`` of every
+ring. The header holds three frame counters that only grow:
+
+* ``written``: frames the client has stored, set by the client;
+* ``done``: frames the service has processed, set by the service;
+* ``consumed``: results the client has read, set by the client.
+
+The client may store frame ``n`` only while ``n - consumed < capacity``.
+The service keeps its own copy of ``done`` and rejects a ``process``
+request unless ``consumed <= done <= written <= consumed + capacity``.
+The counters are published to the other side by the ``process`` request
+and its reply, so no process needs to poll or rely on memory ordering.
+
+``VadServiceClient`` implements the client side in Python; the protocol
+is simple enough to implement in any language with shared memory and Unix
+sockets. Requires Python 3.8 or later and a POSIX system.
+
+Usage:
+    python -m ten_vad.service --socket /run/ten_vad.sock [--workers N] [--cpus 2,3]
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from multiprocessing import shared_memory
+from typing import Iterable, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from .pool import TenVadPool
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x44415654  # "TVAD"
+LAYOUT_VERSION = 1
+DEFAULT_CAPACITY = 1024  # Frames per ring, about 16 s at hop size 256
+MAX_MESSAGE = 4096  # Longest control message in bytes
+MAX_HOP_SIZE = 1024  # Largest frame a client may request; the model is tuned for 160 and 256
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "<u4"),
+        ("version", "<u4"),
+        ("hop_size", "<u4"),
+        ("capacity", "<u4"),
+        ("written", "<u8"),
+        ("done", "<u8"),
+        ("consumed", "<u8"),
+        ("reserved", "V24"),
+    ]
+)
+assert HEADER_DTYPE.itemsize == 64
+
+_ALIGN = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class RingLayout(NamedTuple):
+    """Byte layout of a session segment."""
+
+    hop_size: int
+    capacity: int
+
+    @property
+    def audio_offset(self) -> int:
+        return HEADER_DTYPE.itemsize
+
+    @property
+    def probability_offset(self) -> int:
+        return _align(self.audio_offset + self.capacity * self.hop_size * 2)
+
+    @property
+    def flag_offset(self) -> int:
+        return _align(self.probability_offset + self.capacity * 4)
+
+    @property
+    def size(self) -> int:
+        return _align(self.flag_offset + self.capacity * 4)
+
+    def describe(self) -> dict:
+        """Layout as sent to clients in the ``open`` reply."""
+        return {
+            "hop_size": self.hop_size,
+            "capacity": self.capacity,
+            "audio_offset": self.audio_offset,
+            "probability_offset": self.probability_offset,
+            "flag_offset": self.flag_offset,
+            "size": self.size,
+        }
+
+    def views(self, buffer) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Map a segment buffer to its header record, flat audio ring, probability ring and flag ring."""
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=buffer)
+        audio = np.ndarray((self.capacity * self.hop_size,), dtype="<i2", buffer=buffer, offset=self.audio_offset)
+        probabilities = np.ndarray((self.capacity,), dtype="<f4", buffer=buffer, offset=self.probability_offset)
+        flags = np.ndarray((self.capacity,), dtype="<i4", buffer=buffer, offset=self.flag_offset)
+        return header, audio, probabilities, flags
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without handing it to this process's resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 always tracks and would unlink the segment at exit
+        from multiprocessing import resource_tracker
+
+        segment = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+class _Session:
+    """Service side of one client connection: its segment and pool stream."""
+
+    _ids = itertools.count()
+
+    def __init__(self, pool: TenVadPool, hop_size: int, threshold: float, capacity: int):
+        if capacity <= 0:
+            raise ValueError("[TEN VAD]: capacity must be positive")
+        self.pool = pool
+        self.stream_id = ("service", next(self._ids))
+        self.vad = pool.add_stream(self.stream_id, hop_size, threshold)
+        self.layout = RingLayout(hop_size, capacity)
+        try:
+            self.segment = shared_memory.SharedMemory(
+                name=f"ten_vad_{os.getpid()}_{self.stream_id[1]}", create=True, size=self.layout.size
+            )
+        except BaseException:
+            pool.remove_stream(self.stream_id)
+            raise
+        self.header, self.audio, self.probabilities, self.flags = self.layout.views(self.segment.buf)
+        self.header["magic"] = MAGIC
+        self.header["version"] = LAYOUT_VERSION
+        self.header["hop_size"] = hop_size
+        self.header["capacity"] = capacity
+        self.done = 0  # Kept here: the client can write every counter in the header
+
+    def process(self) -> int:
+        """Process the frames between ``done`` and ``written`` and publish the new ``done``."""
+        header = self.header
+        hop_size, capacity = self.layout
+        written, consumed, done = int(header["written"]), int(header["consumed"]), self.done
+        if not consumed <= done <= written <= consumed + capacity:
+            raise ValueError("[TEN VAD]: ring counters are inconsistent; the client overran the ring")
+        futures = []
+        while done < written:
+            # At most two contiguous runs: up to the end of the ring, then from its start
+            slot = done % capacity
+            count = min(written - done, capacity - slot)
+            futures.append(
+                self.pool.submit(
+                    self.stream_id,
+                    self.audio[slot * hop_size:(slot + count) * hop_size],
+                    out=(self.probabilities[slot:slot + count], self.flags[slot:slot + count]),
+                )
+            )
+            done += count
+        for future in futures:
+            future.result()
+        self.done = written
+        header["done"] = written
+        return written
+
+    def close(self) -> None:
+        self.pool.remove_stream(self.stream_id)
+        # Views must be released before the segment can be closed
+        self.header = self.audio = self.probabilities = self.flags = None
+        try:
+            self.segment.close()
+        except BufferError:  # Still mapped by a request in flight; released with it
+            logger.warning("[TEN VAD]: Closing a session that is still processing")
+        self.segment.unlink()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        service: VadService = self.server.service
+        session: Optional[_Session] = None
+        try:
+            while True:
+                line = self.rfile.readline(MAX_MESSAGE)
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                    op = request.get("op")
+                    if op == "open":
+                        if session is not None:
+                            raise ValueError("[TEN VAD]: session is already open")
+                        session = service._open(request)
+                        reply = {"ok": True, "name": session.segment.name, "layout": session.layout.describe()}
+                    elif session is None:
+                        raise ValueError("[TEN VAD]: no open session")
+                    elif op == "process":
+                        reply = {"ok": True, "done": session.process()}
+                    elif op == "reset":
+                        session.vad.reset()
+                        reply = {"ok": True}
+                    elif op == "close":
+                        service._close(session)
+                        session = None
+                        reply = {"ok": True}
+                    else:
+                        raise ValueError(f"[TEN VAD]: unknown op {op!r}")
+                except (ValueError, TypeError, AttributeError, RuntimeError, OSError) as exc:
+                    reply = {"ok": False, "error": str(exc)}
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+        except (ConnectionError, OSError):
+            pass  # The client went away
+        finally:
+            if session is not None:
+                service._close(session)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class VadService:
+    """Serve VAD to other processes over a Unix socket and shared memory.
+
+    Each connection owns one session: a pool stream with its own handle and
+    a shared-memory segment. Connections are served by one thread each,
+    which only parses control messages and waits; inference runs on the
+    pool's ``max_workers`` threads.
+
+    Example:
+        with VadService("/tmp/ten_vad.sock") as service:
+            service.start()
+            ...
+
+    Args:
+        socket_path (str): Path of the Unix domain socket to listen on.
+        max_workers (int, optional): Inference threads. Defaults to the CPU count.
+        max_sessions (int, optional): Concurrent sessions. Defaults to 1024.
+        max_capacity (int, optional): Largest ring a client may request, in
+            frames. Defaults to 65536.
+        cpus (Iterable[int], optional): CPUs to pin the service process to (Linux).
+
+    Raises:
+        OSError: If the socket path is in use by a running service.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        max_workers: Optional[int] = None,
+        max_sessions: int = 1024,
+        max_capacity: int = 65536,
+        cpus: Optional[Iterable[int]] = None,
+    ):
+        if cpus is not None:
+            cpus = set(cpus)
+            if not hasattr(os, "sched_setaffinity"):
+                raise OSError("[TEN VAD]: CPU pinning is not supported on this platform")
+            os.sched_setaffinity(0, cpus)
+            if max_workers is None:
+                max_workers = len(cpus)
+        self.socket_path = socket_path
+        self.max_sessions = max_sessions
+        self.max_capacity = max_capacity
+        self.pool = TenVadPool(max_workers=max_workers)
+        self._sessions: Set[_Session] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        _remove_stale_socket(socket_path)
+        self._server = _Server(socket_path, _Handler)
+        self._server.service = self
+
+    def __enter__(self) -> "VadService":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def sessions(self) -> int:
+        """Number of open sessions."""
+        return len(self._sessions)
+
+    def serve_forever(self) -> None:
+        """Accept clients until ``close`` is called from another thread."""
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """Accept clients on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="ten_vad_service", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop accepting clients, end every session and remove the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            self._close(session)
+        self.pool.close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _open(self, request: dict) -> _Session:
+        capacity = int(request.get("capacity", DEFAULT_CAPACITY))
+        if capacity > self.max_capacity:
+            raise ValueError(f"[TEN VAD]: capacity must not exceed {self.max_capacity} frames")
+        hop_size = int(request.get("hop_size", 256))
+        if not 0 < hop_size <= MAX_HOP_SIZE:
+            raise ValueError(f"[TEN VAD]: hop_size must be between 1 and {MAX_HOP_SIZE}")
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                raise RuntimeError("[TEN VAD]: too many sessions")
+            session = _Session(self.pool, hop_size, float(request.get("threshold", 0.5)), capacity)
+            self._sessions.add(session)
+        return session
+
+    def _close(self, session: _Session) -> None:
+        with self._lock:
+            if session not in self._sessions:
+                return
+            self._sessions.discard(session)
+        session.close()
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left behind by a service that is no longer running."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        raise OSError(f"[TEN VAD]: a service is already listening on {path}")
+    finally:
+        probe.close()
+
+
+class VadServiceClient:
+    """Python client of a ``VadService``: one session over one connection.
+
+    Audio is written straight into the shared input ring and results are
+    read straight from the output rings. ``process`` does it all in one
+    call; ``reserve``/``commit``, ``flush`` and ``read`` expose the steps,
+    so a producer can fill the ring in place without an intermediate copy.
+
+    Example:
+        with VadServiceClient("/tmp/ten_vad.sock", hop_size=256) as client:
+            probabilities, flags = client.process(audio)
+
+    Args:
+        socket_path (str): Path of the service socket.
+        hop_size (int, optional): Frame size. Defaults to 256.
+        threshold (float, optional): Speech threshold. Defaults to 0.5.
+        capacity (int, optional): Ring size in frames. Defaults to 1024.
+        timeout (float, optional): Socket timeout in seconds. Defaults to none.
+
+    Raises:
+        OSError: If the service cannot be reached.
+        RuntimeError: If the service rejects the session.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        hop_size: int = 256,
+        threshold: float = 0.5,
+        capacity: int = DEFAULT_CAPACITY,
+        timeout: Optional[float] = None,
+    ):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        try:
+            self._socket.connect(socket_path)
+            self._reader = self._socket.makefile("rb")
+            reply = self._call(op="open", hop_size=hop_size, threshold=threshold, capacity=capacity)
+            self._segment = _attach(reply["name"])
+        except BaseException:
+            self._socket.close()
+            raise
+        self.layout = RingLayout(reply["layout"]["hop_size"], reply["layout"]["capacity"])
+        self._header, self._audio, self._probabilities, self._flags = self.layout.views(self._segment.buf)
+        self._frames = self._audio.reshape(self.layout.capacity, self.layout.hop_size)
+        self.hop_size = self.layout.hop_size
+        self.capacity = self.layout.capacity
+
+    def __enter__(self) -> "VadServiceClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def free(self) -> int:
+        """Frames that can be written before results must be read."""
+        return self.capacity - (int(self._header["written"]) - int(self._header["consumed"]))
+
+    @property
+    def available(self) -> int:
+        """Processed frames whose results have not been read."""
+        return int(self._header["done"]) - int(self._header["consumed"])
+
+    def reserve(self, max_frames: Optional[int] = None) -> np.ndarray:
+        """Return writable ring slots for the next frames, without copying.
+
+        The view covers up to ``max_frames`` free slots that are contiguous in
+        the ring (it may be shorter at the wrap point). Fill it, then publish
+        the frames with ``commit``.
+
+        Returns:
+            np.ndarray: int16 view of shape (frames, hop_size), possibly empty.
+        """
+        written = int(self._header["written"])
+        slot = written % self.capacity
+        count = min(self.free, self.capacity - slot)
+        if max_frames is not None:
+            count = min(count, max_frames)
+        return self._frames[slot:slot + count]
+
+    def commit(self, frames: int) -> None:
+        """Publish ``frames`` frames filled through ``reserve``."""
+        if not 0 <= frames <= self.free:
+            raise ValueError("[TEN VAD]: cannot commit more frames than are free")
+        self._header["written"] = int(self._header["written"]) + frames
+
+    def write(self, audio: np.ndarray) -> int:
+        """Copy as many whole frames of ``audio`` into the ring as fit.
+
+        Args:
+            audio (np.ndarray): 1-D int16 audio.
+
+        Returns:
+            int: Frames written.
+        """
+        audio = np.asarray(audio)
+        if audio.dtype != np.int16:
+            raise TypeError("[TEN VAD]: audio data type must be int16")
+        frames = audio.reshape(-1)[: audio.size // self.hop_size * self.hop_size].reshape(-1, self.hop_size)
+        written = 0
+        while written < len(frames):
+            slots = self.reserve(len(frames) - written)
+            if not len(slots):
+                break
+            slots[:] = frames[written:written + len(slots)]
+            self.commit(len(slots))
+            written += len(slots)
+        return written
+
+    def flush(self) -> int:
+        """Have the service process every written frame.
+
+        Returns:
+            int: Total frames processed in this session.
+        """
+        return self._call(op="process")["done"]
+
+    def read(self, max_frames: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy out the results of processed frames and free their slots.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float32 probabilities and uint8 flags.
+        """
+        consumed = int(self._header["consumed"])
+        count = self.available if max_frames is None else min(self.available, max_frames)
+        slots = (np.arange(consumed, consumed + count) % self.capacity) if count else np.empty(0, dtype=np.int64)
+        probabilities = self._probabilities[slots]
+        flags = self._flags[slots].astype(np.uint8)
+        self._header["consumed"] = consumed + count
+        return probabilities, flags
+
+    def process(self, audio: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Run a whole buffer through the service, like ``TenVad.process_array``.
+
+        Trailing samples that do not fill a whole frame are ignored.
+
+        Args:
+            audio (np.ndarray): 1-D int16 audio of any length.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float32 probabilities and uint8 flags.
+        """
+        audio = np.asarray(audio).reshape(-1)
+        num_frames = audio.size // self.hop_size
+        probabilities = np.empty(num_frames, dtype=np.float32)
+        flags = np.empty(num_frames, dtype=np.uint8)
+        sent = received = 0
+        while received < num_frames:
+            sent += self.write(audio[sent * self.hop_size:num_frames * self.hop_size])
+            self.flush()
+            chunk_probabilities, chunk_flags = self.read()
+            probabilities[received:received + len(chunk_probabilities)] = chunk_probabilities
+            flags[received:received + len(chunk_flags)] = chunk_flags
+            received += len(chunk_probabilities)
+        return probabilities, flags
+
+    def reset(self) -> None:
+        """Reset the model state of the session."""
+        self._call(op="reset")
+
+    def close(self) -> None:
+        """End the session and detach from its segment."""
+        if self._segment is None:
+            return
+        try:
+            self._call(op="close")
+        except (OSError, RuntimeError):
+            pass
+        self._header = self._audio = self._probabilities = self._flags = self._frames = None
+        self._segment.close()
+        self._segment = None
+        self._reader.close()
+        self._socket.close()
+
+    def _call(self, **request) -> dict:
+        self._socket.sendall(json.dumps(request).encode() + b"\n")
+        line = self._reader.readline(MAX_MESSAGE)
+        if not line:
+            raise ConnectionError("[TEN VAD]: service closed the connection")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(f"[TEN VAD]: service error: {reply.get('error')}")
+        return reply
+
+
+def _parse_cpus(text: str) -> Set[int]:
+    cpus: Set[int] = set()
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ten_vad.service", description="Run the shared-memory TEN VAD service.")
+    parser.add_argument("--socket", required=True, help="Unix domain socket path")
+    parser.add_argument("--workers", type=int, default=None, help="Inference threads (default: CPU count)")
+    parser.add_argument("--cpus", type=_parse_cpus, default=None, help="Pin to these CPUs, e.g. 2,3 or 4-7 (Linux)")
+    parser.add_argument("--max-sessions", type=int, default=1024, help="Concurrent sessions")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    with VadService(args.socket, args.workers, args.max_sessions, cpus=args.cpus) as service:
+        logger.info("[TEN VAD]: Serving on %s", args.socket)
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Compact binary store for frame-level VAD results.
+
+A ``.tvr`` file holds the results of one recording in about 1.1 bytes per
+frame (uint8 probabilities) or 2.1 bytes per frame (float16), against
+roughly 20 bytes for text lines, and answers time-range queries without
+decoding every frame. ``ResultWriter`` appends results as they are
+produced; ``ResultStore`` memory-maps a finished file.
+
+Layout, little-endian, every section aligned to 8 bytes:
+
+1. Header (``HEADER``, 128 bytes): magic, version, probability format,
+   hop size, sample rate, threshold, frame and interval counts, summary
+   block size and the offset of every section.
+2. Probabilities, one per frame: uint8 ``round(p * 255)`` or float16.
+3. Flags, bit-packed eight frames per byte (``np.packbits`` order).
+4. Speech intervals: ``(start, end)`` uint64 frame pairs, end exclusive,
+   one per run of consecutive speech flags, in order.
+5. Summary index: the running count of speech frames at every multiple of
+   the block size (uint64, ``num_blocks + 1`` entries). Any window's
+   speech count is the difference of two entries plus at most two partial
+   blocks read from the flags, and per-bucket counts at any coarser
+   resolution are differences at the bucket edges, so one level serves
+   every zoom level.
+
+Speech ratios and interval lookups therefore cost O(block size) and
+O(log n) respectively, independent of the recording length.
+
+Example:
+    with ResultWriter("call.tvr", hop_size=256) as writer:
+        for chunk in chunks:
+            writer.append(*vad.process_array(chunk))
+    with ResultStore("call.tvr") as store:
+        print(store.speech_ratio(60.0, 120.0), store.speech_intervals(0, 3600))
+"""
+import mmap
+import os
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"TVADRES\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHBBIIfQQIIQQQQ")
+HEADER_SIZE = 128
+assert HEADER.size <= HEADER_SIZE
+
+PROBABILITY_FORMATS = {"uint8": 0, "float16": 1}
+_FORMAT_DTYPES = {0: np.dtype(np.uint8), 1: np.dtype("<f2")}
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+class ResultWriter:
+    """Append frame results to a ``.tvr`` file.
+
+    Probabilities are streamed to disk as they arrive; flags, intervals and
+    the summary index (about 1/8 byte per frame) are kept in memory and
+    written by ``close``. The file appears under its final name only once
+    it is complete.
+
+    Args:
+        path (str): Output file.
+        hop_size (int, optional): Samples per frame. Defaults to 256.
+        sample_rate (int, optional): Sample rate of the audio. Defaults to 16000.
+        threshold (float, optional): Threshold the flags were produced with. Defaults to 0.5.
+        probability_format (str, optional): "uint8" (steps of 1/255) or "float16".
+            Defaults to "uint8".
+        block_frames (int, optional): Frames per summary block, a multiple of 8.
+            Defaults to 256.
+
+    Raises:
+        ValueError: If probability_format or block_frames is invalid.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        hop_size: int = 256,
+        sample_rate: int = 16000,
+        threshold: float = 0.5,
+        probability_format: str = "uint8",
+        block_frames: int = 256,
+    ):
+        if probability_format not in PROBABILITY_FORMATS:
+            raise ValueError(f"[TEN VAD]: probability_format must be one of {sorted(PROBABILITY_FORMATS)}")
+        if block_frames <= 0 or block_frames % 8:
+            raise ValueError("[TEN VAD]: block_frames must be a positive multiple of 8")
+        self.path = path
+        self.hop_size = hop_size
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.block_frames = block_frames
+        self._format = PROBABILITY_FORMATS[probability_format]
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(b"\0" * HEADER_SIZE)
+        self.num_frames = 0
+        self._flag_bytes: List[bytes] = []
+        self._pending_flags = np.zeros(0, dtype=bool)  # Fewer than 8 flags not yet packed
+        self._intervals: List[np.ndarray] = []
+        self._open_start: Optional[int] = None  # Start of a speech run still open at the last append
+        self._block_counts: List[np.ndarray] = []
+        self._block_speech = 0  # Speech frames in the current, incomplete block
+        self._block_fill = 0
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, probabilities: np.ndarray, flags: np.ndarray) -> None:
+        """Add the results of consecutive frames.
+
+        Args:
+            probabilities (np.ndarray): Speech probabilities in [0, 1].
+            flags (np.ndarray): Detection flags, nonzero for speech.
+
+        Raises:
+            ValueError: If the arrays differ in length.
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float32).reshape(-1)
+        speech = np.asarray(flags).reshape(-1) != 0
+        if len(probabilities) != len(speech):
+            raise ValueError("[TEN VAD]: probabilities and flags must have the same length")
+        if not len(speech):
+            return
+        if self._format == 0:
+            encoded = np.rint(np.clip(probabilities, 0.0, 1.0) * 255.0).astype(np.uint8)
+        else:
+            encoded = probabilities.astype("<f2")
+        self._file.write(encoded.tobytes())
+
+        bits = np.concatenate((self._pending_flags, speech))
+        whole = len(bits) // 8 * 8
+        self._flag_bytes.append(np.packbits(bits[:whole]).tobytes())
+        self._pending_flags = bits[whole:]
+
+        self._add_intervals(speech)
+        self._add_blocks(speech)
+        self.num_frames += len(speech)
+
+    def close(self) -> None:
+        """Write flags, intervals and index, then move the file into place."""
+        if self._file is None:
+            return
+        f = self._file
+        if self._open_start is not None:
+            self._intervals.append(np.array([[self._open_start, self.num_frames]], dtype=np.uint64))
+        flags = b"".join(self._flag_bytes) + np.packbits(self._pending_flags).tobytes()
+        intervals = np.concatenate(self._intervals) if self._intervals else np.zeros((0, 2), dtype=np.uint64)
+        blocks = list(self._block_counts)
+        if self._block_fill:
+            blocks.append(np.array([self._block_speech]))
+        index = np.concatenate(([0], np.cumsum(np.concatenate(blocks)) if blocks else [])).astype("<u8")
+
+        probabilities_offset = HEADER_SIZE
+        flags_offset = _align(probabilities_offset + self.num_frames * _FORMAT_DTYPES[self._format].itemsize)
+        intervals_offset = _align(flags_offset + len(flags))
+        index_offset = _align(intervals_offset + intervals.nbytes)
+        for offset, data in ((flags_offset, flags), (intervals_offset, intervals.astype("<u8").tobytes()), (index_offset, index.tobytes())):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+        f.seek(0)
+        f.write(
+            HEADER.pack(
+                MAGIC, VERSION, self._format, 0, self.hop_size, self.sample_rate, self.threshold,
+                self.num_frames, len(intervals), self.block_frames, len(index),
+                probabilities_offset, flags_offset, intervals_offset, index_offset,
+            )
+        )
+        f.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self._tmp_path)
+
+    def _add_intervals(self, speech: np.ndarray) -> None:
+        base = self.num_frames
+        edges = np.diff(np.concatenate(([self._open_start is not None], speech, [False])).astype(np.int8))
+        starts = np.flatnonzero(edges == 1) + base
+        ends = np.flatnonzero(edges == -1) + base
+        if self._open_start is not None:
+            starts = np.concatenate(([self._open_start], starts))
+        if speech[-1]:
+            # The last run may continue in the next append
+            self._open_start = int(starts[-1])
+            starts = starts[:-1]
+        else:
+            self._open_start = None
+        ends = ends[: len(starts)]
+        if len(starts):
+            self._intervals.append(np.stack((starts, ends), axis=1).astype(np.uint64))
+
+    def _add_blocks(self, speech: np.ndarray) -> None:
+        block_frames = self.block_frames
+        head = min(block_frames - self._block_fill, len(speech))
+        self._block_speech += int(np.count_nonzero(speech[:head]))
+        self._block_fill += head
+        if self._block_fill < block_frames:
+            return
+        counts = [np.array([self._block_speech])]
+        rest = speech[head:]
+        whole = len(rest) // block_frames * block_frames
+        counts.append(np.count_nonzero(rest[:whole].reshape(-1, block_frames), axis=1))
+        self._block_counts.append(np.concatenate(counts))
+        self._block_speech = int(np.count_nonzero(rest[whole:]))
+        self._block_fill = len(rest) - whole
+
+
+class ResultStore:
+    """Memory-mapped reader of a ``.tvr`` file.
+
+    Times are in seconds and frame ranges are half-open. Nothing is decoded
+    up front; each query reads only the sections it needs.
+
+    Args:
+        path (str): File written by ``ResultWriter``.
+
+    Raises:
+        ValueError: If the file is not a supported ``.tvr`` file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"[TEN VAD]: {path} is not a TEN VAD result file")
+        (magic, version, fmt, _, self.hop_size, self.sample_rate, threshold, self.num_frames, num_intervals,
+         self.block_frames, index_size, probabilities_offset, flags_offset, intervals_offset, index_offset) = fields
+        if magic != MAGIC or version != VERSION or fmt not in _FORMAT_DTYPES:
+            self._mmap.close()
+            raise ValueError(f"[TEN VAD]: {path} is not a supported TEN VAD result file")
+        self.threshold = float(threshold)
+        buffer = self._mmap
+        self._probabilities = np.frombuffer(buffer, dtype=_FORMAT_DTYPES[fmt], count=self.num_frames, offset=probabilities_offset)
+        self._format = fmt
+        self._flags = np.frombuffer(buffer, dtype=np.uint8, count=(self.num_frames + 7) // 8, offset=flags_offset)
+        self.intervals = np.frombuffer(buffer, dtype="<u8", count=2 * num_intervals, offset=intervals_offset).reshape(-1, 2)
+        self._index = np.frombuffer(buffer, dtype="<u8", count=index_size, offset=index_offset)
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    @property
+    def frame_duration(self) -> float:
+        return self.hop_size / self.sample_rate
+
+    @property
+    def duration(self) -> float:
+        return self.num_frames * self.frame_duration
+
+    def frame_at(self, seconds: float) -> int:
+        """Index of the frame containing a time, clipped to ``[0, num_frames]``."""
+        return int(min(max(int(seconds / self.frame_duration), 0), self.num_frames))
+
+    def probabilities(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Decoded float32 probabilities of frames ``[start, end)``."""
+        encoded = self._probabilities[start:end]
+        if self._format == 0:
+            return encoded.astype(np.float32) / np.float32(255.0)
+        return encoded.astype(np.float32)
+
+    def flags(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """uint8 flags of frames ``[start, end)``."""
+        start, end, _ = slice(start, end).indices(self.num_frames)
+        if end <= start:
+            return np.zeros(0, dtype=np.uint8)
+        bits = np.unpackbits(self._flags[start // 8:(end + 7) // 8])
+        return bits[start % 8:start % 8 + end - start]
+
+    def speech_frames(self, start: int, end: int) -> int:
+        """Number of speech frames in ``[start, end)``, from the index plus at most two partial blocks."""
+        start, end = max(start, 0), min(end, self.num_frames)
+        if end <= start:
+            return 0
+        block = self.block_frames
+        first, last = -(-start // block), end // block  # Whole blocks [first, last)
+        if first >= last:
+            return int(np.count_nonzero(self.flags(start, end)))
+        return (
+            int(self._index[last] - self._index[first])
+            + int(np.count_nonzero(self.flags(start, first * block)))
+            + int(np.count_nonzero(self.flags(last * block, end)))
+        )
+
+    def speech_ratio(self, start_seconds: float = 0.0, end_seconds: Optional[float] = None) -> float:
+        """Share of speech frames between two times; 0 for an empty range."""
+        start = self.frame_at(start_seconds)
+        end = self.num_frames if end_seconds is None else self.frame_at(end_seconds)
+        return self.speech_frames(start, end) / (end - start) if end > start else 0.0
+
+    def speech_timeline(self, bucket_seconds: float, start_seconds: float = 0.0, end_seconds: Optional[float] = None) -> np.ndarray:
+        """Speech ratio per bucket, e.g. per minute of an hour-long recording.
+
+        Bucket edges are rounded to whole summary blocks, so only the index is read.
+
+        Returns:
+            np.ndarray: float64 ratios, one per bucket.
+        """
+        block_seconds = self.block_frames * self.frame_duration
+        end_seconds = self.duration if end_seconds is None else min(end_seconds, self.duration)
+        edges = np.arange(start_seconds, end_seconds + bucket_seconds, bucket_seconds)
+        edges = np.clip(np.round(edges / block_seconds).astype(np.int64), 0, len(self._index) - 1)
+        edges = np.unique(edges)
+        counts = np.diff(self._index[edges].astype(np.int64))
+        frames = np.diff(np.minimum(edges * self.block_frames, self.num_frames))
+        return np.divide(counts, frames, out=np.zeros(len(counts)), where=frames > 0)
+
+    def speech_intervals(self, start_seconds: float = 0.0, end_seconds: Optional[float] = None) -> np.ndarray:
+        """Speech intervals overlapping a time range, clipped to it.
+
+        Returns:
+            np.ndarray: float64 array of shape (n, 2) with start and end times in seconds.
+        """
+        start = self.frame_at(start_seconds)
+        end = self.num_frames if end_seconds is None else self.frame_at(end_seconds)
+        first = int(np.searchsorted(self.intervals[:, 1], start, side="right"))
+        last = int(np.searchsorted(self.intervals[:, 0], end, side="left"))
+        frames = np.clip(self.intervals[first:max(first, last)].astype(np.int64), start, end)
+        return frames * self.frame_duration
+
+    def close(self) -> None:
+        self._probabilities = self._flags = self.intervals = self._index = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Arrays handed out earlier keep the mapping alive until collected
+
+
+def write_results(path: str, probabilities: np.ndarray, flags: np.ndarray, **options) -> None:
+    """Write a whole recording's results; ``options`` are those of ``ResultWriter``."""
+    with ResultWriter(path, **options) as writer:
+        writer.append(probabilities, flags)
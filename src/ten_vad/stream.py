@@ -0,0 +1,108 @@
+from typing import Optional
+
+import numpy as np
+
+from .wrapper import TenVad
+
+# One record per processed frame: sample offset of the frame start in the
+# stream, speech probability and detection flag.
+STREAM_RESULT_DTYPE = np.dtype([("offset", np.int64), ("probability", np.float32), ("flag", np.int32)])
+
+
+class TenVadStream:
+    """Run VAD over audio that arrives in chunks of arbitrary length.
+
+    Complete frames are handed to the library straight from the caller's
+    chunk; only the samples that do not yet fill a frame are copied, into a
+    carry buffer of ``hop_size`` samples that is allocated once. Each call to
+    ``feed`` returns the results of every frame completed by that chunk as a
+    single record array (see ``STREAM_RESULT_DTYPE``).
+
+    Args:
+        vad (TenVad, optional): Handle to run. A new one is created from
+            ``hop_size`` and ``threshold`` if omitted.
+        hop_size (int, optional): Frame size for a new handle. Defaults to 256.
+        threshold (float, optional): Speech threshold for a new handle. Defaults to 0.5.
+
+    Example:
+        stream = TenVadStream(hop_size=256)
+        for packet in packets:  # e.g. 320 samples each
+            for offset, probability, flag in stream.feed(packet):
+                ...
+    """
+
+    def __init__(self, vad: Optional[TenVad] = None, hop_size: int = 256, threshold: float = 0.5):
+        self.vad = vad if vad is not None else TenVad(hop_size, threshold)
+        self.hop_size = self.vad.hop_size
+        self._carry = np.zeros((1, self.hop_size), dtype=np.int16)
+        self._carry_len = 0
+        self._position = 0  # Samples fed so far
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered samples waiting for a complete frame."""
+        return self._carry_len
+
+    @property
+    def position(self) -> int:
+        """Total number of samples fed since creation or the last reset."""
+        return self._position
+
+    def reset(self, reset_model: bool = True) -> None:
+        """Drop buffered samples and restart sample offsets at zero.
+
+        Args:
+            reset_model (bool, optional): Also reset the model state of the handle. Defaults to True.
+        """
+        self._carry_len = 0
+        self._position = 0
+        if reset_model:
+            self.vad.reset()
+
+    def feed(self, chunk: np.ndarray) -> np.ndarray:
+        """Push a chunk of samples and process every frame it completes.
+
+        Args:
+            chunk (np.ndarray): 1-D int16 audio of any length, or a buffer of int16
+                samples or raw PCM bytes (see ``TenVad.process_array``).
+
+        Returns:
+            np.ndarray: Record array with ``offset``, ``probability`` and ``flag``
+            fields, one entry per completed frame (possibly empty).
+
+        Raises:
+            TypeError: If chunk is not an int16 array or buffer.
+            ValueError: If chunk is not one-dimensional.
+            RuntimeError: If VAD processing fails.
+        """
+        samples = self.vad._as_samples(chunk)
+        hop_size = self.hop_size
+        carry_len = self._carry_len
+        num_samples = samples.shape[0]
+        num_frames = (carry_len + num_samples) // hop_size
+        results = np.empty(num_frames, dtype=STREAM_RESULT_DTYPE)
+        frame_start = self._position - carry_len
+        self._position += num_samples
+        if num_frames == 0:
+            self._carry[0, carry_len:carry_len + num_samples] = samples
+            self._carry_len = carry_len + num_samples
+            return results
+
+        results["offset"] = np.arange(frame_start, frame_start + num_frames * hop_size, hop_size)
+        probabilities = results["probability"]
+        flags = results["flag"]
+        consumed = 0
+        if carry_len:
+            consumed = hop_size - carry_len
+            self._carry[0, carry_len:] = samples[:consumed]
+            self.vad._process_frames(self._carry, probabilities[:1], flags[:1])
+        direct = samples[consumed:]
+        num_direct = num_frames - (1 if carry_len else 0)
+        if num_direct:
+            frames = direct[: num_direct * hop_size].reshape(num_direct, hop_size)
+            self.vad._process_frames(frames, probabilities[num_frames - num_direct:], flags[num_frames - num_direct:])
+        remainder = direct.shape[0] - num_direct * hop_size
+        if remainder:
+            self._carry[0, :remainder] = direct[num_direct * hop_size:]
+        self._carry_len = remainder
+        return results
@@ -0,0 +1,423 @@
+"""Speech-only audio: cut silence out of a recording while it is processed.
+
+``SpeechTrimmer`` runs a handle over the audio as it is fed, segments the
+probabilities with a ``SpeechSegmenter`` and writes only the speech
+segments, padding included, to a WAV file or a binary stream. Each
+segment is written with one bulk write per fed chunk straight from the
+input; only the few frames a pending segment could still reach back to
+(``pre_pad_ms`` plus ``min_speech_ms`` and the merge gap) are kept between
+calls, so memory stays flat and there is no second pass over the audio.
+
+The segments kept form an ``OffsetMap``, a ``(start, end)`` pair of source
+samples per segment, which maps timestamps in the trimmed audio (for
+example word times from ASR) back to the original recording and back.
+``OffsetMap.save`` writes it as a small JSON file.
+
+Example:
+    with SpeechTrimmer("speech.wav", pre_pad_ms=100, post_pad_ms=100) as trimmer:
+        for chunk in chunks:
+            trimmer.feed(chunk)
+    trimmer.offset_map.to_source_seconds(word_times)
+
+Usage:
+    python -m ten_vad.trim call.wav speech.wav --map speech.json
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from typing import BinaryIO, List, Optional, Union
+
+import numpy as np
+
+from .segmenter import SpeechEnd, SpeechSegmenter, SpeechStart
+from .wrapper import TenVad
+
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+class OffsetMap:
+    """Source positions of the segments that make up trimmed audio.
+
+    Segment ``i`` covers source samples ``[segments[i, 0], segments[i, 1])``
+    and starts at ``output_starts[i]`` in the trimmed audio.
+
+    Args:
+        segments (np.ndarray): (n, 2) source ``[start, end)`` sample pairs, in order
+            and not overlapping.
+        sample_rate (int, optional): Sample rate of the audio. Defaults to 16000.
+        source_samples (int, optional): Length of the source audio, if known.
+
+    Raises:
+        ValueError: If segments are not ordered, non-overlapping pairs.
+    """
+
+    def __init__(self, segments: np.ndarray, sample_rate: int = 16000, source_samples: Optional[int] = None):
+        segments = np.asarray(segments, dtype=np.int64).reshape(-1, 2)
+        lengths = segments[:, 1] - segments[:, 0]
+        if np.any(lengths < 0) or np.any(segments[1:, 0] < segments[:-1, 1]):
+            raise ValueError("[TEN VAD]: segments must be ordered, non-overlapping [start, end) pairs")
+        self.segments = segments
+        self.sample_rate = sample_rate
+        self.source_samples = source_samples
+        self.output_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)[: len(segments)]
+        self.output_samples = int(lengths.sum())
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @property
+    def kept_ratio(self) -> Optional[float]:
+        """Share of the source audio kept; None when the source length is unknown."""
+        if not self.source_samples:
+            return None
+        return self.output_samples / self.source_samples
+
+    def to_source(self, samples, end: bool = False) -> np.ndarray:
+        """Map sample positions in the trimmed audio to the source.
+
+        Args:
+            samples (array-like): Positions in the trimmed audio.
+            end (bool, optional): Treat positions as exclusive ends, so a position on
+                a cut maps to the end of the segment before it rather than the start
+                of the one after it. Defaults to False.
+
+        Returns:
+            np.ndarray: int64 source positions.
+        """
+        samples = np.asarray(samples, dtype=np.int64)
+        if not len(self.segments):
+            return np.zeros_like(samples)
+        index = np.searchsorted(self.output_starts, samples, side="left" if end else "right") - 1
+        index = np.clip(index, 0, len(self.segments) - 1)
+        return self.segments[index, 0] + samples - self.output_starts[index]
+
+    def to_output(self, samples) -> np.ndarray:
+        """Map source sample positions to the trimmed audio.
+
+        Positions in removed audio map to the cut where it was removed.
+
+        Args:
+            samples (array-like): Positions in the source audio.
+
+        Returns:
+            np.ndarray: int64 positions in the trimmed audio.
+        """
+        samples = np.asarray(samples, dtype=np.int64)
+        if not len(self.segments):
+            return np.zeros_like(samples)
+        index = np.searchsorted(self.segments[:, 0], samples, side="right") - 1
+        inside = np.clip(samples - self.segments[np.maximum(index, 0), 0], 0, None)
+        lengths = self.segments[:, 1] - self.segments[:, 0]
+        offset = np.minimum(inside, lengths[np.maximum(index, 0)])
+        return np.where(index >= 0, self.output_starts[np.maximum(index, 0)] + offset, 0)
+
+    def to_source_seconds(self, seconds, end: bool = False) -> np.ndarray:
+        """``to_source`` on times in seconds."""
+        samples = np.rint(np.asarray(seconds, dtype=np.float64) * self.sample_rate).astype(np.int64)
+        return self.to_source(samples, end) / self.sample_rate
+
+    def to_output_seconds(self, seconds) -> np.ndarray:
+        """``to_output`` on times in seconds."""
+        samples = np.rint(np.asarray(seconds, dtype=np.float64) * self.sample_rate).astype(np.int64)
+        return self.to_output(samples) / self.sample_rate
+
+    def save(self, path: str) -> None:
+        """Write the map as JSON: sample rate, source length and segment pairs."""
+        with open(path, "w") as f:
+            json.dump(
+                {"sample_rate": self.sample_rate, "source_samples": self.source_samples, "segments": self.segments.tolist()}, f
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "OffsetMap":
+        """Read a map written by ``save``."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(np.array(data["segments"], dtype=np.int64).reshape(-1, 2), data["sample_rate"], data.get("source_samples"))
+
+
+class SpeechTrimmer:
+    """Write only the speech of an audio stream, as it is processed.
+
+    Segmentation follows ``SpeechSegmenter``; ``min_silence_ms`` is the gap
+    below which neighbouring segments are merged, and the padding is added
+    around each segment (clipped so segments never overlap). A path output
+    is written as a 16-bit mono WAV file that appears under its final name
+    on ``close``; a file object receives raw little-endian PCM.
+
+    Args:
+        output (str or BinaryIO): WAV file path, or a writable binary stream.
+        hop_size (int, optional): Samples per frame. Defaults to 256.
+        onset_threshold (float, optional): Probability that starts speech. Defaults to 0.5.
+        offset_threshold (float, optional): Probability below which speech stops.
+            Defaults to ``onset_threshold - 0.15``.
+        min_speech_ms (float, optional): Shortest segment kept. Defaults to 100.
+        min_silence_ms (float, optional): Shortest gap that is cut, after hangover. Defaults to 100.
+        hangover_ms (float, optional): Speech held after the last voiced frame. Defaults to 64.
+        pre_pad_ms (float, optional): Audio kept before each segment. Defaults to 100.
+        post_pad_ms (float, optional): Audio kept after each segment. Defaults to 100.
+        sample_rate (int, optional): Sample rate of the audio; the model only runs
+            at 16000, so resample other rates first (``AudioFrontend``). Defaults to 16000.
+        vad (TenVad, optional): Handle to run; its hop_size is used. A new handle
+            is created (and closed with the trimmer) by default.
+
+    Raises:
+        ValueError: If sample_rate is not 16000, or thresholds or durations are invalid.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, BinaryIO],
+        hop_size: int = 256,
+        onset_threshold: float = 0.5,
+        offset_threshold: Optional[float] = None,
+        min_speech_ms: float = 100.0,
+        min_silence_ms: float = 100.0,
+        hangover_ms: float = 64.0,
+        pre_pad_ms: float = 100.0,
+        post_pad_ms: float = 100.0,
+        sample_rate: int = 16000,
+        vad: Optional[TenVad] = None,
+    ):
+        if sample_rate != 16000:
+            raise ValueError("[TEN VAD]: sample_rate must be 16000; resample the audio first")
+        if vad is not None:
+            hop_size = vad.hop_size
+        self._segmenter = SpeechSegmenter(
+            hop_size, onset_threshold, offset_threshold, min_speech_ms, min_silence_ms, hangover_ms, pre_pad_ms, post_pad_ms, sample_rate
+        )
+        self.hop_size = hop_size
+        self.sample_rate = sample_rate
+        self._owns_vad = vad is None
+        self._vad = TenVad(hop_size) if vad is None else vad
+        if isinstance(output, (str, os.PathLike)):
+            self.path: Optional[str] = os.fspath(output)
+            self._tmp_path = self.path + ".tmp"
+            self._file = open(self._tmp_path, "wb")
+            self._file.write(b"\0" * _WAV_HEADER.size)
+        else:
+            self.path = None
+            self._file = output
+        self._buffer = np.zeros(0, dtype=np.int16)  # Source samples from _buffer_start on
+        self._buffer_start = 0
+        self._processed = 0  # Samples covered by processed frames
+        self._pending: List[List[Optional[int]]] = []  # [start, end or None] not fully written yet
+        self._written = 0  # Source position written up to within the first pending segment
+        self._segments: List[List[int]] = []
+        self.output_samples = 0
+        self._offset_map: Optional[OffsetMap] = None
+
+    def __enter__(self) -> "SpeechTrimmer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def source_samples(self) -> int:
+        """Samples fed so far."""
+        return self._buffer_start + len(self._buffer)
+
+    @property
+    def offset_map(self) -> OffsetMap:
+        """Segments written so far; complete once the trimmer is closed."""
+        if self._offset_map is not None:
+            return self._offset_map
+        return OffsetMap(np.array(self._segments, dtype=np.int64).reshape(-1, 2), self.sample_rate, self.source_samples)
+
+    def feed(self, audio) -> int:
+        """Process the next chunk of audio and write the speech it completes.
+
+        Args:
+            audio: 1-D int16 NumPy array or buffer of raw int16 PCM, any length.
+
+        Returns:
+            int: Samples written to the output by this call.
+
+        Raises:
+            TypeError: If audio is not int16.
+            ValueError: If the trimmer is closed.
+            RuntimeError: If VAD processing fails.
+        """
+        if self._file is None:
+            raise ValueError("[TEN VAD]: trimmer is closed")
+        samples = TenVad._as_samples(audio)
+        self._buffer = np.concatenate((self._buffer, samples))  # Callers may reuse their arrays
+        hop = self.hop_size
+        unprocessed = self._buffer[self._processed - self._buffer_start:]
+        num_frames = len(unprocessed) // hop
+        before = self.output_samples
+        if num_frames:
+            probabilities = np.empty(num_frames, dtype=np.float32)
+            frames = np.ascontiguousarray(unprocessed[: num_frames * hop]).reshape(num_frames, hop)
+            self._vad._process_frames(frames, probabilities, np.empty(num_frames, dtype=np.int32))
+            self._processed += num_frames * hop
+            self._handle(self._segmenter.push(probabilities))
+        self._drain()
+        self._discard()
+        return self.output_samples - before
+
+    def flush(self) -> int:
+        """Write the rest of the speech at the end of the input.
+
+        Trailing samples that do not fill a frame are not processed.
+
+        Returns:
+            int: Samples written to the output by this call.
+        """
+        before = self.output_samples
+        if self._file is None:
+            return 0
+        self._handle(self._segmenter.flush())
+        for segment in self._pending:
+            segment[1] = min(self.source_samples if segment[1] is None else segment[1], self.source_samples)
+        self._drain()
+        return self.output_samples - before
+
+    def close(self) -> OffsetMap:
+        """Flush, finish the WAV header and release the handle.
+
+        Returns:
+            OffsetMap: The segments of the trimmed output.
+        """
+        if self._file is None:
+            return self.offset_map
+        self.flush()
+        self._offset_map = self.offset_map
+        if self.path is not None:
+            data_size = min(self.output_samples * 2, 0xFFFFFFFF - 36)
+            self._file.seek(0)
+            self._file.write(
+                _WAV_HEADER.pack(
+                    b"RIFF", 36 + data_size, b"WAVE", b"fmt ", 16, 1, 1, self.sample_rate, self.sample_rate * 2, 2, 16,
+                    b"data", data_size,
+                )
+            )
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._file.flush()
+        self._file = None
+        self._buffer = np.zeros(0, dtype=np.int16)
+        if self._owns_vad:
+            self._vad.close()
+        return self._offset_map
+
+    def abort(self) -> None:
+        """Stop without finishing the output; a partial WAV file is removed."""
+        if self._file is None:
+            return
+        if self.path is not None:
+            self._file.close()
+            os.remove(self._tmp_path)
+        self._file = None
+        if self._owns_vad:
+            self._vad.close()
+
+    def _handle(self, events) -> None:
+        for event in events:
+            if isinstance(event, SpeechStart):
+                self._pending.append([event.sample, None])
+            elif isinstance(event, SpeechEnd):
+                self._pending[-1][1] = event.sample
+
+    def _drain(self) -> None:
+        """Write pending segments as far as the audio received allows."""
+        available = self.source_samples
+        while self._pending:
+            start, end = self._pending[0]
+            position = max(start, self._written)
+            if end is None:
+                stop = min(available, self._segmenter.earliest_end)
+            else:
+                stop = min(end, available)
+            if stop > position:
+                block = self._buffer[position - self._buffer_start: stop - self._buffer_start]
+                self._file.write(block.astype("<i2", copy=False).data)
+                self.output_samples += stop - position
+                self._written = stop
+            if end is None or stop < end:
+                return
+            self._segments.append([start, end])
+            self._pending.pop(0)
+
+    def _discard(self) -> None:
+        """Drop buffered audio that no pending or future segment can reach."""
+        keep = min(self._processed, self._segmenter.earliest_start)
+        if self._pending:
+            keep = min(keep, max(self._pending[0][0], self._written))
+        keep = max(keep, self._buffer_start)
+        if keep > self._buffer_start:
+            self._buffer = self._buffer[keep - self._buffer_start:]
+            self._buffer_start = keep
+
+
+def trim_wav(input_path: str, output: Union[str, BinaryIO], block_frames: int = 4096, **options) -> OffsetMap:
+    """Write the speech of a mono 16-bit WAV file to ``output``.
+
+    Args:
+        input_path (str): Source WAV file.
+        output (str or BinaryIO): WAV file path, or a writable binary stream.
+        block_frames (int, optional): Frames fed to the trimmer at a time. Defaults to 4096.
+        **options: ``SpeechTrimmer`` arguments.
+
+    Returns:
+        OffsetMap: The segments kept.
+
+    Raises:
+        ValueError: If the file is not a 16 kHz mono 16-bit PCM WAV file.
+    """
+    from .io import WavReader
+
+    with WavReader(input_path) as wav:
+        info = wav.info
+        if info.sample_rate != 16000 or info.channels != 1 or info.dtype != np.int16:
+            raise ValueError(f"[TEN VAD]: {input_path} must be 16 kHz mono 16-bit PCM")
+        with SpeechTrimmer(output, **options) as trimmer:
+            hop = trimmer.hop_size
+            for block in wav.iter_frames(hop, block_frames):
+                trimmer.feed(block.reshape(-1))
+            samples = wav.frames(hop).size
+            if len(wav) > samples:
+                trimmer.feed(wav.samples[samples:])
+    return trimmer.offset_map
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ten_vad.trim", description="Cut a WAV file down to its speech.")
+    parser.add_argument("input", help="Mono 16-bit WAV file")
+    parser.add_argument("output", help="Output WAV file")
+    parser.add_argument("--map", help="Write the offset map to this JSON file")
+    parser.add_argument("--hop-size", type=int, default=256, help="Frame size in samples (default: 256)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Onset threshold (default: 0.5)")
+    parser.add_argument("--pre-pad-ms", type=float, default=100.0, help="Padding before speech (default: 100)")
+    parser.add_argument("--post-pad-ms", type=float, default=100.0, help="Padding after speech (default: 100)")
+    parser.add_argument("--min-silence-ms", type=float, default=100.0, help="Shortest gap that is cut (default: 100)")
+    parser.add_argument("--min-speech-ms", type=float, default=100.0, help="Shortest segment kept (default: 100)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    offset_map = trim_wav(
+        args.input, args.output, hop_size=args.hop_size, onset_threshold=args.threshold, pre_pad_ms=args.pre_pad_ms,
+        post_pad_ms=args.post_pad_ms, min_silence_ms=args.min_silence_ms, min_speech_ms=args.min_speech_ms,
+    )
+    elapsed = time.perf_counter() - start
+    if args.map:
+        offset_map.save(args.map)
+    source_seconds = offset_map.source_samples / offset_map.sample_rate
+    print(
+        f"[TEN VAD]: kept {offset_map.output_samples / offset_map.sample_rate:.2f} s of {source_seconds:.2f} s "
+        f"({100 * (offset_map.kept_ratio or 0.0):.1f}%) in {len(offset_map)} segments, "
+        f"{source_seconds / max(elapsed, 1e-9):.0f}x real time"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,214 @@
+import functools
 import logging
 import platform
 import os
-from ctypes import c_int, c_int32, c_float, c_size_t, CDLL, c_void_p, POINTER
+import threading
+from time import perf_counter_ns
+from ctypes import c_char_p, c_int, c_int16, c_int32, c_float, c_size_t, CDLL, c_void_p, POINTER, pointer
 import numpy as np
-from typing import Tuple, Callable, Optional
-import asyncio
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, Callable, List, NamedTuple, Optional, Tuple
 
+from . import metrics as _metrics
+from .gate import EnergyGate
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_INT16 = np.dtype(np.int16)
+_RAW_INT16 = np.dtype("<i2")  # Raw PCM bytes are little-endian
+# memoryview formats accepted as int16 samples and as raw bytes
+_INT16_FORMATS = frozenset(("h", "@h", "=h", "<h" if _INT16 == _RAW_INT16 else ">h"))
+_BYTE_FORMATS = frozenset(("B", "b", "c", "@B", "=B", "<B", "@b", "=b", "<b", "<c"))
+
+
+def _buffer_view(buffer) -> Tuple[memoryview, bool]:
+    """Validate a buffer-protocol object of int16 samples or raw PCM bytes.
+
+    Returns:
+        Tuple[memoryview, bool]: A view of the buffer and whether it holds raw bytes.
+
+    Raises:
+        TypeError: If the object has no buffer or holds another item type.
+        ValueError: If the buffer is not C-contiguous or has an odd number of bytes.
+    """
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        raise TypeError("[TEN VAD]: audio data must be a NumPy array or a buffer of int16 samples") from None
+    if not view.c_contiguous:
+        raise ValueError("[TEN VAD]: audio buffer must be C-contiguous")
+    if view.itemsize == 2 and view.format in _INT16_FORMATS:
+        return view, False
+    if view.itemsize == 1 and view.format in _BYTE_FORMATS:
+        if view.nbytes % 2:
+            raise ValueError("[TEN VAD]: raw audio bytes must hold whole int16 samples")
+        return view, True
+    raise TypeError("[TEN VAD]: audio buffer must hold int16 samples or raw bytes")
+
+
+def _buffer_samples(buffer) -> np.ndarray:
+    """Zero-copy 1-D int16 array over a buffer-protocol object; see ``_buffer_view``."""
+    view, raw = _buffer_view(buffer)
+    samples = np.frombuffer(view, dtype=_RAW_INT16 if raw else _INT16)
+    return samples if samples.dtype == _INT16 else samples.astype(_INT16)
+
+
+
+class LibraryCapabilities(NamedTuple):
+    """Optional entry points exported by the loaded library.
+
+    Builds of the library differ in what they export beyond create, process,
+    destroy and get_version; ``TenVad`` uses these when present and falls
+    back to equivalent wrapper-side behaviour otherwise.
+    """
+
+    set_threshold: bool  # ten_vad_set_threshold: change the threshold in place
+    reset: bool  # ten_vad_reset: clear the model state in place; not declared in the public header
+    register_callback: bool  # ten_vad_register_callback
+    version_struct: bool  # ten_vad_get_version_struct
+
+
+# Library shared by all handles, loaded on first use by load_library()
+_library: Optional[CDLL] = None
+_process_raw = None
+_capabilities: Optional[LibraryCapabilities] = None
+_library_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _find_library(env_path: str) -> str:
+    """Probe the known install locations once per value of ``TEN_VAD_LIB_PATH``."""
+    # Get root package directory - this is now in src/ten_vad/
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    # Project root is two levels up from the package
+    project_root = os.path.abspath(os.path.join(package_dir, "../.."))
+
+    system = platform.system().lower()
+    machine = platform.machine()  # This returns the machine architecture (e.g., 'AMD64', 'x86_64')
+    # Map machine architectures to directories
+    arch_dir = "x64"  # Default directory name
+
+    # Map architecture names to directory names
+    if machine in ["AMD64", "x86_64"]:
+        arch_dir = "x64"
+    elif machine in ["i386", "i686", "x86"]:
+        arch_dir = "x86"
+    # Add more mappings as needed
+
+    lib_name = "libten_vad.so" if system == "linux" else "ten_vad.dll" if system == "windows" else "libten_vad.dylib"
+
+    # Check these paths in order:
+    possible_paths = [
+        # 1. First check if the library is in the site-packages/ten_vad_library dir (installed via setup.py)
+        os.path.join(package_dir, f"../ten_vad_library/{lib_name}"),
+        # 2. Check relative to project root (development mode)
+        os.path.join(project_root, f"lib/{system.capitalize()}/{arch_dir}/{lib_name}"),
+        # 3. Check with lowercase system name
+        os.path.join(project_root, f"lib/{system}/{arch_dir}/{lib_name}"),
+        # 4. Check for custom path in environment variable
+        env_path,
+    ]
+
+    for path in possible_paths:
+        if path and os.path.exists(path):
+            return path
+
+    # If we get here, we couldn't find the library
+    error_msg = f"[TEN VAD]: Could not find {lib_name} library. Searched paths: {possible_paths}"
+    logger.error(error_msg)
+    raise FileNotFoundError(error_msg)
+
+
+def get_library_path() -> str:
+    """Locate the native library.
+
+    The result of a successful search is cached; a failed search is repeated
+    on the next call.
+
+    Returns:
+        str: Path of the library file.
+
+    Raises:
+        FileNotFoundError: If the library cannot be found.
+    """
+    return _find_library(os.environ.get("TEN_VAD_LIB_PATH", ""))
+
+
+def load_library() -> CDLL:
+    """Load the native library and declare its function signatures.
+
+    The library is loaded once per process and shared by every ``TenVad``
+    instance, so creating a handle afterwards only calls ``ten_vad_create``.
+
+    Returns:
+        CDLL: The loaded library.
+
+    Raises:
+        FileNotFoundError: If the library cannot be found.
+        OSError: If the library cannot be loaded.
+    """
+    global _library, _process_raw, _capabilities
+    if _library is not None:
+        return _library
+    with _library_lock:
+        if _library is None:
+            path = get_library_path()
+            library = CDLL(path)
+            # Set C function signatures
+            library.ten_vad_create.argtypes = [POINTER(c_void_p), c_size_t, c_float]
+            library.ten_vad_create.restype = c_int
+            library.ten_vad_destroy.argtypes = [POINTER(c_void_p)]
+            library.ten_vad_destroy.restype = c_int
+            library.ten_vad_process.argtypes = [c_void_p, c_void_p, c_size_t, POINTER(c_float), POINTER(c_int32)]
+            library.ten_vad_process.restype = c_int
+            library.ten_vad_get_version.argtypes = []
+            library.ten_vad_get_version.restype = c_char_p
+            capabilities = LibraryCapabilities(
+                set_threshold=hasattr(library, "ten_vad_set_threshold"),
+                reset=hasattr(library, "ten_vad_reset"),
+                register_callback=hasattr(library, "ten_vad_register_callback"),
+                version_struct=hasattr(library, "ten_vad_get_version_struct"),
+            )
+            if capabilities.set_threshold:
+                library.ten_vad_set_threshold.argtypes = [c_void_p, c_float]
+                library.ten_vad_set_threshold.restype = c_int
+            if capabilities.reset:
+                library.ten_vad_reset.argtypes = [c_void_p]
+                library.ten_vad_reset.restype = c_int
+            # Untyped alias of ten_vad_process so array APIs can pass raw integer addresses
+            process_raw = library["ten_vad_process"]
+            process_raw.argtypes = [c_void_p, c_void_p, c_size_t, c_void_p, c_void_p]
+            process_raw.restype = c_int
+            _process_raw = process_raw
+            _capabilities = capabilities
+            _library = library
+            logger.info(f"[TEN VAD]: Loaded library from {path}")
+    return _library
+
+
+def get_library_capabilities() -> LibraryCapabilities:
+    """Report which optional entry points the loaded library exports.
+
+    Raises:
+        FileNotFoundError: If the library cannot be found.
+        OSError: If the library cannot be loaded.
+    """
+    load_library()
+    return _capabilities
+
+
+def get_library_version() -> str:
+    """Return the version string of the native library without creating a handle.
+
+    Raises:
+        FileNotFoundError: If the library cannot be found.
+        OSError: If the library cannot be loaded.
+    """
+    return load_library().ten_vad_get_version().decode()
+
+
 class TenVad:
     """Voice Activity Detection (VAD) using a C-based library.
 
@@ -17,13 +216,21 @@ class TenVad:
         hop_size (int, optional): Size of each audio frame. Defaults to 256.
         threshold (float, optional): Speech detection threshold (0 to 1). Defaults to 0.5.
         callback (Callable[[float, int], None], optional): Callback function to handle VAD output.
+        metrics (bool, optional): Collect runtime metrics (see ``ten_vad.metrics``).
+            Defaults to ``metrics.enabled_by_default()``.
 
     Raises:
         FileNotFoundError: If the VAD library cannot be found.
         RuntimeError: If VAD handler creation fails.
         ValueError: If hop_size or threshold is invalid.
     """
-    def __init__(self, hop_size: int = 256, threshold: float = 0.5, callback: Optional[Callable[[float, int], None]] = None):
+    def __init__(
+        self,
+        hop_size: int = 256,
+        threshold: float = 0.5,
+        callback: Optional[Callable[[float, int], None]] = None,
+        metrics: Optional[bool] = None,
+    ):
         if hop_size <= 0:
             raise ValueError("[TEN VAD]: hop_size must be positive")
         if not 0 <= threshold <= 1:
@@ -33,64 +240,33 @@ class TenVad:
         self.threshold = threshold
         self.callback = callback
         self._audio_data_ref = None  # Keep audio data reference to prevent garbage collection
-
-        # Dynamically load library based on platform
-        def get_library_path():
-            # Get root package directory - this is now in src/ten_vad/
-            package_dir = os.path.dirname(os.path.abspath(__file__))
-            # Project root is two levels up from the package
-            project_root = os.path.abspath(os.path.join(package_dir, "../.."))
-            
-            system = platform.system().lower()
-            machine = platform.machine()  # This returns the machine architecture (e.g., 'AMD64', 'x86_64')
-            # Map machine architectures to directories
-            arch_dir = "x64"  # Default directory name
-            
-            # Map architecture names to directory names
-            if machine in ["AMD64", "x86_64"]:
-                arch_dir = "x64"
-            elif machine in ["i386", "i686", "x86"]:
-                arch_dir = "x86"
-            # Add more mappings as needed
-            
-            lib_name = "libten_vad.so" if system == "linux" else "ten_vad.dll" if system == "windows" else "libten_vad.dylib"
-            
-            # Check these paths in order:
-            possible_paths = [
-                # 1. First check if the library is in the site-packages/ten_vad_library dir (installed via setup.py)
-                os.path.join(package_dir, f"../ten_vad_library/{lib_name}"),
-                # 2. Check relative to project root (development mode)
-                os.path.join(project_root, f"lib/{system.capitalize()}/{arch_dir}/{lib_name}"),
-                # 3. Check with lowercase system name
-                os.path.join(project_root, f"lib/{system}/{arch_dir}/{lib_name}"),
-                # 4. Check for custom path in environment variable
-                os.environ.get("TEN_VAD_LIB_PATH", "")
-            ]
-            
-            for path in possible_paths:
-                if path and os.path.exists(path):
-                    logger.info(f"[TEN VAD]: Loading library from {path}")
-                    return path
-            
-            # If we get here, we couldn't find the library
-            error_msg = f"[TEN VAD]: Could not find {lib_name} library. Searched paths: {possible_paths}"
-            logger.error(error_msg)
-            raise FileNotFoundError(error_msg)
-
-        self.vad_library = CDLL(get_library_path())
+        self._executor: Optional["ThreadPoolExecutor"] = None  # Created by the asyncio APIs on first use
+        self._executor_workers: set = set()
+
+        self.vad_library = load_library()
+        # Native entry points; replaced by timed wrappers while metrics are enabled
+        self._process = self.vad_library.ten_vad_process
+        self._process_raw = _process_raw
+        self._metrics: Optional[_metrics.VadMetrics] = None
+        self._gate: Optional[EnergyGate] = None  # Energy pre-gate, see set_energy_gate
+        self._capabilities = _capabilities
+        # float32 threshold the wrapper applies itself when the native handle
+        # was created with a different one and cannot be updated in place
+        self._flag_threshold: Optional[np.float32] = None
         self.vad_handler = c_void_p(0)
         self.out_probability = c_float()
         self.out_flags = c_int32()
-
-        # Set C function signatures
-        self.vad_library.ten_vad_create.argtypes = [POINTER(c_void_p), c_size_t, c_float]
-        self.vad_library.ten_vad_create.restype = c_int
-        self.vad_library.ten_vad_destroy.argtypes = [POINTER(c_void_p)]
-        self.vad_library.ten_vad_destroy.restype = c_int
-        self.vad_library.ten_vad_process.argtypes = [c_void_p, c_void_p, c_size_t, POINTER(c_float), POINTER(c_int32)]
-        self.vad_library.ten_vad_process.restype = c_int
+        # Argument objects bound once so the per-frame path allocates nothing
+        self._hop_size_arg = c_size_t(hop_size)
+        self._out_probability_ptr = pointer(self.out_probability)
+        self._out_flags_ptr = pointer(self.out_flags)
+        self._frame_shape = (hop_size,)
+        self._frame_type = c_int16 * hop_size
+        self._frame_bytes = 2 * hop_size
 
         self.create_and_init_handler()
+        if metrics or (metrics is None and _metrics.enabled_by_default()):
+            self.enable_metrics()
 
     def create_and_init_handler(self) -> None:
         """Initialize the VAD handler.
@@ -106,19 +282,111 @@ class TenVad:
         if result != 0:
             logger.error("[TEN VAD]: Failed to create handler, error code: %d", result)
             raise RuntimeError(f"[TEN VAD]: create handler failure with error code: {result}")
+        self._native_threshold = self.threshold
+        self._flag_threshold = None
 
-    def __del__(self) -> None:
-        """Destroy the VAD handler.
+    def enable_metrics(self, enabled: bool = True) -> None:
+        """Start or stop collecting runtime metrics for this handle.
+
+        Counts collected so far stay in the process totals of
+        ``ten_vad.metrics.stats()``; re-enabling starts new per-handle counts.
+
+        Args:
+            enabled (bool, optional): Whether to collect metrics. Defaults to True.
+        """
+        if enabled and self._metrics is None:
+            self._metrics = _metrics.register(self)
+            self._process = self._metrics.time_native(self.vad_library.ten_vad_process)
+            self._process_raw = self._metrics.time_native(_process_raw)
+        elif not enabled and self._metrics is not None:
+            _metrics.retire(self._metrics)
+            self._metrics = None
+            self._process = self.vad_library.ten_vad_process
+            self._process_raw = _process_raw
+
+    def set_energy_gate(self, gate: Optional[EnergyGate]) -> Optional[EnergyGate]:
+        """Skip inference on silent frames, or stop doing so with None.
+
+        Gated frames are reported with probability 0 and flag 0 by every
+        process path; see ``ten_vad.gate`` for the rules. The gate keeps
+        per-stream state, so give each handle its own.
+
+        Args:
+            gate (EnergyGate, optional): Gate to apply, or None to remove it.
+
+        Returns:
+            EnergyGate: The gate, whose ``gated_frames`` and ``frames`` count the skipped and seen frames.
+        """
+        if gate is not None:
+            gate.reset()
+        self._gate = gate
+        return gate
+
+    @property
+    def energy_gate(self) -> Optional[EnergyGate]:
+        """The energy pre-gate in use, if any."""
+        return self._gate
+
+    def stats(self) -> Optional[dict]:
+        """Runtime metrics of this handle, or None when metrics are disabled.
+
+        Returns:
+            dict: ``calls``, ``frames``, ``speech_frames``, ``gated_frames``, ``errors`` by error
+            name, ``native_seconds``, ``wrapper_overhead_seconds`` and per-frame
+            native ``latency`` quantiles (``p50``, ``p99``, ``p999``) in seconds.
+        """
+        return self._metrics.snapshot() if self._metrics is not None else None
+
+    @property
+    def capabilities(self) -> LibraryCapabilities:
+        """Optional entry points of the loaded library, see ``LibraryCapabilities``."""
+        return self._capabilities
+
+    def close(self) -> None:
+        """Destroy the VAD handler and stop the async executor.
+
+        Waits for ``process_async`` and ``stream`` jobs already handed to the
+        executor, so none of them runs on a destroyed handler. Safe to call
+        more than once. Processing after ``close`` raises RuntimeError.
 
         Raises:
             RuntimeError: If handler destruction fails.
         """
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Let queued and running async jobs finish before the handle goes away. On the
+            # worker thread itself the caller is the only job running, so it cannot wait.
+            executor.shutdown(wait=threading.get_ident() not in self._executor_workers)
         if self.vad_handler:
             result = self.vad_library.ten_vad_destroy(POINTER(c_void_p)(self.vad_handler))
             if result != 0:
                 logger.error("[TEN VAD]: Failed to destroy handler, error code: %d", result)
                 raise RuntimeError(f"[TEN VAD]: destroy handler failure with error code: {result}")
 
+    @property
+    def closed(self) -> bool:
+        """True once the native handler has been destroyed."""
+        return not self.vad_handler
+
+    def __enter__(self) -> "TenVad":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        """Destroy the VAD handler if ``close`` was not called.
+
+        Never raises: the object may be only partly initialized, or the
+        interpreter may be shutting down.
+        """
+        if getattr(self, "vad_handler", None) is None and getattr(self, "_executor", None) is None:
+            return  # __init__ failed before loading anything
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def get_input_data(self, audio_data: np.ndarray) -> c_void_p:
         """Prepare audio data for processing.
 
@@ -132,8 +400,14 @@ class TenVad:
             TypeError: If audio_data is not a NumPy array or has incorrect type.
             ValueError: If audio_data shape or size is invalid.
         """
+        audio_data = self._prepare_input(audio_data)
+        self._audio_data_ref = audio_data  # The pointer may refer to a contiguous copy
+        return c_void_p(audio_data.__array_interface__["data"][0])
+
+    def _prepare_input(self, audio_data: np.ndarray) -> np.ndarray:
+        """Validate one frame and return it as a C-contiguous int16 array."""
         if not isinstance(audio_data, np.ndarray):
-            raise TypeError("[TEN VAD]: audio_data must be a NumPy array")
+            audio_data = _buffer_samples(audio_data)
         audio_data = np.squeeze(audio_data)
         if audio_data.size == 0:
             raise ValueError("[TEN VAD]: audio_data is empty")
@@ -143,30 +417,89 @@ class TenVad:
             raise TypeError("[TEN VAD]: audio data type must be int16")
         if not audio_data.flags.c_contiguous:
             audio_data = np.ascontiguousarray(audio_data, dtype=np.int16)
-        return c_void_p(audio_data.__array_interface__["data"][0])
+        return audio_data
+
+    def _frame_pointer(self, audio_data: np.ndarray):
+        """Return a ctypes view of a validated frame suitable for a c_void_p argument."""
+        if audio_data.flags.writeable:
+            # Wrapping the buffer is several times cheaper than going through ndarray.ctypes
+            return self._frame_type.from_buffer(audio_data)
+        return audio_data.ctypes.data
+
+    def _buffer_pointer(self, buffer):
+        """Validate one frame in a buffer-protocol object and return it for a c_void_p argument, without NumPy."""
+        if type(buffer) is bytes:
+            if len(buffer) != self._frame_bytes:
+                raise ValueError(f"[TEN VAD]: audio data should hold {self.hop_size} int16 samples")
+            return buffer  # ctypes passes the address of the bytes object's own storage
+        view, _ = _buffer_view(buffer)
+        if view.nbytes != self._frame_bytes:
+            raise ValueError(f"[TEN VAD]: audio data should hold {self.hop_size} int16 samples")
+        if view.readonly:
+            # ctypes can only wrap writable buffers; copy the frame's bytes
+            return self._frame_type.from_buffer_copy(view)
+        return self._frame_type.from_buffer(view)
 
     def set_threshold(self, threshold: float) -> None:
-        """Update the VAD threshold dynamically.
+        """Update the VAD threshold dynamically, keeping the model state.
+
+        Uses ``ten_vad_set_threshold`` when the library exports it. Otherwise
+        the handle keeps its original threshold and the wrapper derives the
+        flags itself as ``probability > threshold``, the same comparison the
+        library makes; probabilities do not depend on the threshold.
 
         Args:
             threshold (float): New threshold value (0 to 1).
 
         Raises:
             ValueError: If threshold is not between 0 and 1.
-            RuntimeError: If handler reinitialization fails.
+            RuntimeError: If the library rejects the threshold.
         """
         if not 0 <= threshold <= 1:
             raise ValueError("[TEN VAD]: threshold must be between 0 and 1")
+        if self._capabilities.set_threshold and self.vad_handler:
+            result = self.vad_library.ten_vad_set_threshold(self.vad_handler, c_float(threshold))
+            if result != 0:
+                logger.error("[TEN VAD]: Failed to set threshold, error code: %d", result)
+                raise RuntimeError(f"[TEN VAD]: set threshold failure with error code: {result}")
+            self._native_threshold = threshold
         self.threshold = threshold
+        self._flag_threshold = None if threshold == self._native_threshold else np.float32(threshold)
+
+    def reset(self) -> None:
+        """Reset the recurrent model state so the next frame starts a new stream.
+
+        Uses ``ten_vad_reset`` when the library exports it and recreates the
+        handle otherwise.
+
+        Raises:
+            RuntimeError: If the reset or handler reinitialization fails.
+        """
+        if self._gate is not None:
+            self._gate.reset()
+        if self._capabilities.reset and self.vad_handler:
+            result = self.vad_library.ten_vad_reset(self.vad_handler)
+            if result != 0:
+                logger.error("[TEN VAD]: Failed to reset handler, error code: %d", result)
+                raise RuntimeError(f"[TEN VAD]: reset handler failure with error code: {result}")
+            return
         if self.vad_handler:
             self.vad_library.ten_vad_destroy(POINTER(c_void_p)(self.vad_handler))
         self.create_and_init_handler()
 
+    def get_version(self) -> str:
+        """Return the version string reported by the loaded library."""
+        return self.vad_library.ten_vad_get_version().decode()
+
     def _process_internal(self, audio_data: np.ndarray) -> Tuple[float, int]:
         """Internal method to process audio data.
 
+        Frames that are already contiguous int16 arrays of shape (hop_size,) skip
+        the full validation in ``_prepare_input``. Other buffer-protocol objects
+        are passed to the library by address, without creating an array.
+
         Args:
-            audio_data (np.ndarray): Audio data to process.
+            audio_data (np.ndarray): Audio data to process, or a buffer (see ``process``).
 
         Returns:
             Tuple[float, int]: Speech probability and detection flag.
@@ -174,31 +507,56 @@ class TenVad:
         Raises:
             RuntimeError: If processing fails.
         """
+        if self._gate is not None:
+            return self._process_gated_frame(self._prepare_input(audio_data))
+        metrics = self._metrics
+        if metrics is not None:
+            start = perf_counter_ns()
+        if type(audio_data) is not np.ndarray:
+            frame = self._buffer_pointer(audio_data)
+        else:
+            if not (
+                audio_data.dtype is _INT16
+                and audio_data.shape == self._frame_shape
+                and audio_data.flags.c_contiguous
+            ):
+                audio_data = self._prepare_input(audio_data)
+            frame = self._frame_pointer(audio_data)
         self._audio_data_ref = audio_data  # Keep reference to prevent garbage collection
-        input_pointer = self.get_input_data(audio_data)
-        result = self.vad_library.ten_vad_process(
+        result = self._process(
             self.vad_handler,
-            input_pointer,
-            c_size_t(self.hop_size),
-            POINTER(c_float)(self.out_probability),
-            POINTER(c_int32)(self.out_flags),
+            frame,
+            self._hop_size_arg,
+            self._out_probability_ptr,
+            self._out_flags_ptr,
         )
         if result != 0:
             logger.error("[TEN VAD]: Process failed, error code: %d", result)
             raise RuntimeError(f"[TEN VAD]: process failed with error code: {result}")
-        return self.out_probability.value, self.out_flags.value
+        prob = self.out_probability.value
+        flag = self.out_flags.value if self._flag_threshold is None else int(prob > self._flag_threshold)
+        if metrics is not None:
+            metrics.record(perf_counter_ns() - start, 1, flag)
+        return prob, flag
 
     def process(self, audio_data: np.ndarray) -> Tuple[float, int]:
         """Process an audio frame and return VAD results.
 
+        Besides NumPy arrays, any C-contiguous buffer-protocol object works:
+        ``bytes``, ``bytearray`` or ``memoryview`` of raw little-endian PCM,
+        ``array.array("h")`` or ctypes arrays. The library reads it in place;
+        only read-only buffers other than ``bytes`` are copied (one frame).
+
         Args:
-            audio_data (np.ndarray): Audio data of shape (hop_size,) and type int16.
+            audio_data (np.ndarray): Audio data of shape (hop_size,) and type int16,
+                or a buffer of hop_size int16 samples.
 
         Returns:
             Tuple[float, int]: Speech probability and detection flag.
 
         Raises:
-            ValueError: If audio_data shape or type is invalid.
+            TypeError: If audio_data type is invalid.
+            ValueError: If audio_data shape or size is invalid.
             RuntimeError: If VAD processing fails.
         """
         prob, flag = self._process_internal(audio_data)
@@ -206,8 +564,12 @@ class TenVad:
             self.callback(prob, flag)
         return prob, flag
 
-    async def process_async(self, audio_data: np.ndarray) -> Tuple[float, int]:
-        """Asynchronously process an audio frame and return VAD results.
+    def process_unchecked(self, audio_data: np.ndarray) -> Tuple[float, int]:
+        """Process an audio frame without validating it.
+
+        This is the lowest-overhead per-frame entry point. The caller guarantees
+        that ``audio_data`` is a C-contiguous int16 NumPy array of exactly
+        ``hop_size`` samples; anything else leads to undefined results.
 
         Args:
             audio_data (np.ndarray): Audio data of shape (hop_size,) and type int16.
@@ -216,26 +578,293 @@ class TenVad:
             Tuple[float, int]: Speech probability and detection flag.
 
         Raises:
-            ValueError: If audio_data shape or type is invalid.
             RuntimeError: If VAD processing fails.
         """
-        self._audio_data_ref = audio_data  # Keep reference to prevent garbage collection
-        input_pointer = self.get_input_data(audio_data)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: self.vad_library.ten_vad_process(
-                self.vad_handler,
-                input_pointer,
-                c_size_t(self.hop_size),
-                POINTER(c_float)(self.out_probability),
-                POINTER(c_int32)(self.out_flags),
-            )
+        if self._gate is not None:
+            prob, flag = self._process_gated_frame(audio_data)
+            if self.callback:
+                self.callback(prob, flag)
+            return prob, flag
+        metrics = self._metrics
+        if metrics is not None:
+            start = perf_counter_ns()
+        result = self._process(
+            self.vad_handler,
+            self._frame_pointer(audio_data),
+            self._hop_size_arg,
+            self._out_probability_ptr,
+            self._out_flags_ptr,
         )
         if result != 0:
-            logger.error("[TEN VAD]: Async process failed, error code: %d", result)
-            raise RuntimeError(f"[TEN VAD]: async process failed with error code: {result}")
+            logger.error("[TEN VAD]: Process failed, error code: %d", result)
+            raise RuntimeError(f"[TEN VAD]: process failed with error code: {result}")
         prob, flag = self.out_probability.value, self.out_flags.value
+        if self._flag_threshold is not None:
+            flag = int(prob > self._flag_threshold)
+        if metrics is not None:
+            metrics.record(perf_counter_ns() - start, 1, flag)
+        if self.callback:
+            self.callback(prob, flag)
+        return prob, flag
+
+    def process_array(self, audio: np.ndarray, hop_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Process a whole audio buffer and return per-frame VAD results.
+
+        The buffer is validated once and split into consecutive, non-overlapping
+        frames of ``hop_size`` samples that are handed to the library as views
+        into the (contiguous) buffer. Trailing samples that do not fill a whole
+        frame are ignored.
+
+        Args:
+            audio (np.ndarray): 1-D audio data of type int16 and arbitrary length, or a
+                buffer of int16 samples or raw PCM bytes (viewed without a copy).
+            hop_size (int, optional): Frame size in samples. Must match the hop_size
+                the handler was created with. Defaults to ``self.hop_size``.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float32 speech probabilities and uint8
+            detection flags, one entry per frame.
+
+        Raises:
+            TypeError: If audio is not an int16 array or buffer.
+            ValueError: If audio shape or hop_size is invalid.
+            RuntimeError: If VAD processing fails.
+        """
+        frames = self._frame_view(audio, hop_size)
+        num_frames = frames.shape[0]
+        probabilities = np.empty(num_frames, dtype=np.float32)
+        flags = np.empty(num_frames, dtype=np.int32)
+        if num_frames:
+            self._process_frames(frames, probabilities, flags)
+        return probabilities, flags.astype(np.uint8)
+
+    def _frame_view(self, audio: np.ndarray, hop_size: Optional[int] = None) -> np.ndarray:
+        """Validate a buffer once and return a zero-copy (num_frames, hop_size) view of it."""
+        if hop_size is None:
+            hop_size = self.hop_size
+        elif hop_size != self.hop_size:
+            raise ValueError(f"[TEN VAD]: hop_size must match the handler hop_size ({self.hop_size})")
+        audio = self._as_samples(audio)
+        num_frames = audio.shape[0] // hop_size
+        return audio[: num_frames * hop_size].reshape(num_frames, hop_size)
+
+    @staticmethod
+    def _as_samples(audio: np.ndarray) -> np.ndarray:
+        """Validate a buffer of any length and return it as a C-contiguous 1-D int16 array.
+
+        Buffer-protocol objects other than arrays are viewed without a copy.
+        """
+        if not isinstance(audio, np.ndarray):
+            audio = _buffer_samples(audio)
+        if audio.ndim != 1:
+            audio = np.squeeze(audio)
+        if audio.ndim != 1:
+            raise ValueError("[TEN VAD]: audio data should be one-dimensional")
+        if audio.dtype != np.int16:
+            raise TypeError("[TEN VAD]: audio data type must be int16")
+        if not audio.flags.c_contiguous:
+            audio = np.ascontiguousarray(audio)
+        return audio
+
+    def _process_frames(self, frames: np.ndarray, probabilities: np.ndarray, flags: np.ndarray) -> None:
+        """Run the library over contiguous frames, writing results in place.
+
+        The output arrays may be strided, e.g. fields of a record array.
+
+        Args:
+            frames (np.ndarray): int16 array of shape (num_frames, hop_size) with contiguous rows.
+            probabilities (np.ndarray): float32 output array of length num_frames.
+            flags (np.ndarray): int32 output array of length num_frames.
+
+        Raises:
+            RuntimeError: If processing fails.
+        """
+        if self._gate is not None:
+            self._process_gated(frames, probabilities, flags, self.callback)
+        else:
+            self._run_frames(frames, probabilities, flags, self.callback, self._metrics)
+
+    def _process_gated(
+        self, frames: np.ndarray, probabilities: np.ndarray, flags: np.ndarray, callback: Optional[Callable[[float, int], None]]
+    ) -> None:
+        """``_process_frames`` with the energy gate: only the runs it selects reach the library."""
+        metrics = self._metrics
+        if metrics is not None:
+            start = perf_counter_ns()
+        runs = self._gate.plan(frames)
+        probabilities[:] = 0.0
+        flags[:] = 0
+        processed = 0
+        for run_start, run_end, warmup in runs:
+            if warmup is not None and len(warmup):
+                # Outputs of the warm-up frames stay 0: they were gated
+                self._run_frames(
+                    warmup, np.empty(len(warmup), dtype=np.float32), np.empty(len(warmup), dtype=np.int32), None, None
+                )
+            self._run_frames(frames[run_start:run_end], probabilities[run_start:run_end], flags[run_start:run_end], None, None)
+            processed += run_end - run_start
+        if callback is not None:
+            for i in range(frames.shape[0]):
+                callback(float(probabilities[i]), int(flags[i]))
+        if metrics is not None:
+            metrics.record(perf_counter_ns() - start, frames.shape[0], int(np.count_nonzero(flags)), frames.shape[0] - processed)
+
+    def _process_gated_frame(self, frame: np.ndarray) -> Tuple[float, int]:
+        """Process one validated frame through the energy gate."""
+        probabilities = np.empty(1, dtype=np.float32)
+        flags = np.empty(1, dtype=np.int32)
+        # The per-frame entry points run the callback themselves
+        self._process_gated(frame.reshape(1, self.hop_size), probabilities, flags, None)
+        return float(probabilities[0]), int(flags[0])
+
+    def _run_frames(
+        self,
+        frames: np.ndarray,
+        probabilities: np.ndarray,
+        flags: np.ndarray,
+        callback: Optional[Callable[[float, int], None]],
+        metrics: Optional[_metrics.VadMetrics],
+    ) -> None:
+        """Run the library over every frame; see ``_process_frames``."""
+        if metrics is not None:
+            start = perf_counter_ns()
+        process = self._process_raw
+        handler = self.vad_handler
+        hop_size = self.hop_size
+        flag_threshold = self._flag_threshold
+        # With wrapper-side flags, callbacks run once the flags are rewritten
+        run_callback = callback if flag_threshold is None else None
+        frame_stride = frames.strides[0]
+        in_address = frames.ctypes.data
+        prob_address = probabilities.ctypes.data
+        prob_stride = probabilities.strides[0]
+        flag_address = flags.ctypes.data
+        flag_stride = flags.strides[0]
+        for i in range(frames.shape[0]):
+            result = process(
+                handler, in_address + i * frame_stride, hop_size, prob_address + i * prob_stride, flag_address + i * flag_stride
+            )
+            if result != 0:
+                logger.error("[TEN VAD]: Process failed at frame %d, error code: %d", i, result)
+                raise RuntimeError(f"[TEN VAD]: process failed with error code: {result}")
+            if run_callback is not None:
+                run_callback(float(probabilities[i]), int(flags[i]))
+        if flag_threshold is not None:
+            np.greater(probabilities, flag_threshold, out=flags, casting="unsafe")
+            if callback is not None:
+                for i in range(frames.shape[0]):
+                    callback(float(probabilities[i]), int(flags[i]))
+        if metrics is not None:
+            metrics.record(perf_counter_ns() - start, frames.shape[0], int(np.count_nonzero(flags)))
+
+    async def process_async(self, audio_data: np.ndarray) -> Tuple[float, int]:
+        """Asynchronously process an audio frame and return VAD results.
+
+        Frames run on the instance's own single-thread executor, so concurrent
+        awaits on one instance are processed one at a time in submission order.
+
+        Args:
+            audio_data (np.ndarray): Audio data of shape (hop_size,) and type int16.
+
+        Returns:
+            Tuple[float, int]: Speech probability and detection flag.
+
+        Raises:
+            ValueError: If audio_data shape or type is invalid.
+            RuntimeError: If VAD processing fails.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        prob, flag = await loop.run_in_executor(self._get_executor(), self._process_internal, audio_data)
         if self.callback:
             self.callback(prob, flag)
         return prob, flag
+
+    async def stream(
+        self, source: AsyncIterable[np.ndarray], max_batch_frames: int = 32, max_pending_chunks: int = 16
+    ) -> AsyncIterator[np.ndarray]:
+        """Run VAD over an asynchronous source of audio chunks.
+
+        Chunks may have any length (see ``TenVadStream``). Chunks that are
+        already waiting are grouped, up to ``max_batch_frames`` frames, into a
+        single executor call, and each group yields one record array of
+        ``(offset, probability, flag)`` results. At most ``max_pending_chunks``
+        chunks are read ahead; when the consumer falls behind, reading from
+        ``source`` pauses. Samples that do not fill a final frame are dropped.
+        If a callback is set, it runs on the executor thread.
+
+        Args:
+            source (AsyncIterable[np.ndarray]): int16 audio chunks, as arrays or buffers
+                (see ``process_array``).
+            max_batch_frames (int, optional): Frames per executor call. Defaults to 32.
+            max_pending_chunks (int, optional): Read-ahead limit. Defaults to 16.
+
+        Yields:
+            np.ndarray: Results of each group, see ``stream.STREAM_RESULT_DTYPE``.
+
+        Raises:
+            TypeError: If a chunk is not an int16 array or buffer.
+            RuntimeError: If VAD processing fails.
+        """
+        import asyncio
+
+        from .stream import TenVadStream
+
+        framer = TenVadStream(self)
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_chunks)
+        end_of_stream = object()
+
+        async def read() -> None:
+            try:
+                async for chunk in source:
+                    await queue.put(chunk)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await queue.put(exc)
+            else:
+                await queue.put(end_of_stream)
+
+        reader = loop.create_task(read())
+        batch_samples = max_batch_frames * self.hop_size
+        try:
+            item = None
+            while item is not end_of_stream:
+                # Take every chunk that is already waiting, up to one batch
+                item = await queue.get()
+                chunks = []
+                samples = 0
+                while item is not end_of_stream and not isinstance(item, Exception):
+                    chunks.append(item)
+                    samples += len(item) if isinstance(item, np.ndarray) else memoryview(item).nbytes // 2
+                    if samples >= batch_samples or queue.empty():
+                        break
+                    item = queue.get_nowait()
+                if chunks:
+                    results = await loop.run_in_executor(executor, _feed_chunks, framer, chunks)
+                    if len(results):
+                        yield results
+                if isinstance(item, Exception):
+                    raise item
+        finally:
+            reader.cancel()
+
+    def _get_executor(self) -> "ThreadPoolExecutor":
+        """Return the instance's single-thread executor, creating it on first use."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = self._executor_workers = set()  # Worker thread idents, for close() called from a job
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="ten_vad", initializer=lambda: workers.add(threading.get_ident())
+            )
+        return self._executor
+
+
+def _feed_chunks(framer, chunks: List[np.ndarray]) -> np.ndarray:
+    """Executor job of ``TenVad.stream``: feed several chunks and join their results."""
+    results = [framer.feed(chunk) for chunk in chunks]
+    return results[0] if len(results) == 1 else np.concatenate(results)
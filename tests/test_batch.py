@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ten_vad import TenVad
+from ten_vad.batch import BatchConfig, MANIFEST_NAME, find_wav_files, load_manifest, main, run_batch
+from ten_vad.io import WavReader
+
+TESTSET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../testset"))
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        """Copy a few testset files into a scratch corpus."""
+        try:
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        self.tmp_dir = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.tmp_dir, "corpus")
+        os.makedirs(os.path.join(self.corpus, "nested"))
+        shutil.copy(os.path.join(TESTSET_DIR, "testset-audio-01.wav"), self.corpus)
+        shutil.copy(os.path.join(TESTSET_DIR, "testset-audio-02.wav"), os.path.join(self.corpus, "nested"))
+        self.output_dir = os.path.join(self.tmp_dir, "out")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_results_match_process_array(self):
+        """Test per-file outputs equal processing each file on a fresh handle."""
+        files = find_wav_files([self.corpus])
+        self.assertEqual(len(files), 2)
+        summary = run_batch(files, self.output_dir, BatchConfig(256, 0.5), jobs=1)
+        self.assertEqual((summary.processed, summary.skipped, summary.failed), (2, 0, {}))
+        with open(os.path.join(self.output_dir, MANIFEST_NAME)) as f:
+            entries = [json.loads(line) for line in f]
+        for entry in entries:
+            result = np.load(entry["output"])
+            with WavReader(entry["path"]) as wav:
+                expected, flags = TenVad(256, 0.5).process_array(np.array(wav.samples))
+            np.testing.assert_array_equal(result["probabilities"], expected)
+            np.testing.assert_array_equal(result["flags"], flags)
+            self.assertEqual(entry["frames"], len(flags))
+
+    def test_incremental_rerun(self):
+        """Test unchanged files are skipped and changed settings are reprocessed."""
+        files = find_wav_files([self.corpus])
+        run_batch(files, self.output_dir, jobs=2)
+        self.assertEqual(run_batch(files, self.output_dir, jobs=1).skipped, 2)
+        os.utime(files[0], ns=(0, 0))
+        summary = run_batch(files, self.output_dir, jobs=1)
+        self.assertEqual((summary.processed, summary.skipped), (1, 1))
+        summary = run_batch(files, self.output_dir, BatchConfig(256, 0.6), jobs=1)
+        self.assertEqual(summary.processed, 2)
+        with open(os.path.join(self.output_dir, MANIFEST_NAME)) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+    def test_result_store_format(self):
+        """Test --format tvr writes result stores and a format change reprocesses files."""
+        from ten_vad import ResultStore
+        files = find_wav_files([self.corpus])
+        run_batch(files, self.output_dir, jobs=1)
+        self.assertEqual(main([self.corpus, "-o", self.output_dir, "-j", "1", "--format", "tvr"]), 0)
+        entries = load_manifest(self.output_dir)
+        for path in files:
+            entry = entries[path]
+            self.assertTrue(entry["output"].endswith(".vad.tvr"))
+            with ResultStore(entry["output"]) as store:
+                flags = np.load(entry["output"][: -len(".tvr")] + ".npz")["flags"]
+                np.testing.assert_array_equal(store.flags(), flags)
+                self.assertEqual(entry["speech_frames"], store.speech_frames(0, len(store)))
+
+    def test_cli_reports_failures(self):
+        """Test the command line entry point and failure exit code."""
+        bad = os.path.join(self.corpus, "bad.wav")
+        with open(bad, "wb") as f:
+            f.write(b"not a wav file")
+        self.assertEqual(main([self.corpus, "-o", self.output_dir, "-j", "1"]), 1)
+        summary = run_batch(find_wav_files([self.corpus]), self.output_dir, jobs=1)
+        self.assertEqual((summary.processed, summary.skipped, list(summary.failed)), (0, 2, [bad]))
+
+    def test_missing_file_does_not_abort_run(self):
+        """Test a listed file that cannot be read is reported and the others are processed."""
+        missing = os.path.join(self.corpus, "missing.wav")
+        files = find_wav_files([self.corpus]) + [missing]
+        summary = run_batch(files, self.output_dir, jobs=1)
+        self.assertEqual((summary.processed, summary.skipped, list(summary.failed)), (2, 0, [missing]))
+
+
+if __name__ == '__main__':
+    unittest.main()
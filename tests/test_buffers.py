@@ -0,0 +1,91 @@
+import array
+import asyncio
+import ctypes
+import unittest
+import numpy as np
+from ten_vad import EnergyGate, TenVad, TenVadStream
+
+
+class TestBufferInput(unittest.TestCase):
+    def setUp(self):
+        try:
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        rng = np.random.default_rng(0)
+        self.audio = (rng.standard_normal(256 * 20 + 100) * 3000).astype(np.int16)
+        self.raw = self.audio.astype("<i2").tobytes()
+        self.expected = TenVad(256).process_array(self.audio)
+
+    def _frames(self, convert):
+        return [convert(self.raw[i * 512:(i + 1) * 512]) for i in range(20)]
+
+    def test_process_buffers(self):
+        """Test per-frame processing of bytes, bytearray, memoryview, array and ctypes buffers."""
+        conversions = {
+            "bytes": bytes,
+            "bytearray": bytearray,
+            "memoryview": memoryview,
+            "writable memoryview": lambda raw: memoryview(bytearray(raw)),
+            "int16 memoryview": lambda raw: memoryview(bytearray(raw)).cast("h"),
+            "array": lambda raw: array.array("h", raw),
+            "ctypes": lambda raw: (ctypes.c_int16 * 256).from_buffer_copy(raw),
+        }
+        for name, convert in conversions.items():
+            with self.subTest(name), TenVad(256) as vad:
+                results = [vad.process(frame) for frame in self._frames(convert)]
+                np.testing.assert_array_equal([p for p, _ in results], self.expected[0])
+                np.testing.assert_array_equal([f for _, f in results], self.expected[1])
+
+    def test_process_buffers_with_gate_and_metrics(self):
+        """Test buffers go through the energy gate and metrics paths."""
+        with TenVad(256, metrics=True) as vad, TenVad(256) as reference:
+            vad.set_energy_gate(EnergyGate())
+            reference.set_energy_gate(EnergyGate())
+            for frame in self._frames(bytes):
+                self.assertEqual(vad.process(frame), reference.process(np.frombuffer(frame, dtype="<i2")))
+            self.assertEqual(vad.stats()["frames"], 20)
+
+    def test_batch_and_stream_buffers(self):
+        """Test process_array, TenVadStream and TenVad.stream on raw bytes."""
+        for buffer in (self.raw, bytearray(self.raw), memoryview(self.raw), array.array("h", self.raw)):
+            probabilities, flags = TenVad(256).process_array(buffer)
+            np.testing.assert_array_equal(probabilities, self.expected[0])
+            np.testing.assert_array_equal(flags, self.expected[1])
+
+        stream = TenVadStream(hop_size=256)
+        view = memoryview(self.raw)
+        results = np.concatenate([stream.feed(view[start:start + 322]) for start in range(0, len(self.raw), 322)])
+        np.testing.assert_array_equal(results["probability"], self.expected[0])
+
+        async def source():
+            for start in range(0, len(self.raw), 1000):
+                yield self.raw[start:start + 1000]
+
+        async def collect():
+            return [results async for results in TenVad(256).stream(source())]
+
+        results = np.concatenate(asyncio.run(collect()))
+        np.testing.assert_array_equal(results["probability"], self.expected[0])
+
+    def test_invalid_buffers(self):
+        """Test buffers of the wrong size, item type or layout."""
+        vad = TenVad(256)
+        with self.assertRaises(ValueError):
+            vad.process(self.raw[:510])
+        with self.assertRaises(ValueError):
+            vad.process(bytearray(self.raw[:514]))
+        with self.assertRaises(ValueError):
+            vad.process_array(self.raw[:511])
+        with self.assertRaises(ValueError):
+            vad.process(memoryview(bytearray(self.raw[:1024])).cast("h")[::2])
+        with self.assertRaises(TypeError):
+            vad.process(array.array("f", [0.0] * 256))
+        with self.assertRaises(TypeError):
+            vad.process_array(array.array("i", [0] * 512))
+        with self.assertRaises(TypeError):
+            vad.process([0] * 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from ten_vad.eval import concatenate_scores, threshold_sweep
+
+
+def brute_force(scores, labels, threshold):
+    detected = scores >= threshold
+    return int(np.sum(detected & labels)), int(np.sum(detected & ~labels))
+
+
+class TestThresholdSweep(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.labels = rng.random(2000) < 0.4
+        self.scores = np.round(np.clip(rng.normal(0.4 + 0.3 * self.labels, 0.2), 0, 1), 2).astype(np.float32)
+
+    def test_counts_match_brute_force(self):
+        """Test TP/FP counts and rates on a threshold grid match direct comparisons."""
+        grid = np.arange(0, 1.01, 0.01)
+        sweep = threshold_sweep(self.scores, self.labels, grid)
+        for i, threshold in enumerate(grid):
+            self.assertEqual((sweep.tp[i], sweep.fp[i]), brute_force(self.scores, self.labels, threshold))
+        positives = int(self.labels.sum())
+        np.testing.assert_allclose(sweep.recall + sweep.fnr, 1.0)
+        np.testing.assert_allclose(sweep.fpr, sweep.fp / (len(self.labels) - positives))
+        np.testing.assert_allclose(sweep.precision[sweep.tp + sweep.fp > 0], (sweep.tp / (sweep.tp + sweep.fp))[sweep.tp + sweep.fp > 0])
+
+    def test_auc_and_best_f1(self):
+        """Test the exact sweep gives the rank-statistic AUC and the best F1 over all thresholds."""
+        sweep = threshold_sweep(self.scores, self.labels)
+        positive = self.scores[self.labels].astype(np.float64)[:, None]
+        negative = self.scores[~self.labels].astype(np.float64)[None, :]
+        expected = (np.sum(positive > negative) + 0.5 * np.sum(positive == negative)) / (positive.size * negative.size)
+        self.assertAlmostEqual(sweep.auc(), expected, places=12)
+        best = sweep.best_f1()
+        tp, fp = brute_force(self.scores, self.labels, best.threshold)
+        self.assertAlmostEqual(best.f1, 2 * tp / (tp + fp + self.labels.sum()))
+        self.assertAlmostEqual(best.f1, float(np.max(sweep.f1)))
+
+    def test_degenerate_inputs(self):
+        """Test empty inputs and single-class labels give zeros instead of NaNs."""
+        sweep = threshold_sweep(np.zeros(0, dtype=np.float32), np.zeros(0, dtype=bool), [0.5])
+        self.assertEqual(sweep.point(0).precision, 0.0)
+        sweep = threshold_sweep(np.array([0.2, 0.8]), np.array([1, 1]))
+        self.assertFalse(np.any(np.isnan(sweep.fpr)))
+        with self.assertRaises(ValueError):
+            threshold_sweep(np.zeros(3), np.zeros(2))
+
+    def test_concatenate_scores(self):
+        """Test per-file alignment with a delay and truncation to the shorter array."""
+        scores, labels = concatenate_scores(
+            [np.array([0.1, 0.2, 0.3, 0.4]), np.array([0.5, 0.6])], [np.array([0, 1, 1]), np.array([1, 0, 1])], delay=1
+        )
+        np.testing.assert_allclose(scores, [0.2, 0.3, 0.4, 0.6])
+        np.testing.assert_array_equal(labels, [False, True, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
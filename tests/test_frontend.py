@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from ten_vad.frontend import AudioFrontend, StreamingResampler, to_float_mono, to_int16
+
+
+def tone(frequency, sample_rate, seconds=1.0, amplitude=0.5):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def process_chunked(frontend, audio, rng):
+    out = []
+    start = 0
+    while start < len(audio):
+        size = int(rng.integers(0, 2000))
+        out.append(np.array(frontend.process(audio[start:start + size])))
+        start += size
+    return np.concatenate(out)
+
+
+class TestConversion(unittest.TestCase):
+    def test_dtypes(self):
+        """Test full-scale values of every supported sample type map onto int16."""
+        np.testing.assert_array_equal(to_int16(np.array([-1.0, 0.0, 0.5, 1.0])), [-32768, 0, 16384, 32767])
+        np.testing.assert_array_equal(to_int16(np.array([-2 ** 31, 65536, 2 ** 31 - 1], dtype=np.int32)), [-32768, 1, 32767])
+        np.testing.assert_array_equal(to_int16(np.array([0, 128, 255], dtype=np.uint8)), [-32768, 0, 32512])
+        samples = np.array([1, -2, 3], dtype=np.int16)
+        self.assertIs(to_int16(samples).base, samples.reshape(-1, 1).base)
+
+    def test_downmix(self):
+        """Test interleaved and 2-D multi-channel input is averaged."""
+        stereo = np.array([[0.5, -0.5], [0.25, 0.75]], dtype=np.float32)
+        np.testing.assert_allclose(to_float_mono(stereo, 2), [0.0, 16384.0])
+        np.testing.assert_array_equal(to_int16(stereo.reshape(-1), 2), [0, 16384])
+        with self.assertRaises(ValueError):
+            to_int16(np.zeros(5, dtype=np.float32), 2)
+        with self.assertRaises(TypeError):
+            to_int16(np.zeros(4, dtype=np.complex64))
+
+
+class TestStreamingResampler(unittest.TestCase):
+    def test_chunking_invariance(self):
+        """Test chunked resampling reproduces one-shot resampling exactly."""
+        rng = np.random.default_rng(0)
+        for rate in (8000, 22050, 32000, 44100, 48000):
+            audio = tone(440, rate) + rng.normal(0, 0.05, rate).astype(np.float32)
+            whole = np.array(AudioFrontend(rate).process(audio))
+            np.testing.assert_array_equal(process_chunked(AudioFrontend(rate), audio, rng), whole, err_msg=str(rate))
+
+    def test_accuracy(self):
+        """Test a resampled in-band tone matches the ideal 16 kHz tone after the filter delay."""
+        for rate in (8000, 44100, 48000):
+            resampler = StreamingResampler(rate)
+            output = resampler.process(tone(1000, rate) * 32768.0)
+            delay = 16 * max(resampler.up, resampler.down) / resampler.down  # Half the prototype length, in output samples
+            t = (np.arange(len(output)) - delay) / 16000.0
+            expected = 0.5 * 32768.0 * np.sin(2 * np.pi * 1000 * t)
+            steady = slice(len(output) // 4, -len(output) // 4)
+            self.assertLess(np.max(np.abs(output[steady] - expected[steady])), 4.0, rate)
+
+    def test_alias_rejection(self):
+        """Test content above 8 kHz is removed when downsampling."""
+        output = AudioFrontend(48000).process(tone(10000, 48000))
+        self.assertLess(np.max(np.abs(output[1000:-1000].astype(np.int32))), 8)
+
+    def test_multichannel_input(self):
+        """Test 48 kHz stereo float input gives the same result as its mono downmix."""
+        left = tone(300, 48000)
+        stereo = np.stack([left, left], axis=1)
+        np.testing.assert_array_equal(AudioFrontend(48000, 2).process(stereo), AudioFrontend(48000).process(left))
+
+
+if __name__ == "__main__":
+    unittest.main()
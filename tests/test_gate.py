@@ -0,0 +1,93 @@
+import unittest
+import numpy as np
+from ten_vad import EnergyGate, TenVadStream
+
+
+class TestEnergyGatePlan(unittest.TestCase):
+    def test_levels(self):
+        """Test RMS and peak levels in dBFS, including full-scale negative samples."""
+        frames = np.zeros((3, 256), dtype=np.int16)
+        frames[1] = 3277
+        frames[2, 0] = -32768
+        rms, peak = EnergyGate().levels(frames)
+        self.assertEqual(rms[0], -np.inf)
+        self.assertAlmostEqual(rms[1], -20.0, places=2)
+        self.assertAlmostEqual(peak[2], 0.0)
+
+    def test_runs_across_blocks(self):
+        """Test hold, warm-up frames and state carried between blocks."""
+        loud = np.full((4, 16), 8000, dtype=np.int16)
+        quiet = np.zeros((10, 16), dtype=np.int16)
+        gate = EnergyGate(hold=2, warmup=3)
+        self.assertEqual([run[:2] for run in gate.plan(np.concatenate((loud, quiet[:6])))], [(0, 6)])
+        runs = gate.plan(np.concatenate((quiet[:1], loud)))
+        self.assertEqual(len(runs), 1)
+        start, end, warmup = runs[0]
+        self.assertEqual((start, end, len(warmup)), (1, 5, 3))
+        self.assertEqual((gate.frames, gate.gated_frames), (15, 5))
+
+
+class TestTenVadEnergyGate(unittest.TestCase):
+    def setUp(self):
+        try:
+            from ten_vad import TenVad
+            self.TenVad = TenVad
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"TEN VAD library not available: {exc}")
+        rng = np.random.default_rng(4)
+        self.loud = (rng.standard_normal(256 * 30) * 4000).astype(np.int16)
+        self.audio = np.concatenate((self.loud, np.zeros(256 * 50, dtype=np.int16), self.loud))
+
+    def test_matches_model_outside_gated_frames(self):
+        """Test gated frames read 0 and the model sees hold frames, warm-up frames, then the audio."""
+        vad = self.TenVad(256)
+        gate = vad.set_energy_gate(EnergyGate(hold=4, warmup=6))
+        probs, flags = vad.process_array(self.audio)
+        self.assertEqual(gate.gated_frames, 46)
+        np.testing.assert_array_equal(probs[34:80], 0)
+        np.testing.assert_array_equal(flags[34:80], 0)
+        reference = self.TenVad(256)
+        expected = reference.process_array(np.concatenate((self.loud, np.zeros(256 * 4, dtype=np.int16))))[0]
+        np.testing.assert_array_equal(probs[:34], expected)
+        reference.process_array(np.zeros(256 * 6, dtype=np.int16))
+        np.testing.assert_array_equal(probs[80:], reference.process_array(self.loud)[0])
+
+    def test_entry_points_agree(self):
+        """Test per-frame, unchecked, streamed and whole-array processing give the same gated results."""
+        expected = self._gated().process_array(self.audio)
+        frames = self.audio.reshape(-1, 256)
+        vad = self._gated()
+        per_frame = [vad.process(frame) for frame in frames]
+        vad = self._gated()
+        unchecked = [vad.process_unchecked(frame) for frame in frames]
+        stream = TenVadStream(self._gated())
+        streamed = np.concatenate([stream.feed(self.audio[i:i + 1000]) for i in range(0, len(self.audio), 1000)])
+        for result in (per_frame, unchecked):
+            np.testing.assert_array_equal(np.array([p for p, _ in result], dtype=np.float32), expected[0])
+            np.testing.assert_array_equal(np.array([f for _, f in result]), expected[1])
+        np.testing.assert_array_equal(streamed["probability"], expected[0])
+
+    def test_callback_metrics_and_reset(self):
+        """Test callbacks see every frame, metrics count gated frames and reset clears the gate state."""
+        seen = []
+        vad = self.TenVad(256, callback=lambda probability, flag: seen.append(probability), metrics=True)
+        gate = vad.set_energy_gate(EnergyGate(hold=4, warmup=6))
+        probs, _ = vad.process_array(self.audio)
+        self.assertEqual(seen, probs.tolist())
+        self.assertEqual(vad.stats()["gated_frames"], gate.gated_frames)
+        vad.process_array(np.zeros(256 * 10, dtype=np.int16))
+        vad.reset()
+        silence = np.zeros(256 * 10, dtype=np.int16)
+        np.testing.assert_array_equal(vad.process_array(silence)[0][:4], self.TenVad(256).process_array(silence[:1024])[0])
+        vad.set_energy_gate(None)
+        self.assertIsNone(vad.energy_gate)
+
+    def _gated(self):
+        vad = self.TenVad(256)
+        vad.set_energy_gate(EnergyGate(hold=4, warmup=6))
+        return vad
+
+
+if __name__ == '__main__':
+    unittest.main()
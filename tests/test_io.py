@@ -0,0 +1,98 @@
+import os
+import struct
+import tempfile
+import unittest
+import wave
+import numpy as np
+from ten_vad import TenVad
+from ten_vad.io import WavReader, process_wav
+
+TESTSET_WAV = os.path.abspath(os.path.join(os.path.dirname(__file__), "../testset/testset-audio-01.wav"))
+
+
+def write_wav(path, samples, sample_rate=16000, channels=1):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(np.ascontiguousarray(samples, dtype="<i2").tobytes())
+
+
+class TestWavReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.samples = (rng.standard_normal(16000) * 3000).astype(np.int16)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_mono_and_stereo(self):
+        """Test header parsing and zero-copy sample views."""
+        write_wav(self.path("mono.wav"), self.samples)
+        with WavReader(self.path("mono.wav")) as wav:
+            self.assertEqual((wav.info.sample_rate, wav.info.channels, len(wav)), (16000, 1, 16000))
+            np.testing.assert_array_equal(wav.samples, self.samples)
+            self.assertFalse(wav.samples.flags.owndata)
+            frames = wav.frames(256)
+            self.assertEqual(frames.shape, (62, 256))
+            blocks = [block.copy() for block in wav.iter_frames(256, block_frames=10)]
+            np.testing.assert_array_equal(np.concatenate(blocks), self.samples[:62 * 256].reshape(62, 256))
+        stereo = self.samples.reshape(-1, 2)
+        write_wav(self.path("stereo.wav"), stereo, sample_rate=48000, channels=2)
+        with WavReader(self.path("stereo.wav")) as wav:
+            np.testing.assert_array_equal(wav.samples, stereo)
+            with self.assertRaises(ValueError):
+                wav.frames(256)
+
+    def test_rf64_extensible_and_unfinished_headers(self):
+        """Test RF64 with a ds64 chunk, WAVE_FORMAT_EXTENSIBLE and a zero data size."""
+        data = self.samples.astype("<i2").tobytes()
+        fmt = struct.pack("<HHIIHHHHIH14s", 0xFFFE, 1, 16000, 32000, 2, 16, 22, 16, 4, 1, b"\x00" * 14)
+        ds64 = struct.pack("<QQQI", 0, len(data), len(self.samples), 0)
+        body = b"WAVE" + b"ds64" + struct.pack("<I", len(ds64)) + ds64
+        body += b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", 0xFFFFFFFF) + data
+        with open(self.path("rf64.wav"), "wb") as f:
+            f.write(b"RF64" + struct.pack("<I", 0xFFFFFFFF) + body)
+        with WavReader(self.path("rf64.wav")) as wav:
+            np.testing.assert_array_equal(wav.samples, self.samples)
+
+        write_wav(self.path("unfinished.wav"), self.samples)
+        with open(self.path("unfinished.wav"), "r+b") as f:
+            f.seek(40)
+            f.write(struct.pack("<I", 0))
+        with WavReader(self.path("unfinished.wav")) as wav:
+            np.testing.assert_array_equal(wav.samples, self.samples)
+
+    def test_invalid_files(self):
+        """Test non-WAV input and unsupported sample formats."""
+        with open(self.path("bad.wav"), "wb") as f:
+            f.write(b"not a wav file at all")
+        with self.assertRaises(ValueError):
+            WavReader(self.path("bad.wav"))
+        with wave.open(self.path("24bit.wav"), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(3)
+            f.setframerate(16000)
+            f.writeframes(b"\x00" * 30)
+        with self.assertRaises(ValueError):
+            WavReader(self.path("24bit.wav"))
+
+    def test_process_wav_matches_process_array(self):
+        """Test block-wise processing of a mapped file equals processing it in memory."""
+        try:
+            vad = TenVad(256, 0.5)
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        with WavReader(TESTSET_WAV) as wav:
+            probabilities, flags = process_wav(vad, wav, block_frames=100)
+            expected, expected_flags = TenVad(256, 0.5).process_array(np.array(wav.samples))
+        np.testing.assert_array_equal(probabilities, expected)
+        np.testing.assert_array_equal(flags, expected_flags)
+
+
+if __name__ == '__main__':
+    unittest.main()
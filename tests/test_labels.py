@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ten_vad.labels import LabelDataset, read_scv
+
+
+class TestLabels(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "a.scv")
+        self.write(self.path, "a,0.000,0.400,0,0.400,1.204,1,1.204,1.440,0")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def write(path, line):
+        with open(path, "w") as f:
+            f.write(line + "\n")
+
+    def test_rasterize(self):
+        """Test segments expand to rounded frame counts, cut to the labelled span."""
+        segments = read_scv(self.path)
+        np.testing.assert_array_equal(segments.labels, [0, 1, 0])
+        frames = segments.rasterize(hop_size=1600)  # 0.1 s frames
+        np.testing.assert_array_equal(frames, [0] * 4 + [1] * 8 + [0] * 2)
+        self.assertEqual(frames.dtype, np.uint8)
+        self.assertEqual(len(segments.rasterize(hop_size=256)), int(1.44 / 0.016))
+
+    def test_cache(self):
+        """Test files are parsed once and re-read after they change."""
+        first = read_scv(self.path)
+        self.assertIs(read_scv(self.path), first)
+        self.assertFalse(first.starts.flags.writeable)
+        self.write(self.path, "a,0.000,1.000,1")
+        os.utime(self.path, ns=(0, 1))
+        np.testing.assert_array_equal(read_scv(self.path).labels, [1])
+
+    def test_lazy_dataset(self):
+        """Test files are only read as iteration reaches them."""
+        dataset = LabelDataset.for_wavs([os.path.join(self.tmp.name, "a.wav"), os.path.join(self.tmp.name, "missing.wav")])
+        frames = dataset.iter_frames(hop_size=1600)
+        path, labels = next(frames)
+        self.assertEqual(path, self.path)
+        self.assertEqual(len(labels), 14)
+        with self.assertRaises(FileNotFoundError):
+            next(frames)
+
+    def test_malformed(self):
+        """Test lines that are not start,end,label triples are rejected."""
+        self.write(self.path, "a,0.0,1.0")
+        with self.assertRaises(ValueError):
+            read_scv(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import gc
+import re
+import unittest
+import numpy as np
+from ten_vad import metrics
+from ten_vad.metrics import LatencyHistogram, VadMetrics
+
+
+class TestHistogram(unittest.TestCase):
+    def test_quantiles(self):
+        """Test interpolated quantiles stay within one bucket of the exact values."""
+        durations = np.random.default_rng(0).lognormal(np.log(150e3), 0.3, 20000).astype(np.int64)
+        histogram = LatencyHistogram()
+        for duration in durations.tolist():
+            histogram.record(duration)
+        self.assertEqual(histogram.count, len(durations))
+        for q in (0.5, 0.99, 0.999):
+            exact = np.quantile(durations, q) / 1e9
+            self.assertLess(abs(histogram.quantile(q) / exact - 1), 2 ** 0.25 - 1)
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+    def test_native_errors(self):
+        """Test the native wrapper counts calls, time and error codes."""
+        counters = VadMetrics()
+        codes = iter([0, -3, -3, -1])
+        timed = counters.time_native(lambda *args: next(codes))
+        self.assertEqual([timed(), timed(), timed(), timed()], [0, -3, -3, -1])
+        self.assertEqual(counters.latency.count, 4)
+        self.assertEqual(counters.snapshot()["errors"], {"invalid_state": 2, "invalid_param": 1})
+
+
+class TestVadMetrics(unittest.TestCase):
+    def setUp(self):
+        try:
+            from ten_vad import TenVad
+            self.TenVad = TenVad
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"TEN VAD library not available: {exc}")
+        metrics.reset()
+        self.audio = (np.random.default_rng(1).standard_normal(256 * 50) * 3000).astype(np.int16)
+
+    def test_disabled(self):
+        """Test handles without metrics call the native functions directly."""
+        vad = self.TenVad()
+        self.assertIsNone(vad.stats())
+        self.assertIs(vad._process, vad.vad_library.ten_vad_process)
+        vad.enable_metrics()
+        vad.enable_metrics(False)
+        self.assertIs(vad._process, vad.vad_library.ten_vad_process)
+
+    def test_counts(self):
+        """Test every process path is counted and totals survive collected handles."""
+        vad = self.TenVad(metrics=True)
+        probabilities, flags = vad.process_array(self.audio)
+        vad.process(self.audio[:256])
+        vad.process_unchecked(self.audio[:256])
+        stats = vad.stats()
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["frames"], 52)
+        self.assertGreaterEqual(stats["speech_frames"], int(flags.sum()))
+        self.assertGreater(stats["native_seconds"], 0)
+        self.assertGreaterEqual(stats["wrapper_overhead_seconds"], 0)
+        self.assertTrue(stats["latency"]["p50"] <= stats["latency"]["p99"] <= stats["latency"]["p999"])
+
+        live = metrics.stats()["instances"]
+        other = self.TenVad(metrics=True)
+        other.process_array(self.audio)
+        self.assertEqual(metrics.stats()["instances"], live + 1)
+        del other
+        gc.collect()
+        totals = metrics.stats()
+        self.assertEqual(totals["frames"], 102)
+        self.assertEqual(totals["instances"], live)
+
+    def test_toggle(self):
+        """Test disabling retires a handle's counts at once and re-enabling does not count it twice."""
+        live = metrics.stats()["instances"]
+        vad = self.TenVad(metrics=True)
+        vad.process_array(self.audio)
+        for _ in range(3):
+            vad.enable_metrics(False)
+            self.assertEqual(metrics.stats()["instances"], live)
+            vad.enable_metrics()
+            self.assertEqual(metrics.stats()["instances"], live + 1)
+        vad.process_array(self.audio)
+        self.assertEqual(vad.stats()["frames"], 50)
+        self.assertEqual(metrics.stats()["frames"], 100)
+        del vad
+        gc.collect()
+        totals = metrics.stats()
+        self.assertEqual((totals["instances"], totals["frames"]), (live, 100))
+
+    def test_prometheus(self):
+        """Test the exposition text is well formed and histogram buckets are cumulative."""
+        vad = self.TenVad(metrics=True)
+        vad.process_array(self.audio)
+        text = metrics.render_prometheus()
+        sample = re.compile(r'^[a-z_]+(\{[a-z]+="[^"]*"(,[a-z]+="[^"]*")*\})? [-+0-9.e]+$')
+        for line in text.splitlines():
+            self.assertTrue(line.startswith("# ") or sample.match(line), line)
+        self.assertIn("ten_vad_frames_total 50", text)
+        buckets = [int(value) for value in re.findall(r"frame_latency_seconds_bucket\{[^}]*\} (\d+)", text)]
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(buckets[-1], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
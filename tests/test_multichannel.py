@@ -0,0 +1,78 @@
+import os
+import unittest
+import numpy as np
+from ten_vad import TenVad
+
+
+class TestMultiChannelVad(unittest.TestCase):
+    def setUp(self):
+        try:
+            from ten_vad import MultiChannelVad
+            self.MultiChannelVad = MultiChannelVad
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"TEN VAD library not available: {exc}")
+        from ten_vad.io import WavReader
+        testset = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "testset")
+        with WavReader(os.path.join(testset, "testset-audio-01.wav")) as first, WavReader(
+            os.path.join(testset, "testset-audio-03.wav")
+        ) as second:
+            length = 256 * 600
+            # The second talker joins after 200 frames, while the first one is still speaking
+            late = np.concatenate((np.zeros(256 * 200, dtype=np.int16), second.samples))[:length]
+            self.stereo = np.stack((first.samples[:length], late), axis=1)
+
+    def test_matches_single_channel_handles(self):
+        """Test each channel matches a mono handle, in one pass, in chunks and sequentially."""
+        expected = [TenVad(256).process_array(np.ascontiguousarray(self.stereo[:, c])) for c in range(2)]
+        for parallel in (False, True):
+            with self.MultiChannelVad(2, parallel=parallel) as vad:
+                probabilities, flags = vad.process_array(self.stereo, block_frames=7)
+                for c in range(2):
+                    np.testing.assert_array_equal(probabilities[:, c], expected[c][0])
+                    np.testing.assert_array_equal(flags[:, c], expected[c][1])
+                vad.reset()
+                chunks = [vad.feed(self.stereo[i:i + 1000]) for i in range(0, len(self.stereo), 1000)]
+                streamed = np.concatenate(chunks)
+                np.testing.assert_array_equal(streamed["probability"], probabilities)
+                np.testing.assert_array_equal(streamed["offset"], np.arange(len(probabilities)) * 256)
+                np.testing.assert_array_equal(vad.process_array(self.stereo.reshape(-1))[0], probabilities)
+
+    def test_statistics(self):
+        """Test speech, silence, overlap and talk-over counts against the flags."""
+        with self.MultiChannelVad(2) as vad:
+            _, flags = vad.process_array(self.stereo)
+            stats = vad.stats
+        active = flags.astype(bool)
+        self.assertEqual(stats.frames, len(flags))
+        np.testing.assert_array_equal(stats.speech_frames, active.sum(axis=0))
+        self.assertEqual(stats.overlap_frames, int(np.all(active, axis=1).sum()))
+        self.assertEqual(stats.silence_frames, int((~active.any(axis=1)).sum()))
+        onsets = active & ~np.vstack(([False, False], active[:-1]))
+        previous_other = np.vstack(([False, False], active[:-1, ::-1]))
+        np.testing.assert_array_equal(stats.talk_overs, (onsets & previous_other).sum(axis=0))
+        self.assertGreater(stats.talk_overs[1], 0)
+        self.assertGreater(stats.overlap_seconds, 0)
+
+    def test_crosstalk(self):
+        """Test a channel carrying a faint copy of the other is counted as crosstalk."""
+        stereo = self.stereo.copy()
+        stereo[:, 1] = stereo[:, 0] // 16  # About 24 dB below channel 0
+        with self.MultiChannelVad(2, crosstalk_db=15.0) as vad:
+            _, flags = vad.process_array(stereo)
+            stats = vad.stats
+        both = int(np.all(flags, axis=1).sum())
+        self.assertGreater(both, 0)
+        np.testing.assert_array_equal(stats.crosstalk_frames, [0, both])
+
+    def test_invalid_input(self):
+        """Test shape and type validation."""
+        with self.MultiChannelVad(2, parallel=False) as vad:
+            with self.assertRaises(ValueError):
+                vad.feed(np.zeros((256, 3), dtype=np.int16))
+            with self.assertRaises(TypeError):
+                vad.feed(np.zeros((256, 2), dtype=np.float32))
+
+
+if __name__ == '__main__':
+    unittest.main()
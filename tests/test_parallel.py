@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import unittest
+import numpy as np
+from ten_vad import TenVad, TenVadHandlePool
+from ten_vad.io import WavReader
+from ten_vad.parallel import chunk_bounds, compare_with_sequential, main, process_chunked
+
+TESTSET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../testset"))
+
+
+class TestChunkBounds(unittest.TestCase):
+    def test_bounds(self):
+        """Test chunks cover every frame once and are never shorter than their warm-up."""
+        self.assertEqual(chunk_bounds(100, 4, 10), [(0, 0, 25), (15, 25, 50), (40, 50, 75), (65, 75, 100)])
+        self.assertEqual(chunk_bounds(100, 4, 40), [(0, 0, 50), (10, 50, 100)])
+        self.assertEqual(chunk_bounds(5, 8, 0), [(0, 0, 1), (1, 1, 2), (2, 2, 3), (3, 3, 4), (4, 4, 5)])
+        self.assertEqual(chunk_bounds(0, 4, 64), [(0, 0, 0)])
+
+
+class TestProcessChunked(unittest.TestCase):
+    def setUp(self):
+        try:
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        with WavReader(os.path.join(TESTSET_DIR, "testset-audio-01.wav")) as first, WavReader(
+            os.path.join(TESTSET_DIR, "testset-audio-03.wav")
+        ) as second:
+            self.audio = np.concatenate((first.samples, second.samples))
+        self.sequential = TenVad(256).process_array(self.audio)
+
+    def test_single_chunk_matches_sequential(self):
+        """Test one chunk, and the first chunk of many, equal the sequential pass."""
+        probabilities, flags = process_chunked(self.audio, chunks=1)
+        np.testing.assert_array_equal(probabilities, self.sequential[0])
+        np.testing.assert_array_equal(flags, self.sequential[1])
+        probabilities, _ = process_chunked(self.audio, chunks=4, warmup_frames=16)
+        end = chunk_bounds(len(probabilities), 4, 16)[0][2]
+        np.testing.assert_array_equal(probabilities[:end], self.sequential[0][:end])
+
+    def test_chunks_match_primed_handles(self):
+        """Test each chunk equals a fresh handle run over its warm-up and frames."""
+        for warmup in (0, 32):
+            probabilities, flags = process_chunked(self.audio, chunks=3, warmup_frames=warmup, max_workers=2)
+            for warmup_start, start, end in chunk_bounds(len(flags), 3, warmup):
+                expected, expected_flags = TenVad(256).process_array(self.audio[warmup_start * 256:end * 256])
+                np.testing.assert_array_equal(probabilities[start:end], expected[start - warmup_start:])
+                np.testing.assert_array_equal(flags[start:end], expected_flags[start - warmup_start:])
+
+    def test_handle_pool(self):
+        """Test handles come from and go back to a pool."""
+        with TenVadHandlePool() as pool:
+            probabilities, _ = process_chunked(self.audio, chunks=4, handle_pool=pool)
+            probabilities_again, _ = process_chunked(self.audio, chunks=4, handle_pool=pool)
+            self.assertEqual(pool.in_use, 0)
+            self.assertLessEqual(pool.created, 4)
+            self.assertGreater(pool.reused, 0)
+        np.testing.assert_array_equal(probabilities, probabilities_again)
+
+    def test_deviation_report(self):
+        """Test the deviation report and that chunk flags agree with the sequential pass on most frames."""
+        report = compare_with_sequential(self.audio, 4, 64, sequential=self.sequential)
+        self.assertEqual((report.frames, report.chunks, report.warmup_frames), (len(self.sequential[1]), 4, 64))
+        self.assertLessEqual(report.mean_deviation, report.max_deviation)
+        self.assertLess(report.flag_mismatches, 0.05 * report.frames)
+        self.assertEqual(compare_with_sequential(self.audio, 1).max_deviation, 0.0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main([os.path.join(TESTSET_DIR, "testset-audio-01.wav"), "--warmup", "0,64"]), 0)
+        self.assertIn("warmup 64: max deviation", output.getvalue())
+        self.assertIn("F1", output.getvalue())
+
+    def test_invalid_input(self):
+        """Test input validation and empty audio."""
+        with self.assertRaises(ValueError):
+            process_chunked(self.audio, warmup_frames=-1)
+        with self.assertRaises(TypeError):
+            process_chunked(self.audio.astype(np.float32))
+        probabilities, flags = process_chunked(self.audio[:100])
+        self.assertEqual((len(probabilities), flags.dtype), (0, np.uint8))
+
+
+if __name__ == "__main__":
+    unittest.main()
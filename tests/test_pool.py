@@ -0,0 +1,194 @@
+import unittest
+from unittest import mock
+import numpy as np
+import threading
+import time
+from ten_vad import EnergyGate, TenVad, TenVadHandlePool, TenVadPool, metrics
+
+
+class TestTenVadPool(unittest.TestCase):
+    def setUp(self):
+        """Create a small pool, skipping when the native library is unavailable."""
+        try:
+            self.pool = TenVadPool(max_workers=4, hop_size=256, threshold=0.5, max_batch=2)
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        rng = np.random.default_rng(0)
+        self.audio = {
+            stream_id: (rng.standard_normal(256 * 12) * 3000).astype(np.int16)
+            for stream_id in range(6)
+        }
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_matches_sequential_processing(self):
+        """Test chunks of many streams are processed in order per stream."""
+        futures = {stream_id: [] for stream_id in self.audio}
+        for chunk in range(4):
+            for stream_id, audio in self.audio.items():
+                futures[stream_id].append(self.pool.submit(stream_id, audio[chunk * 768:(chunk + 1) * 768]))
+        for stream_id, audio in self.audio.items():
+            probs = np.concatenate([future.result()[0] for future in futures[stream_id]])
+            expected, _ = TenVad(256, 0.5).process_array(audio)
+            np.testing.assert_array_equal(probs, expected)
+        self.assertEqual(len(self.pool), len(self.audio))
+
+    def test_process_mapping(self):
+        """Test the blocking multi-stream helper."""
+        results = self.pool.process({"a": self.audio[0], "b": self.audio[1]})
+        self.assertEqual(set(results), {"a", "b"})
+        self.assertEqual(len(results["a"][0]), 12)
+
+    def test_stream_management(self):
+        """Test explicit stream creation, removal and errors."""
+        vad = self.pool.add_stream("custom", hop_size=160)
+        self.assertEqual(vad.hop_size, 160)
+        with self.assertRaises(KeyError):
+            self.pool.add_stream("custom")
+        self.assertIn("custom", self.pool)
+        self.pool.remove_stream("custom")
+        self.assertNotIn("custom", self.pool)
+        future = self.pool.submit("bad", np.zeros(256, dtype=np.float32))
+        with self.assertRaises(TypeError):
+            future.result()
+
+    def test_closed_pool(self):
+        """Test a closed pool rejects new work."""
+        self.pool.close()
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(0, self.audio[0])
+
+    def test_removed_streams_close_handles(self):
+        """Test remove_stream and close close the stream handles, after their queued buffers."""
+        idle = self.pool.add_stream("idle")
+        self.pool.remove_stream("idle")
+        self.assertTrue(idle.closed)
+        busy = self.pool.add_stream("busy")
+        futures = [self.pool.submit("busy", self.audio[0]) for _ in range(8)]
+        self.pool.remove_stream("busy")
+        for future in futures:
+            self.assertEqual(len(future.result()[0]), 12)
+        deadline = time.monotonic() + 5  # The worker closes the handle after resolving the last future
+        while not busy.closed and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertTrue(busy.closed)
+        with self.assertRaises(KeyError):
+            self.pool.remove_stream("busy")
+        handles = [self.pool.add_stream(stream_id) for stream_id in ("a", "b")]
+        futures = [self.pool.submit("a", self.audio[1]) for _ in range(4)]
+        self.pool.close()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual([vad.closed for vad in handles], [True, True])
+
+    def test_rejected_streams_release_handles(self):
+        """Test add_stream closes the handle it created when the stream is rejected."""
+        self.pool.add_stream("a")
+        created = []
+
+        def create(*args):
+            created.append(TenVad(*args))
+            return created[-1]
+
+        with mock.patch("ten_vad.pool.TenVad", side_effect=create):
+            with self.assertRaises(KeyError):
+                self.pool.add_stream("a")
+            self.pool.close()
+            with self.assertRaises(RuntimeError):
+                self.pool.add_stream("b")
+        self.assertEqual([vad.closed for vad in created], [True, True])
+
+    def test_submit_racing_close(self):
+        """Test a submit that passes the closed check while the executor shuts down fails its future."""
+        self.pool.submit(0, self.audio[0]).result()
+        self.pool._executor.shutdown(wait=True)  # As close() would, right after submit's checks
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(0, self.audio[0])
+        self.assertFalse(self.pool._streams[0].pending)
+        self.assertFalse(self.pool._streams[0].scheduled)
+
+
+class TestTenVadHandlePool(unittest.TestCase):
+    def setUp(self):
+        """Create a warm handle pool, skipping when the native library is unavailable."""
+        try:
+            self.pool = TenVadHandlePool(min_size=2, max_size=3, idle_timeout=60.0)
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        self.audio = (np.random.default_rng(1).standard_normal(256 * 20) * 3000).astype(np.int16)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_reuse_and_reset(self):
+        """Test released handles are reused with fresh state, threshold, metrics and no callback or gate."""
+        self.assertEqual(len(self.pool), 2)
+        expected, _ = TenVad(256, 0.5).process_array(self.audio)
+        with self.pool.handle() as vad:
+            first = vad
+            vad.process_array(self.audio[:2560])
+            vad.set_threshold(0.9)
+            vad.callback = lambda probability, flag: None
+            vad.set_energy_gate(EnergyGate())
+            vad.enable_metrics()
+        self.assertEqual(self.pool.created, 2)
+        with self.pool.handle() as vad:
+            self.assertIs(vad, first)
+            self.assertEqual(vad.threshold, 0.5)
+            self.assertIsNone(vad.callback)
+            self.assertIsNone(vad.energy_gate)
+            self.assertIsNone(vad.stats())
+            np.testing.assert_array_equal(vad.process_array(self.audio)[0], expected)
+        self.assertEqual(self.pool.reused, 2)
+        default = metrics.enabled_by_default()
+        metrics.enable_by_default()
+        try:
+            metered = self.pool.acquire(hop_size=160)
+        finally:
+            metrics.enable_by_default(default)
+        metered.enable_metrics(False)
+        self.pool.release(metered)
+        with self.pool.handle(hop_size=160) as vad:
+            self.assertIs(vad, metered)
+            self.assertIsNotNone(vad.stats())
+
+    def test_keys_and_limits(self):
+        """Test handles are kept per (hop_size, threshold) and max_size blocks."""
+        vad = self.pool.acquire(hop_size=160, threshold=0.3)
+        self.assertEqual((vad.hop_size, vad.threshold), (160, 0.3))
+        held = [self.pool.acquire() for _ in range(3)]
+        self.assertEqual(self.pool.in_use, 4)
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(timeout=0.05)
+        threading.Timer(0.05, self.pool.release, (held[0],)).start()
+        self.assertIs(self.pool.acquire(timeout=5), held[0])
+        with self.assertRaises(ValueError):
+            self.pool.release(TenVad())
+        self.pool.release(vad)
+        with self.assertRaises(ValueError):
+            self.pool.release(vad)
+
+    def test_idle_eviction(self):
+        """Test idle handles beyond min_size are destroyed after idle_timeout."""
+        self.pool.idle_timeout = 0.01
+        handles = [self.pool.acquire() for _ in range(3)] + [self.pool.acquire(hop_size=160)]
+        for vad in handles:
+            self.pool.release(vad)
+        time.sleep(0.02)
+        self.pool.evict_idle()
+        self.assertEqual(len(self.pool), 2)
+        self.assertTrue(handles[3].closed)
+
+    def test_close(self):
+        """Test closing destroys idle handles and handles released afterwards."""
+        vad = self.pool.acquire()
+        self.pool.close()
+        self.assertEqual(len(self.pool), 0)
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire()
+        self.pool.release(vad)
+        self.assertTrue(vad.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+import unittest
+import numpy as np
+from ten_vad import TenVad
+from ten_vad.io import WavReader
+
+TESTSET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../testset"))
+
+
+class TestDeadlineScheduler(unittest.TestCase):
+    def setUp(self):
+        try:
+            from ten_vad import DeadlineScheduler
+            self.DeadlineScheduler = DeadlineScheduler
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        with WavReader(os.path.join(TESTSET_DIR, "testset-audio-01.wav")) as wav:
+            self.audio = np.array(wav.samples[: 256 * 200])
+
+    def _join(self, results):
+        """Check results are contiguous from frame 0 and join them."""
+        start = 0
+        for result in results:
+            self.assertEqual(result.start, start)
+            start = result.end
+        return (
+            np.concatenate([result.probabilities for result in results]),
+            np.concatenate([result.flags for result in results]),
+        )
+
+    def test_matches_process_array_without_overload(self):
+        """Test every frame runs through the model, in order, for chunks that split frames."""
+        expected = TenVad(256).process_array(self.audio)
+        with self.DeadlineScheduler(max_workers=2, frame_cost=1e-9) as scheduler:
+            scheduler.add_stream("a")
+            scheduler.add_stream("b", priority=1)
+            results = {"a": [], "b": []}
+            for start in range(0, len(self.audio), 1000):
+                self.assertGreaterEqual(scheduler.feed("a", self.audio[start:start + 1000], now=0.0), 0)
+                scheduler.feed("b", self.audio[start:start + 1000], now=0.0)
+                for result in scheduler.run_tick(now=0.0):
+                    self.assertFalse(result.estimated)
+                    results[result.stream_id].append(result)
+            stats = scheduler.stats()
+        for stream_id in ("a", "b"):
+            probabilities, flags = self._join(results[stream_id])
+            np.testing.assert_array_equal(probabilities, expected[0])
+            np.testing.assert_array_equal(flags, expected[1])
+        self.assertEqual((stats["frames"], stats["estimated_frames"], stats["deadline_misses"]), (400, 0, 0))
+
+    def test_overload_protects_high_priority(self):
+        """Test protected streams get the capacity and sheddable streams fall back to the estimate."""
+        # Capacity: 0.016 s * 1 worker / 0.0016 s = 10 frames per tick
+        with self.DeadlineScheduler(max_workers=1, tick=0.016, latency=0.1, frame_cost=0.0016) as scheduler:
+            scheduler.add_stream("low", priority=0)
+            scheduler.add_stream("high", priority=1)
+            scheduler.feed("low", self.audio[: 256 * 20], now=0.0)
+            scheduler.feed("high", self.audio[: 256 * 20], now=0.0)
+            first = scheduler.run_tick(now=0.0)
+            self.assertEqual([(r.stream_id, r.start, len(r.flags), r.estimated) for r in first], [("high", 0, 10, False)])
+            self.assertEqual(scheduler.queue_depth, 30)
+            second = scheduler.run_tick(now=0.09)
+            self.assertEqual(
+                sorted((r.stream_id, r.start, len(r.flags), r.estimated) for r in second),
+                [("high", 10, 10, False), ("low", 0, 20, True)],
+            )
+            stats = scheduler.stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["streams"]["high"]["frames"], 20)
+        self.assertEqual(stats["streams"]["low"]["estimated_frames"], 20)
+        probabilities, _ = self._join([r for r in first + second if r.stream_id == "high"])
+        np.testing.assert_array_equal(probabilities, TenVad(256).process_array(self.audio[: 256 * 20])[0])
+
+    def test_coalesces_backlog(self):
+        """Test the oldest frames beyond max_backlog are estimated and the rest run, in frame order."""
+        with self.DeadlineScheduler(max_workers=1, max_backlog=8, frame_cost=1e-9) as scheduler:
+            scheduler.add_stream("low")
+            scheduler.feed("low", self.audio[: 256 * 30], now=0.0)
+            results = scheduler.run_tick(now=0.0)
+        self.assertEqual([(r.start, len(r.flags), r.estimated) for r in results], [(0, 22, True), (22, 8, False)])
+        # The model never saw the shed frames
+        np.testing.assert_array_equal(
+            results[1].probabilities, TenVad(256).process_array(self.audio[256 * 22:256 * 30])[0]
+        )
+
+    def test_energy_estimate(self):
+        """Test the estimate maps silence to 0 and loud frames to 1."""
+        audio = np.concatenate((np.zeros(256 * 4, dtype=np.int16), np.full(256 * 4, 10000, dtype=np.int16)))
+        with self.DeadlineScheduler(max_workers=1, max_backlog=0, frame_cost=1e-9) as scheduler:
+            scheduler.add_stream("low")
+            scheduler.feed("low", audio, now=0.0)
+            (result,) = scheduler.run_tick(now=0.0)
+        self.assertTrue(result.estimated)
+        np.testing.assert_array_equal(result.probabilities, [0, 0, 0, 0, 1, 1, 1, 1])
+        np.testing.assert_array_equal(result.flags, [0, 0, 0, 0, 1, 1, 1, 1])
+
+    def test_deadline_misses_and_metrics(self):
+        """Test late frames of protected streams count as misses and metrics are exported."""
+        with self.DeadlineScheduler(max_workers=1, latency=0.0, frame_cost=1e-9) as scheduler:
+            scheduler.add_stream("high", priority=1)
+            scheduler.feed("high", self.audio[: 256 * 5], now=0.0)
+            scheduler.run_tick(now=0.05)
+            stats = scheduler.stats()
+            text = scheduler.render_prometheus()
+        self.assertEqual((stats["frames"], stats["deadline_misses"], stats["ticks"]), (5, 5, 1))
+        self.assertGreaterEqual(stats["latency"]["p50"], 0.04)
+        self.assertIn('ten_vad_scheduler_deadline_misses_total{stream="high",priority="1"} 5', text)
+        self.assertIn("ten_vad_scheduler_queue_depth", text)
+
+    def test_failed_stream_does_not_drop_others(self):
+        """Test a failing batch is estimated and logged while other streams are delivered."""
+        expected = TenVad(256).process_array(self.audio[: 256 * 12])
+        with self.DeadlineScheduler(max_workers=2, frame_cost=0.001) as scheduler:
+            scheduler.add_stream("a", priority=1)
+            scheduler.add_stream("b", priority=1)
+
+            def fail(*args):
+                raise RuntimeError("[TEN VAD]: Failed to process audio frame")
+
+            scheduler._streams["a"].vad._process_frames = fail
+            results = {"a": [], "b": []}
+            for start in (0, 256 * 6):
+                scheduler.feed("a", self.audio[start:start + 256 * 6], now=0.0)
+                scheduler.feed("b", self.audio[start:start + 256 * 6], now=0.0)
+                with self.assertLogs("ten_vad.scheduler", level="ERROR"):
+                    for result in scheduler.run_tick(now=0.0):
+                        results[result.stream_id].append(result)
+            stats = scheduler.stats()
+        probabilities, flags = self._join(results["b"])
+        np.testing.assert_array_equal(probabilities, expected[0])
+        np.testing.assert_array_equal(flags, expected[1])
+        self.assertEqual(len(self._join(results["a"])[0]), 12)
+        self.assertTrue(all(result.estimated for result in results["a"]))
+        self.assertEqual((stats["streams"]["a"]["errors"], stats["streams"]["b"]["errors"], stats["frames"]), (2, 0, 12))
+
+    def test_background_ticks(self):
+        """Test start delivers every frame to callbacks and measures the frame cost."""
+        received = []
+        done = threading.Event()
+
+        def on_result(result):
+            received.append(result)
+            if result.end == 200:
+                done.set()
+
+        with self.DeadlineScheduler(max_workers=1, tick=0.005, latency=10.0) as scheduler:
+            scheduler.add_stream("a", priority=1, callback=on_result)
+            scheduler.start()
+            with self.assertRaises(RuntimeError):
+                scheduler.start()
+            scheduler.feed("a", self.audio)
+            self.assertTrue(done.wait(10.0))
+            scheduler.stop()
+            self.assertIsNotNone(scheduler.frame_cost)
+        probabilities, _ = self._join(received)
+        np.testing.assert_array_equal(probabilities, TenVad(256).process_array(self.audio)[0])
+        with self.assertRaises(RuntimeError):
+            scheduler.feed("a", self.audio)
+
+    def test_invalid_arguments(self):
+        """Test argument validation and stream management errors."""
+        with self.assertRaises(ValueError):
+            self.DeadlineScheduler(max_workers=0)
+        with self.assertRaises(ValueError):
+            self.DeadlineScheduler(tick=0)
+        with self.assertRaises(ValueError):
+            self.DeadlineScheduler(estimate_floor_dbfs=-30.0, estimate_speech_dbfs=-60.0)
+        with self.DeadlineScheduler() as scheduler:
+            scheduler.add_stream("a")
+            with self.assertRaises(KeyError):
+                scheduler.add_stream("a")
+            with self.assertRaises(KeyError):
+                scheduler.feed("b", self.audio)
+            with self.assertRaises(TypeError):
+                scheduler.feed("a", self.audio.astype(np.float32))
+            scheduler.remove_stream("a")
+            self.assertNotIn("a", scheduler)
+        with self.assertRaises(RuntimeError):
+            scheduler.add_stream("c")
+
+
+if __name__ == "__main__":
+    unittest.main()
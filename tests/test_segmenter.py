@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from ten_vad.segmenter import SpeechEnd, SpeechSegmenter, SpeechStart, segments_from_probabilities
+
+
+def events_to_segments(events):
+    starts = [event.sample for event in events if isinstance(event, SpeechStart)]
+    ends = [event.sample for event in events if isinstance(event, SpeechEnd)]
+    return np.array(list(zip(starts, ends)), dtype=np.int64).reshape(-1, 2)
+
+
+class TestSpeechSegmenter(unittest.TestCase):
+    def test_simple_segment(self):
+        """Test hangover, padding and sample-accurate timestamps on a hand-made sequence."""
+        probs = np.array([0.0] * 10 + [0.9] * 20 + [0.0] * 30)
+        segments = segments_from_probabilities(probs, hop_size=160, min_speech_ms=50, min_silence_ms=100,
+                                               hangover_ms=20, pre_pad_ms=10, post_pad_ms=30)
+        np.testing.assert_array_equal(segments, [[10 * 160 - 160, (30 + 2) * 160 + 480]])
+
+    def test_hysteresis_and_min_durations(self):
+        """Test gaps are bridged, short bursts dropped and mid-range values keep state."""
+        probs = np.array([0.9] * 10 + [0.45] * 5 + [0.1] * 3 + [0.9] * 10 + [0.1] * 40 + [0.9] * 2 + [0.1] * 40)
+        segments = segments_from_probabilities(probs, hop_size=256, onset_threshold=0.5, offset_threshold=0.3,
+                                               min_speech_ms=100, min_silence_ms=100, hangover_ms=0)
+        np.testing.assert_array_equal(segments, [[0, 28 * 256]])
+
+    def test_incremental_matches_offline(self):
+        """Test random chunkings of the incremental segmenter reproduce the offline result."""
+        rng = np.random.default_rng(0)
+        for trial in range(200):
+            smooth = np.repeat(rng.random(rng.integers(1, 40)), rng.integers(1, 12))
+            probs = np.clip(smooth + rng.normal(0, 0.1, len(smooth)), 0, 1)
+            kwargs = dict(
+                hop_size=int(rng.choice([160, 256])),
+                onset_threshold=0.6,
+                offset_threshold=float(rng.choice([0.3, 0.6])),
+                min_speech_ms=float(rng.choice([0, 50, 200])),
+                min_silence_ms=float(rng.choice([0, 30, 150])),
+                hangover_ms=float(rng.choice([0, 40])),
+                pre_pad_ms=float(rng.choice([0, 30, 300])),
+                post_pad_ms=float(rng.choice([0, 30, 300])),
+            )
+            expected = segments_from_probabilities(probs, **kwargs)
+            received = []
+            segmenter = SpeechSegmenter(on_event=received.append, **kwargs)
+            events = []
+            start = 0
+            while start < len(probs):
+                size = int(rng.integers(0, 20))
+                events += segmenter.push(probs[start:start + size])
+                start += size
+                # The bounds never pass the final segments
+                started = sum(isinstance(event, SpeechStart) for event in events)
+                self.assertTrue(np.all(expected[started:, 0] >= segmenter.earliest_start))
+                if segmenter.in_speech:
+                    self.assertGreaterEqual(expected[started - 1, 1], segmenter.earliest_end)
+                else:
+                    self.assertIsNone(segmenter.earliest_end)
+            events += segmenter.flush()
+            self.assertEqual(events, received)
+            np.testing.assert_array_equal(events_to_segments(events), expected, err_msg=f"trial {trial}: {kwargs}")
+
+    def test_bounds(self):
+        """Test the earliest start of a future segment and earliest end of the one in speech."""
+        segmenter = SpeechSegmenter(hop_size=160, min_speech_ms=50, min_silence_ms=100, hangover_ms=20, pre_pad_ms=10, post_pad_ms=30)
+        segmenter.push([0.0] * 10)
+        self.assertEqual((segmenter.earliest_start, segmenter.earliest_end), (9 * 160, None))
+        segmenter.push([0.9] * 2)
+        self.assertEqual((segmenter.earliest_start, segmenter.earliest_end), (9 * 160, None))
+        segmenter.push([0.9] * 18)
+        self.assertEqual((segmenter.earliest_start, segmenter.earliest_end), (29 * 160, 30 * 160))
+        segmenter.push([0.0] * 5)
+        self.assertEqual((segmenter.earliest_start, segmenter.earliest_end), (34 * 160, 32 * 160 + 480))
+        events = segmenter.push([0.0] * 7)
+        self.assertEqual(events, [SpeechEnd(32 * 160 + 480)])
+        self.assertEqual((segmenter.earliest_start, segmenter.earliest_end), (41 * 160, None))
+
+    def test_invalid_parameters(self):
+        """Test invalid thresholds and durations."""
+        with self.assertRaises(ValueError):
+            SpeechSegmenter(onset_threshold=0.3, offset_threshold=0.5)
+        with self.assertRaises(ValueError):
+            segments_from_probabilities(np.zeros(10), min_speech_ms=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
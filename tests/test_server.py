@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+import numpy as np
+from ten_vad import SpeechSegmenter, TenVad
+from ten_vad import server as protocol
+
+
+class TestVadServer(unittest.TestCase):
+    def setUp(self):
+        """Skip when the native library is unavailable."""
+        try:
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        rng = np.random.default_rng(3)
+        self.audio = np.concatenate(
+            [
+                (rng.standard_normal(16000) * 30).astype(np.int16),
+                np.round(8000 * np.sin(np.arange(16000) * 0.07) * (1 + np.sin(np.arange(16000) * 0.002))).astype(np.int16),
+                (rng.standard_normal(16000) * 30).astype(np.int16),
+            ]
+        )
+
+    def run_with_server(self, client, **options):
+        async def main():
+            server = protocol.VadServer(port=0, **options)
+            await server.start()
+            try:
+                return await client(server, *server.address[:2])
+            finally:
+                await server.close()
+
+        return asyncio.run(main())
+
+    def test_results_and_events(self):
+        """Test results and events over TCP match local processing for odd chunk sizes."""
+        expected_probs, expected_flags = TenVad(256, 0.5).process_array(self.audio)
+        segmenter = SpeechSegmenter(256)
+        expected_events = segmenter.push(expected_probs) + segmenter.flush()
+        self.assertTrue(expected_events)
+
+        async def client(server, host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            config = protocol.CONFIG_PAYLOAD.pack(256, 0.5, protocol.OUTPUT_RESULTS | protocol.OUTPUT_EVENTS)
+            writer.write(protocol.encode_message(protocol.CONFIG, config))
+            for start in range(0, len(self.audio), 1000):
+                writer.write(protocol.encode_message(protocol.AUDIO, self.audio[start:start + 1000].tobytes()))
+            writer.write(protocol.encode_message(protocol.END))
+            probs, flags, events = [], [], []
+            while True:
+                kind, payload = await protocol.read_message(reader)
+                if kind == protocol.RESULTS:
+                    first_frame, chunk_probs, chunk_flags = protocol.decode_results(payload)
+                    self.assertEqual(first_frame, len(probs))
+                    probs.extend(chunk_probs)
+                    flags.extend(chunk_flags)
+                elif kind == protocol.EVENT:
+                    events.append(protocol.EVENT_PAYLOAD.unpack(payload))
+                else:
+                    self.assertEqual(kind, protocol.ENDED)
+                    break
+            self.assertIsNone(await protocol.read_message(reader))
+            writer.close()
+            return np.array(probs, dtype=np.float32), np.array(flags, dtype=np.uint8), events
+
+        probs, flags, events = self.run_with_server(client)
+        np.testing.assert_array_equal(probs, expected_probs)
+        np.testing.assert_array_equal(flags, expected_flags)
+        self.assertEqual(events, [(int(type(event).__name__ == "SpeechStart"), event.sample) for event in expected_events])
+
+    def test_connection_limit_and_errors(self):
+        """Test connections beyond the limit and protocol errors receive ERROR."""
+
+        async def client(server, host, port):
+            first = await asyncio.open_connection(host, port)
+            first[1].write(protocol.encode_message(protocol.AUDIO, b"\0" * 512))
+            await protocol.read_message(first[0])  # The first connection is being served
+            reader, writer = await asyncio.open_connection(host, port)
+            busy = await protocol.read_message(reader)
+            writer.close()
+            reader, writer = first
+            writer.write(protocol.encode_message(protocol.AUDIO, b"\0" * 3))
+            odd = await protocol.read_message(reader)
+            writer.close()
+            return busy, odd
+
+        busy, odd = self.run_with_server(client, max_connections=1)
+        self.assertEqual(busy, (protocol.ERROR, b"server busy"))
+        self.assertEqual(odd[0], protocol.ERROR)
+        self.assertIn(b"16-bit", odd[1])
+
+    def test_rejects_oversized_hop_size(self):
+        """Test a CONFIG with a huge hop_size receives ERROR instead of allocating handles."""
+
+        async def client(server, host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            config = protocol.CONFIG_PAYLOAD.pack(1 << 31, 0.5, protocol.OUTPUT_RESULTS)
+            writer.write(protocol.encode_message(protocol.CONFIG, config))
+            reply = await protocol.read_message(reader)
+            writer.close()
+            return reply
+
+        kind, message = self.run_with_server(client)
+        self.assertEqual(kind, protocol.ERROR)
+        self.assertIn(b"hop_size", message)
+
+    def test_backpressure(self):
+        """Test a client that does not read results stalls instead of growing server buffers."""
+
+        async def client(server, host, port):
+            reader, writer = await asyncio.open_connection(host, port, limit=1024)
+            writer.transport.pause_reading()
+            chunk = protocol.encode_message(protocol.AUDIO, b"\0" * 256 * 2 * 64)
+            sent = 0
+            try:
+                while sent < 4000:
+                    writer.write(chunk)
+                    await asyncio.wait_for(writer.drain(), 0.5)
+                    sent += 1
+            except asyncio.TimeoutError:
+                pass
+            writer.close()
+            return sent
+
+        self.assertLess(self.run_with_server(client, queue_size=2), 4000)
+
+
+if __name__ == '__main__':
+    unittest.main()
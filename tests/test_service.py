@@ -0,0 +1,98 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from ten_vad import TenVad
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX") and sys.version_info >= (3, 8), "Unix domain sockets and shared_memory required")
+class TestVadService(unittest.TestCase):
+    def setUp(self):
+        """Start a service on a temporary socket, skipping when the native library is unavailable."""
+        from ten_vad import VadService
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "vad.sock")
+        try:
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        self.service = VadService(self.socket_path, max_workers=2, max_sessions=2)
+        self.service.start()
+        self.audio = (np.random.default_rng(2).standard_normal(256 * 40 + 100) * 3000).astype(np.int16)
+
+    def tearDown(self):
+        self.service.close()
+        self.directory.cleanup()
+
+    def test_matches_process_array(self):
+        """Test results through the shared rings, including wrap-around, match local processing."""
+        from ten_vad import VadServiceClient
+        expected_probs, expected_flags = TenVad(256, 0.5).process_array(self.audio)
+        with VadServiceClient(self.socket_path, hop_size=256, capacity=16) as client:
+            probs, flags = client.process(self.audio)
+            np.testing.assert_array_equal(probs, expected_probs)
+            np.testing.assert_array_equal(flags, expected_flags)
+            client.reset()
+            np.testing.assert_array_equal(client.process(self.audio)[0], expected_probs)
+        self.assertEqual(self.service.sessions, 0)
+
+    def test_reserve_commit(self):
+        """Test filling the ring in place and reading results in steps."""
+        from ten_vad import VadServiceClient
+        expected, _ = TenVad(160, 0.5).process_array(self.audio)
+        with VadServiceClient(self.socket_path, hop_size=160, capacity=8) as client:
+            slots = client.reserve(5)
+            slots[:] = self.audio[:800].reshape(5, 160)
+            client.commit(5)
+            self.assertEqual(client.free, 3)
+            self.assertEqual(client.flush(), 5)
+            np.testing.assert_array_equal(client.read(2)[0], expected[:2])
+            np.testing.assert_array_equal(client.read()[0], expected[2:5])
+            with self.assertRaises(ValueError):
+                client.commit(9)
+
+    def test_corrupt_counters(self):
+        """Test ring counters that do not fit the frames the service processed are rejected."""
+        from ten_vad import VadServiceClient
+        expected, _ = TenVad(256, 0.5).process_array(self.audio[: 256 * 4])
+        with VadServiceClient(self.socket_path, hop_size=256, capacity=8) as client:
+            header = client._header
+            # written, consumed and a forged done; the service has processed nothing yet
+            for written, consumed, done in ((10 ** 12, 10 ** 12, 0), (10 ** 12, 10 ** 12, 10 ** 12), (9, 0, 0), (2, 3, 0)):
+                with self.subTest(written=written, consumed=consumed, done=done):
+                    header["written"], header["consumed"], header["done"] = written, consumed, done
+                    with self.assertRaises(RuntimeError):
+                        client.flush()
+            header["written"] = header["consumed"] = header["done"] = 0
+            np.testing.assert_array_equal(client.process(self.audio[: 256 * 4])[0], expected)
+            header["written"] = header["consumed"] = 2  # Behind the 4 frames processed
+            with self.assertRaises(RuntimeError):
+                client.flush()
+
+    def test_limits_and_other_processes(self):
+        """Test ring size limits, the session limit and a client running in a separate process."""
+        from ten_vad import VadServiceClient
+        src = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+        script = (
+            "import sys, numpy as np; sys.path.insert(0, sys.argv[1]); from ten_vad import VadServiceClient; "
+            "client = VadServiceClient(sys.argv[2]); "
+            "print(client.process(np.zeros(256 * 4, dtype=np.int16))[0].size); client.close()"
+        )
+        result = subprocess.run([sys.executable, "-c", script, src, self.socket_path], capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.stdout.strip(), "4", result.stderr)
+        self.assertNotIn("leaked", result.stderr)
+        for options in ({"hop_size": 1 << 30}, {"hop_size": 0}, {"capacity": 1 << 30}):
+            with self.assertRaises(RuntimeError):
+                VadServiceClient(self.socket_path, **options)
+        clients = [VadServiceClient(self.socket_path) for _ in range(2)]
+        with self.assertRaises(RuntimeError):
+            VadServiceClient(self.socket_path)
+        for client in clients:
+            client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
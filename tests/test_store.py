@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ten_vad import ResultStore, ResultWriter, TenVad
+from ten_vad.store import write_results
+
+TESTSET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../testset"))
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "results.tvr")
+        rng = np.random.default_rng(0)
+        # Runs of speech and silence of random lengths, like real VAD output
+        lengths = rng.integers(1, 200, size=400)
+        self.flags = np.repeat(np.arange(len(lengths)) % 2, lengths).astype(np.uint8)
+        self.probabilities = np.where(self.flags, rng.uniform(0.5, 1.0, len(self.flags)), rng.uniform(0.0, 0.5, len(self.flags))).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _expected_intervals(self, flags):
+        edges = np.diff(np.concatenate(([0], flags, [0])).astype(np.int8))
+        return np.stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)), axis=1)
+
+    def test_round_trip_in_chunks(self):
+        """Test appending uneven chunks reproduces flags, intervals and quantized probabilities."""
+        for probability_format, tolerance in (("uint8", 0.5 / 255 + 1e-6), ("float16", 1e-3)):
+            with ResultWriter(self.path, probability_format=probability_format, block_frames=64) as writer:
+                start = 0
+                for size in (1, 7, 300, 0, 64, 5000, 13):
+                    writer.append(self.probabilities[start:start + size], self.flags[start:start + size])
+                    start += size
+                writer.append(self.probabilities[start:], self.flags[start:])
+            with ResultStore(self.path) as store:
+                self.assertEqual(len(store), len(self.flags))
+                np.testing.assert_array_equal(store.flags(), self.flags)
+                np.testing.assert_array_equal(store.flags(13, 1001), self.flags[13:1001])
+                self.assertLessEqual(np.abs(store.probabilities() - self.probabilities).max(), tolerance)
+                np.testing.assert_array_equal(store.intervals, self._expected_intervals(self.flags))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_compact_size(self):
+        """Test a uint8 store takes little more than one byte per frame."""
+        write_results(self.path, self.probabilities, self.flags)
+        self.assertLess(os.path.getsize(self.path), len(self.flags) * 1.2 + 4096)
+
+    def test_range_queries(self):
+        """Test speech ratios, timelines and interval queries against brute force."""
+        write_results(self.path, self.probabilities, self.flags, block_frames=64)
+        frame = 256 / 16000
+        with ResultStore(self.path) as store:
+            self.assertAlmostEqual(store.duration, len(self.flags) * frame)
+            rng = np.random.default_rng(1)
+            for _ in range(200):
+                start, end = sorted(rng.integers(0, len(self.flags) + 1, size=2))
+                self.assertEqual(store.speech_frames(start, end), int(self.flags[start:end].sum()))
+                intervals = store.speech_intervals(start * frame + 1e-9, end * frame + 1e-9)
+                expected = [
+                    (max(s, start), min(e, end)) for s, e in self._expected_intervals(self.flags) if s < end and e > start
+                ]
+                np.testing.assert_allclose(intervals, np.array(expected, dtype=np.float64).reshape(-1, 2) * frame)
+            self.assertAlmostEqual(store.speech_ratio(), self.flags.mean())
+            self.assertEqual(store.speech_ratio(5.0, 5.0), 0.0)
+
+            bucket = 64 * 10 * frame
+            timeline = store.speech_timeline(bucket)
+            blocks = np.split(self.flags, np.arange(640, len(self.flags), 640))
+            np.testing.assert_allclose(timeline, [block.mean() for block in blocks])
+
+    def test_empty_and_invalid(self):
+        """Test an empty store, writer validation, abort, and rejecting foreign files."""
+        write_results(self.path, np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.uint8))
+        with ResultStore(self.path) as store:
+            self.assertEqual(len(store), 0)
+            self.assertEqual(store.speech_ratio(), 0.0)
+            self.assertEqual(store.speech_intervals().shape, (0, 2))
+        with self.assertRaises(ValueError):
+            ResultWriter(self.path, probability_format="int4")
+        with self.assertRaises(ValueError):
+            ResultWriter(self.path, block_frames=12)
+        with self.assertRaises(ValueError):
+            with ResultWriter(os.path.join(self.tmp_dir, "partial.tvr")) as writer:
+                writer.append(self.probabilities[:3], self.flags[:2])
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["results.tvr"])
+        other = os.path.join(self.tmp_dir, "other.bin")
+        with open(other, "wb") as f:
+            f.write(b"not a result file" * 10)
+        with self.assertRaises(ValueError):
+            ResultStore(other)
+
+    def test_vad_results(self):
+        """Test storing real VAD output preserves flags and segments."""
+        try:
+            vad = TenVad(256)
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        from ten_vad.io import WavReader
+        with WavReader(os.path.join(TESTSET_DIR, "testset-audio-01.wav")) as wav:
+            probabilities, flags = vad.process_array(wav.samples)
+        write_results(self.path, probabilities, flags)
+        with ResultStore(self.path) as store:
+            np.testing.assert_array_equal(store.flags(), flags)
+            self.assertLessEqual(np.abs(store.probabilities() - probabilities).max(), 0.5 / 255 + 1e-6)
+            self.assertEqual(store.speech_frames(0, len(flags)), int(flags.sum()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from ten_vad import TenVad, TenVadStream
+from ten_vad.stream import STREAM_RESULT_DTYPE
+
+
+class TestTenVadStream(unittest.TestCase):
+    def setUp(self):
+        """Create a stream, skipping when the native library is unavailable."""
+        try:
+            self.stream = TenVadStream(hop_size=256, threshold=0.5)
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        rng = np.random.default_rng(0)
+        self.audio = (rng.standard_normal(256 * 30 + 77) * 3000).astype(np.int16)
+        self.expected_probs, self.expected_flags = TenVad(256, 0.5).process_array(self.audio)
+
+    def feed_in_chunks(self, sizes):
+        results, start, i = [], 0, 0
+        while start < len(self.audio):
+            size = sizes[i % len(sizes)]
+            results.append(self.stream.feed(self.audio[start:start + size]))
+            start += size
+            i += 1
+        return np.concatenate(results)
+
+    def test_packet_sizes_match_batch(self):
+        """Test 10/20/30 ms packets and odd chunk sizes reproduce batch results."""
+        for sizes in ([160], [320], [480], [1, 1000, 17, 256, 255]):
+            self.stream.reset()
+            results = self.feed_in_chunks(sizes)
+            self.assertEqual(results.dtype, STREAM_RESULT_DTYPE)
+            np.testing.assert_array_equal(results["probability"], self.expected_probs)
+            np.testing.assert_array_equal(results["flag"], self.expected_flags)
+            np.testing.assert_array_equal(results["offset"], np.arange(30) * 256)
+            self.assertEqual(self.stream.pending, 77)
+            self.assertEqual(self.stream.position, len(self.audio))
+
+    def test_empty_and_invalid_chunks(self):
+        """Test empty chunks and invalid input."""
+        self.assertEqual(len(self.stream.feed(np.zeros(0, dtype=np.int16))), 0)
+        self.assertEqual(len(self.stream.feed(np.zeros(100, dtype=np.int16))), 0)
+        self.assertEqual(self.stream.pending, 100)
+        with self.assertRaises(TypeError):
+            self.stream.feed(np.zeros(256, dtype=np.float32))
+        with self.assertRaises(TypeError):
+            self.stream.feed([0] * 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -90,6 +90,52 @@ class TestTenVad(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.vad.process([0] * 256)
 
+    def test_process_unchecked(self):
+        """Test the unchecked fast path matches the validated path."""
+        rng = np.random.default_rng(1)
+        frames = (rng.standard_normal((10, 256)) * 3000).astype(np.int16)
+        reference = TenVad(hop_size=256, threshold=0.5)
+        for frame in frames:
+            self.assertEqual(self.vad.process_unchecked(frame), reference.process(frame))
+
+    def test_process_non_contiguous_and_readonly_input(self):
+        """Test frames that need a contiguous copy or are read-only."""
+        stereo = np.zeros((256, 2), dtype=np.int16)
+        prob, flag = self.vad.process(stereo[:, 0])
+        self.assertTrue(0.0 <= prob <= 1.0)
+        readonly = np.frombuffer(bytes(512), dtype=np.int16)
+        prob, flag = self.vad.process(readonly)
+        self.assertTrue(0.0 <= prob <= 1.0)
+        self.assertIn(self.vad.process_unchecked(readonly)[1], [0, 1])
+
+    def test_process_array(self):
+        """Test whole-buffer processing matches frame-by-frame processing."""
+        rng = np.random.default_rng(0)
+        audio = (rng.standard_normal(256 * 20 + 100) * 3000).astype(np.int16)
+        probs, flags = self.vad.process_array(audio)
+        self.assertEqual(probs.dtype, np.float32)
+        self.assertEqual(flags.dtype, np.uint8)
+        self.assertEqual(len(probs), 20)
+        reference = TenVad(hop_size=256, threshold=0.5)
+        for i in range(20):
+            prob, flag = reference.process(audio[i * 256:(i + 1) * 256])
+            self.assertAlmostEqual(float(probs[i]), prob, places=6)
+            self.assertEqual(int(flags[i]), flag)
+
+    def test_process_array_invalid_input(self):
+        """Test whole-buffer processing with invalid inputs."""
+        with self.assertRaises(TypeError):
+            self.vad.process_array(np.zeros(512, dtype=np.float32))
+        with self.assertRaises(TypeError):
+            self.vad.process_array([0] * 512)
+        with self.assertRaises(ValueError):
+            self.vad.process_array(np.zeros((2, 512), dtype=np.int16))
+        with self.assertRaises(ValueError):
+            self.vad.process_array(np.zeros(512, dtype=np.int16), hop_size=160)
+        probs, flags = self.vad.process_array(np.zeros(100, dtype=np.int16))
+        self.assertEqual(len(probs), 0)
+        self.assertEqual(len(flags), 0)
+
     def test_process_async(self):
         """Test asynchronous processing."""
         async def run_async():
@@ -100,6 +146,62 @@ class TestTenVad(unittest.TestCase):
             self.assertIn(flag, [0, 1])
         asyncio.run(run_async())
 
+    def test_process_async_concurrent(self):
+        """Test concurrent awaits on one instance keep order and do not share outputs."""
+        rng = np.random.default_rng(2)
+        frames = (rng.standard_normal((16, 256)) * 3000).astype(np.int16)
+        reference = TenVad(256, 0.5)
+        expected = [reference.process(frame) for frame in frames]
+
+        async def run_async():
+            return await asyncio.gather(*(self.vad.process_async(frame) for frame in frames))
+        self.assertEqual(asyncio.run(run_async()), expected)
+
+    def test_stream_async(self):
+        """Test the async iterator over arbitrary chunks matches batch processing."""
+        rng = np.random.default_rng(3)
+        audio = (rng.standard_normal(256 * 40 + 100) * 3000).astype(np.int16)
+        expected, _ = TenVad(256, 0.5).process_array(audio)
+
+        async def source():
+            for start in range(0, len(audio), 320):
+                yield audio[start:start + 320]
+                await asyncio.sleep(0)
+
+        async def run_async():
+            batches = [results async for results in self.vad.stream(source(), max_batch_frames=4, max_pending_chunks=2)]
+            return np.concatenate(batches)
+        results = asyncio.run(run_async())
+        np.testing.assert_array_equal(results["probability"], expected)
+        np.testing.assert_array_equal(results["offset"], np.arange(40) * 256)
+
+    def test_stream_async_source_error(self):
+        """Test errors raised by the source reach the consumer."""
+        async def source():
+            yield np.zeros(512, dtype=np.int16)
+            raise OSError("connection lost")
+
+        async def run_async():
+            return [results async for results in self.vad.stream(source())]
+        with self.assertRaises(OSError):
+            asyncio.run(run_async())
+
+    def test_shared_library(self):
+        """Test handles share one loaded library and the path search is cached."""
+        from ten_vad import get_library_path, get_library_version, load_library
+        other = TenVad(hop_size=160)
+        self.assertIs(self.vad.vad_library, load_library())
+        self.assertIs(other.vad_library, self.vad.vad_library)
+        self.assertIs(get_library_path(), get_library_path())
+        self.assertEqual(get_library_version(), self.vad.get_version())
+
+    def test_lazy_import(self):
+        """Test importing the package does not pull in NumPy or asyncio."""
+        import subprocess
+        code = "import sys, ten_vad; print('numpy' in sys.modules, 'asyncio' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "False"])
+
     def test_set_threshold(self):
         """Test dynamic threshold adjustment."""
         self.vad.set_threshold(0.7)
@@ -107,6 +209,55 @@ class TestTenVad(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.vad.set_threshold(1.5)  # Invalid threshold
 
+    def test_set_threshold_keeps_state(self):
+        """Test a threshold change mid-stream keeps the model state and matches a handle created with it."""
+        rng = np.random.default_rng(0)
+        audio = (np.sin(np.arange(256 * 60) * 0.05) * 8000 * (rng.random(256 * 60) > 0.3)).astype(np.int16)
+        expected_probs, _ = TenVad(hop_size=256, threshold=0.5).process_array(audio)
+        _, expected_flags = TenVad(hop_size=256, threshold=0.2).process_array(audio)
+        seen = []
+        vad = TenVad(hop_size=256, threshold=0.5, callback=lambda prob, flag: seen.append(flag))
+        vad.process_array(audio[:256 * 30])
+        vad.set_threshold(0.2)
+        probs, flags = vad.process_array(audio[256 * 30:])
+        np.testing.assert_array_equal(probs, expected_probs[30:])
+        np.testing.assert_array_equal(flags, expected_flags[30:])
+        self.assertEqual(seen[30:], flags.tolist())
+        self.assertEqual(vad.process(audio[:256])[1], int(vad.process(audio[:256])[0] > np.float32(0.2)))
+
+    def test_capabilities(self):
+        """Test the capability report matches the symbols the library exports."""
+        from ten_vad import get_library_capabilities
+        capabilities = get_library_capabilities()
+        self.assertIs(self.vad.capabilities, capabilities)
+        self.assertEqual(capabilities.set_threshold, hasattr(self.vad.vad_library, "ten_vad_set_threshold"))
+        self.assertEqual(capabilities.reset, hasattr(self.vad.vad_library, "ten_vad_reset"))
+
+    def test_close(self):
+        """Test explicit close, the context manager and processing after close."""
+        with TenVad(hop_size=256) as vad:
+            vad.process(self.valid_audio)
+            self.assertFalse(vad.closed)
+        self.assertTrue(vad.closed)
+        vad.close()  # Closing twice is a no-op
+        with self.assertRaises(RuntimeError):
+            vad.process(self.valid_audio)
+
+    def test_close_waits_for_async_jobs(self):
+        """Test close lets queued executor jobs finish on a live handle, also when called from a job."""
+        vad = TenVad(hop_size=256)
+        executor = vad._get_executor()
+        futures = [executor.submit(vad._process_internal, self.valid_audio) for _ in range(50)]
+        vad.close()
+        self.assertTrue(all(future.done() for future in futures))
+        for future in futures:
+            probability, _ = future.result()
+            self.assertTrue(0.0 <= probability <= 1.0)
+
+        vad = TenVad(hop_size=256)
+        vad._get_executor().submit(vad.close).result(timeout=10)
+        self.assertTrue(vad.closed)
+
     def test_callback(self):
         """Test callback functionality."""
         callback_results = []
@@ -0,0 +1,146 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+import numpy as np
+from ten_vad import OffsetMap, SpeechTrimmer, TenVad, segments_from_probabilities, trim_wav
+from ten_vad.io import WavReader
+from ten_vad.trim import main
+
+TESTSET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../testset"))
+
+
+class TestSpeechTrimmer(unittest.TestCase):
+    def setUp(self):
+        """Load a test recording."""
+        try:
+            TenVad()
+        except (FileNotFoundError, OSError) as exc:
+            self.skipTest(f"Required library files not found for testing: {exc}")
+        self.wav_path = os.path.join(TESTSET_DIR, "testset-audio-01.wav")
+        with WavReader(self.wav_path) as wav:
+            self.audio = np.array(wav.samples)
+        self.probabilities, _ = TenVad(256).process_array(self.audio)
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def expected(self, **options):
+        segments = segments_from_probabilities(self.probabilities, 256, **options)
+        return segments, np.concatenate([self.audio[start:end] for start, end in segments])
+
+    def test_matches_offline_segments(self):
+        """Test streamed output equals cutting the offline segments, for any chunking and padding."""
+        rng = np.random.default_rng(0)
+        for options in (
+            {"pre_pad_ms": 100.0, "post_pad_ms": 100.0},
+            {"pre_pad_ms": 0.0, "post_pad_ms": 500.0, "min_silence_ms": 50.0},
+            {"pre_pad_ms": 400.0, "post_pad_ms": 0.0, "min_speech_ms": 250.0},
+        ):
+            with self.subTest(**options):
+                segments, expected = self.expected(**options)
+                output = io.BytesIO()
+                trimmer = SpeechTrimmer(output, **options)
+                position = written = 0
+                while position < len(self.audio):
+                    size = int(rng.integers(1, 3000))
+                    written += trimmer.feed(self.audio[position:position + size])
+                    position += size
+                    self.assertLess(len(trimmer._buffer), 16000)  # Memory stays flat
+                offset_map = trimmer.close()
+                np.testing.assert_array_equal(np.frombuffer(output.getvalue(), dtype="<i2"), expected)
+                np.testing.assert_array_equal(offset_map.segments, segments)
+                self.assertLess(written, len(expected) + 1)
+                self.assertEqual(offset_map.output_samples, len(expected))
+                self.assertEqual(offset_map.source_samples, len(self.audio))
+
+    def test_bytes_input(self):
+        """Test raw PCM bytes are trimmed like the array."""
+        _, expected = self.expected(pre_pad_ms=100.0, post_pad_ms=100.0)
+        output = io.BytesIO()
+        with SpeechTrimmer(output) as trimmer:
+            data = self.audio.astype("<i2").tobytes()
+            for start in range(0, len(data), 1000):
+                trimmer.feed(data[start:start + 1000])
+        np.testing.assert_array_equal(np.frombuffer(output.getvalue(), dtype="<i2"), expected)
+
+    def test_trim_wav_and_map_file(self):
+        """Test trim_wav writes a readable WAV, the map round-trips and the CLI runs."""
+        output_path = os.path.join(self.tmp_dir, "speech.wav")
+        offset_map = trim_wav(self.wav_path, output_path, pre_pad_ms=100.0, post_pad_ms=100.0)
+        _, expected = self.expected(pre_pad_ms=100.0, post_pad_ms=100.0)
+        with WavReader(output_path) as wav:
+            self.assertEqual(wav.info.sample_rate, 16000)
+            np.testing.assert_array_equal(wav.samples, expected)
+        self.assertFalse(os.path.exists(output_path + ".tmp"))
+        map_path = os.path.join(self.tmp_dir, "speech.json")
+        offset_map.save(map_path)
+        loaded = OffsetMap.load(map_path)
+        np.testing.assert_array_equal(loaded.segments, offset_map.segments)
+        self.assertEqual((loaded.sample_rate, loaded.source_samples), (16000, len(self.audio)))
+        self.assertEqual(main([self.wav_path, output_path, "--map", map_path, "--min-silence-ms", "300"]), 0)
+        self.assertLessEqual(len(OffsetMap.load(map_path)), len(offset_map))
+
+    def test_rejects_other_sample_rates(self):
+        """Test audio that is not 16 kHz is rejected instead of segmented at the wrong rate."""
+        input_path = os.path.join(self.tmp_dir, "48k.wav")
+        with wave.open(input_path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(48000)
+            f.writeframes(self.audio.tobytes())
+        output_path = os.path.join(self.tmp_dir, "speech.wav")
+        with self.assertRaises(ValueError):
+            trim_wav(input_path, output_path)
+        with self.assertRaises(ValueError):
+            SpeechTrimmer(output_path, sample_rate=48000)
+        self.assertEqual(os.listdir(self.tmp_dir), ["48k.wav"])
+
+    def test_abort_removes_partial_file(self):
+        """Test an exception inside the context leaves no output file."""
+        output_path = os.path.join(self.tmp_dir, "speech.wav")
+        with self.assertRaises(KeyError):
+            with SpeechTrimmer(output_path) as trimmer:
+                trimmer.feed(self.audio)
+                raise KeyError
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        with self.assertRaises(ValueError):
+            trimmer.feed(self.audio)
+
+
+class TestOffsetMap(unittest.TestCase):
+    def setUp(self):
+        self.map = OffsetMap(np.array([[100, 200], [500, 550], [550, 700]]), sample_rate=100, source_samples=1000)
+
+    def test_to_source(self):
+        """Test output positions map into their segments, with cut positions as starts or ends."""
+        self.assertEqual(self.map.output_samples, 300)
+        self.assertAlmostEqual(self.map.kept_ratio, 0.3)
+        np.testing.assert_array_equal(self.map.output_starts, [0, 100, 150])
+        np.testing.assert_array_equal(self.map.to_source([0, 99, 100, 149, 150, 299, 300]), [100, 199, 500, 549, 550, 699, 700])
+        np.testing.assert_array_equal(self.map.to_source([100, 150], end=True), [200, 550])
+        np.testing.assert_allclose(self.map.to_source_seconds([1.0, 1.0], end=True), [2.0, 2.0])
+        np.testing.assert_allclose(self.map.to_source_seconds(1.0), 5.0)
+
+    def test_to_output(self):
+        """Test source positions map back, and removed audio maps to its cut."""
+        np.testing.assert_array_equal(self.map.to_output([0, 100, 199, 200, 400, 500, 560, 900]), [0, 0, 99, 100, 100, 100, 160, 300])
+        positions = np.arange(300)
+        np.testing.assert_array_equal(self.map.to_output(self.map.to_source(positions)), positions)
+        np.testing.assert_allclose(self.map.to_output_seconds(5.5), 1.5)
+
+    def test_empty_and_invalid(self):
+        """Test an empty map and rejected segment lists."""
+        empty = OffsetMap(np.zeros((0, 2)), source_samples=0)
+        self.assertEqual((len(empty), empty.output_samples, empty.kept_ratio), (0, 0, None))
+        np.testing.assert_array_equal(empty.to_source([0, 5]), [0, 0])
+        for segments in ([[10, 5]], [[0, 10], [5, 20]]):
+            with self.assertRaises(ValueError):
+                OffsetMap(np.array(segments))
+
+
+if __name__ == '__main__':
+    unittest.main()